@@ -22,6 +22,26 @@ class Config:
     SEATS_API_KEY = os.getenv('SEATS_API_KEY')
     SEATS_BASE_URL = 'https://seats.aero/partnerapi'
     
+    # Ritmo máximo de requisições (req/s) e retries em 429/5xx
+    SEATS_RATE_LIMIT = float(os.getenv('SEATS_RATE_LIMIT', '4'))
+    SEATS_MAX_RETRIES = int(os.getenv('SEATS_MAX_RETRIES', '4'))
+    
+    # Timeout (s) de cada requisição
+    SEATS_TIMEOUT = float(os.getenv('SEATS_TIMEOUT', '30'))
+    
+    # Cache em disco das respostas do /search
+    SEATS_CACHE_DIR = Path(os.getenv('SEATS_CACHE_DIR', Path(__file__).parent.parent.parent / '.cache' / 'seats'))
+    SEATS_CACHE_MAX_ENTRIES = int(os.getenv('SEATS_CACHE_MAX_ENTRIES', '1000'))
+    
+    # Base local (SQLite) dos voos retornados pela API (--store / --offline)
+    AVAILABILITY_DB = Path(os.getenv('AVAILABILITY_DB', Path(__file__).parent.parent.parent / '.cache' / 'availability.sqlite3'))
+    
+    # Snapshot das impressões digitais da última varredura (--only-changes)
+    SNAPSHOT_FILE = Path(os.getenv('SNAPSHOT_FILE', Path(__file__).parent.parent.parent / '.cache' / 'snapshot.json'))
+    
+    # Bytecode dos templates Jinja2 já compilados
+    TEMPLATE_CACHE_DIR = Path(os.getenv('TEMPLATE_CACHE_DIR', Path(__file__).parent.parent.parent / '.cache' / 'jinja'))
+    
     @classmethod
     def validate(cls):
         """
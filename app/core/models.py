@@ -4,10 +4,68 @@ Models for Flight Alert CLI
 Este módulo define as estruturas de dados principais do projeto.
 """
 
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 import arrow
-from collections import defaultdict
+
+
+@lru_cache(maxsize=None)
+def _month_label(year: int, month: int, lang: str) -> str:
+    """
+    Rótulo "Mai 2026" de um mês, formatado pelo Arrow UMA vez por
+    (ano, mês, locale) e reaproveitado em todas as datas daquele mês.
+    """
+    return arrow.Arrow(year, month, 1).format('MMM YYYY', locale=lang)
+
+
+def _split_iso_date(date_str: str) -> Tuple[int, int, str]:
+    """
+    Extrai (ano, mês, dia "DD") de uma data ISO fatiando a string.
+    
+    Datas fora do formato "YYYY-MM-DD..." caem no parser do Arrow,
+    que mantém o comportamento (e os erros) de antes.
+    """
+    if (len(date_str) >= 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:10].isdigit()):
+        return int(date_str[:4]), int(date_str[5:7]), date_str[8:10]
+    
+    date_obj = arrow.get(date_str)
+    return date_obj.year, date_obj.month, date_obj.format('DD')
+
+
+def group_dates_by_month(
+    dates: List[Tuple[str, int]],
+    lang: str = 'pt_BR',
+    capitalize: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Agrupa tuplas (data_iso, assentos) por mês, na ordem em que aparecem.
+    
+    Motor comum de format_dates_by_month e get_dates_grouped_dict:
+    - Data ISO fatiada direto (sem arrow.get por data)
+    - Rótulo do mês em cache por (ano, mês, locale)
+    - Dict mantém a ordem dos meses (sem busca linear em lista)
+    
+    Returns:
+        {"Mai 2026": ["01 (9)", "05 (4)"], ...}
+    """
+    grouped: Dict[str, List[str]] = {}
+    
+    for date_str, seats in dates:
+        year, month, day = _split_iso_date(date_str)
+        month_year_key = _month_label(year, month, lang)
+        if capitalize:
+            month_year_key = month_year_key.capitalize()
+        
+        days = grouped.get(month_year_key)
+        if days is None:
+            days = grouped[month_year_key] = []
+        days.append(f"{day} ({seats})")
+    
+    return grouped
 
 
 @dataclass
@@ -49,6 +107,50 @@ class FlightBatch:
     min_cost: Optional[int] = None
     max_cost: Optional[int] = None
     
+    # Campos cuja troca invalida o cache de datas
+    _DATE_FIELDS = ('dates_outbound', 'dates_inbound')
+    
+    def __post_init__(self):
+        # Cache das visões de datas formatadas: (visão, direção, locale) → resultado.
+        # Fica FORA dos campos do dataclass (asdict, astuple, repr, ==)
+        object.__setattr__(self, '_date_views', {})
+    
+    def __setattr__(self, name, value):
+        # Atribuir novas datas descarta as visões já calculadas
+        if name in self._DATE_FIELDS:
+            views = self.__dict__.get('_date_views')
+            if views:
+                views.clear()
+        object.__setattr__(self, name, value)
+    
+    def invalidate_date_views(self) -> None:
+        """
+        Descarta as visões de datas em cache.
+        
+        Só é necessário após alterar as listas IN-PLACE
+        (ex: batch.dates_outbound.append(...)); atribuir uma nova lista
+        já invalida automaticamente.
+        """
+        self._date_views.clear()
+    
+    def _date_view(self, view: str, direction: str, lang: str):
+        """
+        Visão de datas memoizada por (visão, direção, locale).
+        
+        Renderizar o mesmo batch em vários templates (WhatsApp + Telegram)
+        agrupa as datas uma vez só.
+        """
+        key = (view, direction, lang)
+        cached = self._date_views.get(key)
+        if cached is None:
+            dates = self.dates_outbound if direction == 'outbound' else self.dates_inbound
+            if view == 'dict':
+                cached = self.get_dates_grouped_dict(dates, lang)
+            else:
+                cached = self.format_dates_by_month(dates, lang)
+            self._date_views[key] = cached
+        return cached
+    
     @property
     def route(self) -> str:
         """
@@ -73,7 +175,7 @@ class FlightBatch:
         
         Como funciona:
         1. Pega o origin_code atual (ex: "GRU")
-        2. Chama load_airport_data("GRU")
+        2. Consulta o índice de aeroportos (lookup_many, sem reler o JSON)
         3. Recebe {"city": "São Paulo", "flag": "🇧🇷"}
         4. Preenche automaticamente self.origin e self.origin_flag
         5. Repete para destination
@@ -96,15 +198,18 @@ class FlightBatch:
             >>> print(flight.destination)   # "Miami"
             >>> print(flight.dest_flag)     # "🇺🇸"
         """
-        from app.utils.helpers import load_airport_data
+        from app.utils.helpers import get_airport_index
+        
+        # Busca origem e destino de uma vez no índice em memória
+        airports = get_airport_index().lookup_many([self.origin_code, self.dest_code])
         
-        # Busca dados do aeroporto de origem
-        origin_data = load_airport_data(self.origin_code)
+        # Dados do aeroporto de origem
+        origin_data = airports[self.origin_code.upper().strip()]
         self.origin = origin_data["city"]
         self.origin_flag = origin_data["flag"]
         
-        # Busca dados do aeroporto de destino
-        dest_data = load_airport_data(self.dest_code)
+        # Dados do aeroporto de destino
+        dest_data = airports[self.dest_code.upper().strip()]
         self.destination = dest_data["city"]
         self.dest_flag = dest_data["flag"]
     
@@ -131,20 +236,8 @@ class FlightBatch:
         if not dates:
             return "Nenhuma data disponível"
         
-        # Dicionário para agrupar datas por mês/ano
-        grouped = defaultdict(list)
-        
-        for date_str, seats in dates:
-            # Converte string ISO para objeto Arrow
-            date_obj = arrow.get(date_str)
-            
-            # Chave: "Fev 2026" (mês abreviado + ano)
-            month_year_key = date_obj.format('MMM YYYY', locale=lang)
-            
-            # Valor: "15 (9)" (dia + assentos disponíveis)
-            day_seats = f"{date_obj.format('DD')} ({seats})"
-            
-            grouped[month_year_key].append(day_seats)
+        # Agrupa por mês/ano: {"Fev 2026": ["15 (9)", "18 (4)"]}
+        grouped = group_dates_by_month(dates, lang)
         
         # Monta string final: "Fev 2026: 15 (9), 18 (4) | Mar 2026: ..."
         result_parts = []
@@ -154,13 +247,13 @@ class FlightBatch:
         
         return " | ".join(result_parts)
     
-    def get_formatted_outbound_dates(self) -> str:
-        """Retorna datas de ida formatadas e agrupadas por mês."""
-        return self.format_dates_by_month(self.dates_outbound)
+    def get_formatted_outbound_dates(self, lang: str = 'pt_BR') -> str:
+        """Retorna datas de ida formatadas e agrupadas por mês (memoizado)."""
+        return self._date_view('text', 'outbound', lang)
     
-    def get_formatted_inbound_dates(self) -> str:
-        """Retorna datas de volta formatadas e agrupadas por mês."""
-        return self.format_dates_by_month(self.dates_inbound)
+    def get_formatted_inbound_dates(self, lang: str = 'pt_BR') -> str:
+        """Retorna datas de volta formatadas e agrupadas por mês (memoizado)."""
+        return self._date_view('text', 'inbound', lang)
     
     def get_dates_grouped_dict(self, dates: List[Tuple[str, int]], lang: str = 'pt_BR') -> Dict[str, str]:
         """
@@ -194,31 +287,238 @@ class FlightBatch:
         sorted_dates = sorted(dates, key=lambda x: x[0])
         
         # Passo 2: Agrupar por mês/ano, mantendo a ordem
-        grouped = defaultdict(list)
-        month_order = []  # Mantém ordem dos meses conforme aparecem
-        
-        for date_str, seats in sorted_dates:
-            date_obj = arrow.get(date_str)
-            
-            # Formata mês: "mai 2026" → capitalize → "Mai 2026"
-            month_year_key = date_obj.format('MMM YYYY', locale=lang).capitalize()
-            
-            # Formata dia: "01" (sempre com zero à esquerda)
-            day_seats = f"{date_obj.format('DD')} ({seats})"
-            
-            # Adiciona à lista daquele mês
-            if month_year_key not in month_order:
-                month_order.append(month_year_key)
-            grouped[month_year_key].append(day_seats)
+        # Formata mês: "mai 2026" → capitalize → "Mai 2026"
+        grouped = group_dates_by_month(sorted_dates, lang, capitalize=True)
         
         # Passo 3: Retornar dicionário ordenado
         # Python 3.7+ mantém ordem de inserção
-        return {month: ", ".join(grouped[month]) for month in month_order}
+        return {month: ", ".join(days) for month, days in grouped.items()}
+    
+    def get_outbound_dates_dict(self, lang: str = 'pt_BR') -> Dict[str, str]:
+        """Retorna datas de ida como dicionário (para usar em templates; memoizado)."""
+        return dict(self._date_view('dict', 'outbound', lang))
+    
+    def get_inbound_dates_dict(self, lang: str = 'pt_BR') -> Dict[str, str]:
+        """Retorna datas de volta como dicionário (para usar em templates; memoizado)."""
+        return dict(self._date_view('dict', 'inbound', lang))
+
+
+# Dia zero das datas compactas: array('H') cobre até ~2179
+COMPACT_EPOCH = date(2000, 1, 1)
+_COMPACT_EPOCH_ORDINAL = COMPACT_EPOCH.toordinal()
+
+
+def _pack_dates(dates: List[Tuple[str, int]]) -> Tuple[array, array]:
+    """
+    Converte [(data_iso, assentos)] em (dias desde COMPACT_EPOCH, assentos).
+    
+    Raises:
+        ValueError: Data fora de 2000-01-01..2179 ou assentos fora de 0..255
+    """
+    days = array('H')
+    seats = array('B')
+    for date_str, seat_count in dates:
+        offset = date.fromisoformat(date_str[:10]).toordinal() - _COMPACT_EPOCH_ORDINAL
+        try:
+            days.append(offset)
+            seats.append(seat_count)
+        except OverflowError:
+            raise ValueError(f"Data/assentos fora do intervalo compacto: {date_str} ({seat_count})")
+    return days, seats
+
+
+def _unpack_dates(days: array, seats: array) -> List[Tuple[str, int]]:
+    return [
+        (date.fromordinal(_COMPACT_EPOCH_ORDINAL + offset).isoformat(), seat_count)
+        for offset, seat_count in zip(days, seats)
+    ]
+
+
+class CompactFlightBatch:
+    """
+    Versão compacta do FlightBatch para varreduras com milhões de datas.
+    
+    Por que esta classe existe?
+    - FlightBatch guarda cada data como tupla + string de 10 caracteres
+    - Aqui as datas viram array('H') de dias desde 2000-01-01 (2 bytes)
+      e os assentos array('B') (1 byte); sem __dict__ (__slots__)
+    - dates_outbound/dates_inbound continuam existindo como visões
+      [(data_iso, assentos)], então renderer e templates funcionam igual
+    
+    Limites: datas entre 2000-01-01 e ~2179, assentos de 0 a 255.
+    
+    Exemplo:
+        >>> compact = CompactFlightBatch.from_batch(batch)
+        >>> compact.dates_outbound
+        [("2026-05-01", 9), ("2026-05-05", 4)]
+    """
+    
+    __slots__ = (
+        'origin', 'origin_code', 'origin_flag', 'destination', 'dest_code',
+        'dest_flag', 'airline', 'program', 'cost', 'cabin', 'notes',
+        'min_cost', 'max_cost', '_out_days', '_out_seats', '_in_days',
+        '_in_seats', '_date_views'
+    )
+    
+    def __init__(
+        self,
+        origin: str,
+        origin_code: str,
+        origin_flag: str,
+        destination: str,
+        dest_code: str,
+        dest_flag: str,
+        airline: str,
+        program: str,
+        cost: str,
+        cabin: str,
+        dates_outbound: List[Tuple[str, int]],
+        dates_inbound: List[Tuple[str, int]],
+        notes: str,
+        min_cost: Optional[int] = None,
+        max_cost: Optional[int] = None
+    ):
+        """Mesmos argumentos do FlightBatch."""
+        self.origin = origin
+        self.origin_code = origin_code
+        self.origin_flag = origin_flag
+        self.destination = destination
+        self.dest_code = dest_code
+        self.dest_flag = dest_flag
+        self.airline = airline
+        self.program = program
+        self.cost = cost
+        self.cabin = cabin
+        self.notes = notes
+        self.min_cost = min_cost
+        self.max_cost = max_cost
+        self._date_views = {}
+        self.dates_outbound = dates_outbound
+        self.dates_inbound = dates_inbound
+    
+    @property
+    def dates_outbound(self) -> List[Tuple[str, int]]:
+        """Datas de ida como [(data_iso, assentos)] (nova lista a cada acesso)."""
+        return _unpack_dates(self._out_days, self._out_seats)
+    
+    @dates_outbound.setter
+    def dates_outbound(self, dates: List[Tuple[str, int]]) -> None:
+        self._out_days, self._out_seats = _pack_dates(dates)
+        self._date_views.clear()
+    
+    @property
+    def dates_inbound(self) -> List[Tuple[str, int]]:
+        """Datas de volta como [(data_iso, assentos)] (nova lista a cada acesso)."""
+        return _unpack_dates(self._in_days, self._in_seats)
+    
+    @dates_inbound.setter
+    def dates_inbound(self, dates: List[Tuple[str, int]]) -> None:
+        self._in_days, self._in_seats = _pack_dates(dates)
+        self._date_views.clear()
+    
+    @classmethod
+    def from_batch(cls, batch: FlightBatch) -> 'CompactFlightBatch':
+        """Cria a versão compacta de um FlightBatch."""
+        return cls(
+            batch.origin, batch.origin_code, batch.origin_flag,
+            batch.destination, batch.dest_code, batch.dest_flag,
+            batch.airline, batch.program, batch.cost, batch.cabin,
+            batch.dates_outbound, batch.dates_inbound, batch.notes,
+            batch.min_cost, batch.max_cost
+        )
+    
+    def to_batch(self) -> FlightBatch:
+        """Converte de volta para FlightBatch."""
+        return FlightBatch(
+            self.origin, self.origin_code, self.origin_flag,
+            self.destination, self.dest_code, self.dest_flag,
+            self.airline, self.program, self.cost, self.cabin,
+            self.dates_outbound, self.dates_inbound, self.notes,
+            self.min_cost, self.max_cost
+        )
+    
+    def invalidate_date_views(self) -> None:
+        """Descarta as visões de datas em cache (ver FlightBatch)."""
+        self._date_views.clear()
+    
+    # Mesma API de leitura do FlightBatch
+    route = FlightBatch.route
+    enrich_airport_data = FlightBatch.enrich_airport_data
+    _date_view = FlightBatch._date_view
+    format_dates_by_month = FlightBatch.format_dates_by_month
+    get_dates_grouped_dict = FlightBatch.get_dates_grouped_dict
+    get_formatted_outbound_dates = FlightBatch.get_formatted_outbound_dates
+    get_formatted_inbound_dates = FlightBatch.get_formatted_inbound_dates
+    get_outbound_dates_dict = FlightBatch.get_outbound_dates_dict
+    get_inbound_dates_dict = FlightBatch.get_inbound_dates_dict
+    
+    def __repr__(self) -> str:
+        return (
+            f"CompactFlightBatch({self.origin_code}-{self.dest_code} {self.airline!r} "
+            f"outbound={len(self._out_days)} inbound={len(self._in_days)})"
+        )
+
+
+class AvailabilityRecord:
+    """
+    Registro de disponibilidade da API Seats.aero já normalizado.
+    
+    Por que esta classe existe?
+    - A API devolve dicts com campos variáveis (Airline, Route.Airline,
+      MarketingCarrier, Date/DepartureDate, custos por cabine...)
+    - Antes, cada etapa (filtro, agrupamento) refazia essas buscas no dict
+    - Agora cada voo é convertido UMA vez e o resto do pipeline só lê atributos
+    - Só a cabine pedida é extraída (custo e assentos): o registro vale
+      para uma consulta, não para todas as cabines
+    - __slots__ evita o __dict__ por instância (menos memória em 100k+ linhas)
+    
+    Attributes:
+        origin: Código IATA de origem em maiúsculas ('' se ausente)
+        destination: Código IATA de destino em maiúsculas ('' se ausente)
+        airline: Companhia resolvida (ex: 'United Airlines')
+        airline_origin: Como a companhia foi obtida:
+                        'direct' (campo da API), 'source' (SOURCE_TO_AIRLINE),
+                        'fallback' (Source capitalizado) ou 'unknown'
+        source: Código do programa em minúsculas (ex: 'united')
+        date: Data do voo como veio da API (ex: '2026-06-15')
+        seats: Assentos disponíveis na cabine solicitada
+        cost: Custo em milhas na cabine solicitada; sem ele, o custo genérico
+              (MilesCost, Miles, Cost...) de APIs antigas (0 = sem disponibilidade)
+        last_seen: Última atualização como epoch (None se ausente/inválida)
+        direct: True se o voo é direto
+    """
+    
+    __slots__ = (
+        'origin', 'destination', 'airline', 'airline_origin', 'source', 'date',
+        'seats', 'cost', 'last_seen', 'direct',
+    )
     
-    def get_outbound_dates_dict(self) -> Dict[str, str]:
-        """Retorna datas de ida como dicionário (para usar em templates)."""
-        return self.get_dates_grouped_dict(self.dates_outbound)
+    def __init__(
+        self,
+        origin: str,
+        destination: str,
+        airline: str,
+        airline_origin: str,
+        source: str,
+        date: str,
+        seats: int,
+        cost: int = 0,
+        last_seen: Optional[float] = None,
+        direct: bool = True
+    ):
+        self.origin = origin
+        self.destination = destination
+        self.airline = airline
+        self.airline_origin = airline_origin
+        self.source = source
+        self.date = date
+        self.seats = seats
+        self.cost = cost
+        self.last_seen = last_seen
+        self.direct = direct
     
-    def get_inbound_dates_dict(self) -> Dict[str, str]:
-        """Retorna datas de volta como dicionário (para usar em templates)."""
-        return self.get_dates_grouped_dict(self.dates_inbound)
+    def __repr__(self) -> str:
+        return (
+            f"AvailabilityRecord({self.origin}-{self.destination} {self.date} "
+            f"{self.airline!r} source={self.source!r} seats={self.seats} cost={self.cost})"
+        )
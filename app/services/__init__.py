@@ -3,5 +3,7 @@ Services - Módulo de serviços externos e integrações
 
 Este módulo contém:
 - seats_client.py: Cliente da API Seats.aero
+- async_seats_client.py: Cliente assíncrono da API Seats.aero (httpx)
+- columnar_engine.py: Filtro/agrupamento vetorizado (NumPy, opcional)
 - file_service.py: Serviço de importação de arquivos (input.txt)
 """
@@ -0,0 +1,425 @@
+"""
+Async Seats.aero API Client
+
+Asyncio sibling of SeatsAeroClient, backed by an httpx connection pool.
+Same surface (search_availability, get_routes, get_programs) and same
+error mapping as the sync client.
+"""
+
+import asyncio
+import httpx
+from typing import Optional, Dict, Any, List, Tuple, Iterable, AsyncIterator
+from app.core.config import Config
+from app.services.seats_client import SeatsAeroClient, check_api_status
+from app.services.rate_limiter import (
+    TokenBucket, RetryPolicy, get_shared_rate_limiter, parse_retry_after
+)
+
+
+class AsyncSeatsAeroClient:
+    """
+    Async client for Seats.aero Partner API.
+    
+    Pensado para o daemon de alertas, que consulta centenas de rotas:
+    em vez de uma thread por requisição, todas as buscas compartilham
+    um único pool de conexões assíncrono.
+    
+    Example:
+        >>> async with AsyncSeatsAeroClient() as client:
+        ...     results = await client.search_availability("GRU", "MIA", days=365)
+    """
+    
+    # Resultados por página no /search (parâmetro 'take' da API)
+    SEARCH_PAGE_SIZE = SeatsAeroClient.SEARCH_PAGE_SIZE
+    
+    # Conexões simultâneas no pool (e buscas simultâneas no search_many)
+    MAX_CONNECTIONS = 20
+    
+    # Processamento local é o mesmo do cliente síncrono
+    extract_flights = staticmethod(SeatsAeroClient.extract_flights)
+    process_search_results = staticmethod(SeatsAeroClient.process_search_results)
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: int = MAX_CONNECTIONS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        timeout: float = Config.SEATS_TIMEOUT
+    ):
+        """
+        Initialize async Seats.aero client.
+        
+        Args:
+            api_key: Optional API key. If not provided, uses Config.SEATS_API_KEY
+            max_connections: Size of the async connection pool
+            transport: Optional custom httpx transport (e.g. for tests)
+            rate_limiter: Token bucket pacing requests (defaults to the
+                          process-wide limiter shared by all clients)
+            retry_policy: Retry/backoff policy for 429 and 5xx responses
+            timeout: Default request timeout in seconds
+        """
+        self.api_key = api_key or Config.SEATS_API_KEY
+        self.base_url = Config.SEATS_BASE_URL
+        
+        if not self.api_key:
+            Config.validate()  # Raises helpful error message
+        
+        self.max_connections = max_connections
+        self.session = httpx.AsyncClient(
+            headers={
+                'Partner-Authorization': self.api_key,
+                'Content-Type': 'application/json',
+                'User-Agent': 'MileageBot/1.0'
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            transport=transport
+        )
+        
+        # Ritmo global + retry com backoff em 429/5xx
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=Config.SEATS_MAX_RETRIES)
+        self.timeout = timeout
+    
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Make async HTTP request to Seats.aero API.
+        
+        Same pacing and retry behaviour as SeatsAeroClient._make_request().
+        
+        Args:
+            method: HTTP method (GET, POST, etc)
+            endpoint: API endpoint (without base URL)
+            params: Query parameters
+            json_data: JSON body for POST/PUT
+            timeout: Request timeout in seconds (defaults to self.timeout)
+        
+        Returns:
+            JSON response as dict
+        
+        Raises:
+            ConnectionError: Network/connection issues
+            ValueError: Invalid response or API error
+        """
+        url = f"{self.base_url}{endpoint}"
+        timeout = timeout or self.timeout
+        
+        try:
+            attempt = 0
+            while True:
+                # Respeita o ritmo global (compartilhado entre tasks e threads)
+                await self.rate_limiter.acquire_async()
+                
+                response = await self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=json_data,
+                    timeout=timeout
+                )
+                
+                if not self.retry_policy.should_retry(response.status_code, attempt):
+                    break
+                
+                # 429/5xx: espera e tenta de novo
+                await asyncio.sleep(self._retry_delay(response, attempt))
+                attempt += 1
+            
+            if response.status_code < 400:
+                self.rate_limiter.reward()
+            
+            # Check for HTTP errors (mesmo mapeamento do cliente síncrono)
+            check_api_status(response.status_code)
+            
+            response.raise_for_status()
+            
+            # Parse JSON
+            try:
+                return response.json()
+            except ValueError:
+                raise ValueError(
+                    f"❌ Resposta inválida da API (não é JSON): {response.text[:200]}"
+                )
+        
+        except httpx.TimeoutException:
+            raise ConnectionError(
+                f"❌ Timeout após {timeout}s. Verifique sua conexão ou tente novamente."
+            )
+        except httpx.TransportError as e:
+            raise ConnectionError(
+                f"❌ Erro de conexão: {str(e)}\n"
+                "Verifique sua internet ou se a API está disponível."
+            )
+        except httpx.HTTPError as e:
+            raise ConnectionError(f"❌ Erro na requisição: {str(e)}")
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """
+        Compute how long to wait before retrying a 429/5xx response.
+        
+        Args:
+            response: Response with status 429 or 5xx
+            attempt: Retries already made (0 on the first failure)
+        
+        Returns:
+            Seconds to wait
+        """
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        
+        if response.status_code == 429:
+            self.rate_limiter.penalize(retry_after)
+        
+        return self.retry_policy.backoff(attempt, retry_after)
+    
+    async def search_availability(
+        self,
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Search for award seat availability (first page only).
+        
+        Mesma semântica de SeatsAeroClient.search_availability().
+        
+        Args:
+            origin: Origin airport code (e.g., "GRU")
+            destination: Destination airport code (e.g., "MIA")
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+        
+        Returns:
+            JSON response with availability data (raw from API)
+        """
+        params = SeatsAeroClient._build_search_params(
+            origin, destination, date_start, date_end, days, cabin_class
+        )
+        
+        try:
+            return await self._make_request('GET', '/search', params=params)
+        except Exception as e:
+            # Fallback para endpoint alternativo
+            try:
+                return await self._make_request('GET', '/availability', params=params)
+            except Exception:
+                pass
+            raise e
+    
+    async def iter_search_pages(
+        self,
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        page_size: int = SEARCH_PAGE_SIZE,
+        max_pages: Optional[int] = None,
+        prefetch: bool = True
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream /search results page by page, following the API pagination.
+        
+        Com prefetch=True a próxima página vira uma task que corre
+        enquanto a página atual é consumida.
+        
+        Args:
+            origin: Origin airport code (e.g., "GRU")
+            destination: Destination airport code (e.g., "MIA")
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+            page_size: Results per page ('take' param)
+            max_pages: Optional safety limit of pages to fetch
+            prefetch: Fetch the next page while the current one is consumed
+        
+        Yields:
+            List of raw flight dicts for each page
+        """
+        params = SeatsAeroClient._build_search_params(
+            origin, destination, date_start, date_end, days, cabin_class
+        )
+        params['take'] = page_size
+        
+        task = None
+        try:
+            response = await self._make_request('GET', '/search', params=params)
+            pages = 0
+            fetched = 0
+            
+            while True:
+                flights = self.extract_flights(response)
+                pages += 1
+                fetched += len(flights)
+                
+                # Página vazia encerra (evita loop infinito com cursor inválido)
+                next_params = SeatsAeroClient._next_page_params(params, response, fetched) if flights else None
+                if max_pages is not None and pages >= max_pages:
+                    next_params = None
+                
+                # Dispara a próxima página antes de entregar a atual
+                task = None
+                if next_params is not None and prefetch:
+                    task = asyncio.ensure_future(
+                        self._make_request('GET', '/search', params=next_params)
+                    )
+                
+                if flights:
+                    yield flights
+                
+                if next_params is None:
+                    break
+                
+                if task is not None:
+                    response = await task
+                    task = None
+                else:
+                    response = await self._make_request('GET', '/search', params=next_params)
+        finally:
+            if task is not None:
+                task.cancel()
+    
+    async def iter_search_results(
+        self,
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        **page_options: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every flight of a /search, across all pages.
+        
+        Args:
+            origin: Origin airport code (e.g., "GRU")
+            destination: Destination airport code (e.g., "MIA")
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+            **page_options: page_size, max_pages, prefetch
+        
+        Yields:
+            Raw flight dicts
+        """
+        async for page in self.iter_search_pages(
+            origin, destination, date_start, date_end, days, cabin_class, **page_options
+        ):
+            for flight in page:
+                yield flight
+    
+    async def search_many(
+        self,
+        routes: Iterable[Tuple[str, str]],
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[Tuple[str, str], Exception]]:
+        """
+        Search several origin/destination pairs concurrently.
+        
+        Mesmo contrato de SeatsAeroClient.search_many(), mas com tasks
+        limitadas por um semáforo em vez de um pool de threads.
+        
+        Args:
+            routes: Iterable of (origin, destination) pairs
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+            max_concurrency: Concurrent searches (defaults to max_connections)
+        
+        Returns:
+            Tuple (flights, errors):
+            - flights: raw flights of all routes, merged in route order
+            - errors: {(origin, destination): exception} for failed routes
+        """
+        routes = [(origin.upper(), destination.upper()) for origin, destination in routes]
+        if not routes:
+            return [], {}
+        
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_connections)
+        
+        async def fetch_route(route: Tuple[str, str]) -> List[Dict[str, Any]]:
+            origin, destination = route
+            async with semaphore:
+                return [
+                    flight async for flight in self.iter_search_results(
+                        origin, destination, date_start, date_end, days, cabin_class,
+                        prefetch=False
+                    )
+                ]
+        
+        results = await asyncio.gather(
+            *(fetch_route(route) for route in routes),
+            return_exceptions=True
+        )
+        
+        # Junta na ordem das rotas (resultado determinístico)
+        flights: List[Dict[str, Any]] = []
+        errors: Dict[Tuple[str, str], Exception] = {}
+        for route, result in zip(routes, results):
+            if isinstance(result, Exception):
+                errors[route] = result
+            else:
+                flights.extend(result)
+        
+        return flights, errors
+    
+    async def get_routes(self, origin: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get available routes from Seats.aero.
+        
+        Args:
+            origin: Optional origin filter
+        
+        Returns:
+            JSON with available routes
+        """
+        params = {}
+        if origin:
+            params['origin'] = origin.upper()
+        
+        return await self._make_request('GET', '/routes', params=params)
+    
+    async def get_programs(self) -> Dict[str, Any]:
+        """
+        Get list of supported loyalty programs.
+        
+        Returns:
+            JSON with program data
+        """
+        return await self._make_request('GET', '/programs')
+    
+    async def close(self):
+        """Close the connection pool (cleanup)."""
+        await self.session.aclose()
+    
+    async def __aenter__(self):
+        """Async context manager support."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager cleanup."""
+        await self.close()
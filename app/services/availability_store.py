@@ -0,0 +1,250 @@
+"""
+Availability Store - Base local (SQLite) dos voos retornados pela API
+
+Antes, cada execução do --mode api descartava o payload cru do /search
+depois de montar os FlightBatch. Com a base local:
+
+1. Cada voo recebido é gravado (upsert) com chave
+   (origem, destino, data, programa, cabine), em transações em lote
+2. O payload cru fica guardado como JSON, então process_search_results
+   roda sobre a base exatamente como rodaria sobre a resposta da API
+3. Mudar filtros (--airline, --max-cost, --direct...) e reprocessar
+   com --offline não gasta nenhuma requisição
+
+Exemplo:
+    >>> with AvailabilityStore() as store:
+    ...     store.upsert(flights, cabin='business')
+    ...     batches = SeatsAeroClient.process_search_results(
+    ...         store.iter_flights('business', routes=[('GRU', 'MIA')]),
+    ...         max_cost_filter=80000
+    ...     )
+"""
+
+import json
+import sqlite3
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from app.core.config import Config
+from app.services.seats_client import SeatsAeroClient
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS availability (
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    cabin TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    last_seen REAL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (origin, destination, date, source, cabin)
+) WITHOUT ROWID;
+-- A chave primária já atende rota e rota + período; este índice atende
+-- consultas só por período (todas as rotas)
+CREATE INDEX IF NOT EXISTS idx_availability_date ON availability (date, cabin);
+"""
+
+UPSERT = """
+INSERT INTO availability (origin, destination, date, source, cabin, payload, last_seen, stored_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (origin, destination, date, source, cabin) DO UPDATE SET
+    payload = excluded.payload,
+    last_seen = excluded.last_seen,
+    stored_at = excluded.stored_at
+"""
+
+
+class AvailabilityStore:
+    """
+    Base SQLite de disponibilidade, uma linha por (rota, data, programa, cabine).
+    
+    Uma resposta nova para a mesma chave substitui a anterior; voos que
+    saíram da API continuam na base até serem sobrescritos ou removidos
+    com prune().
+    """
+    
+    def __init__(self, path: Union[str, Path, None] = None, batch_size: int = 500):
+        """
+        Args:
+            path: Arquivo SQLite (padrão: Config.AVAILABILITY_DB; ':memory:' em testes)
+            batch_size: Voos por executemany dentro da transação
+        """
+        self.path = str(path or Config.AVAILABILITY_DB)
+        self.batch_size = batch_size
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+    
+    @staticmethod
+    def _row(flight: Dict[str, Any], cabin: str, now: float) -> Optional[Tuple]:
+        """
+        Linha da tabela para um voo cru (None se faltar rota ou data).
+        
+        Lê só os campos da chave direto do dict, com os mesmos campos
+        alternativos de SeatsAeroClient.normalize_flight (sem normalizar
+        o voo inteiro de novo).
+        """
+        get = flight.get
+        
+        route = get('Route')
+        if isinstance(route, dict):
+            origin = route.get('OriginAirport')
+            destination = route.get('DestinationAirport')
+        else:
+            origin = get('OriginAirport')
+            if origin is None:
+                origin = get('Origin')
+            destination = get('DestinationAirport')
+            if destination is None:
+                destination = get('Destination')
+        
+        date = get('Date')
+        if date is None:
+            date = get('DepartureDate')
+            if date is None:
+                date = get('DepartDate')
+        
+        if not origin or not destination or not date:
+            return None
+        
+        last_seen = get('LastSeen')
+        if last_seen is None:
+            last_seen = get('UpdatedAt')
+            if last_seen is None:
+                last_seen = get('CreatedAt')
+        
+        payload = json.dumps(flight, ensure_ascii=False, separators=(',', ':'))
+        return (origin.upper(), destination.upper(), date[:10], (get('Source') or '').lower(), cabin,
+                payload, SeatsAeroClient._parse_last_seen(last_seen), now)
+    
+    def upsert(self, flights: Iterable[Dict[str, Any]], cabin: str = 'business') -> int:
+        """
+        Grava (insere ou atualiza) os voos em UMA transação.
+        
+        Args:
+            flights: Voos crus da API (lista ou iterável)
+            cabin: Classe buscada (parte da chave)
+        
+        Returns:
+            Quantidade de voos gravados (sem rota/data são ignorados)
+        """
+        cabin = cabin.lower()
+        now = time.time()
+        rows = (row for row in (self._row(flight, cabin, now) for flight in flights) if row)
+        written = 0
+        
+        with self._conn:
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                self._conn.executemany(UPSERT, chunk)
+                written += len(chunk)
+        
+        return written
+    
+    def record(self, flights: Iterable[Dict[str, Any]], cabin: str = 'business') -> Iterator[Dict[str, Any]]:
+        """
+        Repassa os voos (streaming) gravando-os em lotes de batch_size.
+        
+        Permite gravar sem atrasar o pipeline:
+            process_search_results(store.record(client.iter_search_results(...)))
+        
+        O último lote é gravado mesmo se o consumidor parar no meio
+        (close()/GeneratorExit) ou a iteração levantar erro: todo voo já
+        repassado fica na base.
+        
+        Yields:
+            Os mesmos voos, na mesma ordem
+        """
+        pending: List[Dict[str, Any]] = []
+        try:
+            for flight in flights:
+                pending.append(flight)
+                if len(pending) >= self.batch_size:
+                    self.upsert(pending, cabin)
+                    pending = []
+                yield flight
+        finally:
+            if pending:
+                self.upsert(pending, cabin)
+    
+    def iter_flights(
+        self,
+        cabin: str = 'business',
+        routes: Optional[Iterable[Tuple[str, str]]] = None,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lê os voos crus guardados, prontos para process_search_results.
+        
+        Args:
+            cabin: Classe buscada
+            routes: Pares (origem, destino); None = todas as rotas
+            date_start: Data inicial ISO (inclusiva)
+            date_end: Data final ISO (inclusiva)
+        
+        Yields:
+            Payload original de cada voo, ordenado por rota, data e programa
+        """
+        conditions = ["cabin = ?"]
+        params: List[Any] = [cabin.lower()]
+        if date_start:
+            conditions.append("date >= ?")
+            params.append(date_start)
+        if date_end:
+            conditions.append("date <= ?")
+            params.append(date_end)
+        
+        base = f"SELECT payload FROM availability WHERE {' AND '.join(conditions)}"
+        order = " ORDER BY origin, destination, date, source"
+        
+        if routes is None:
+            queries = [(base + order, params)]
+        else:
+            # Uma consulta por rota (usa o prefixo da chave primária) e
+            # resultado na ordem das rotas, como no search_many
+            queries = [
+                (base + " AND origin = ? AND destination = ?" + order,
+                 params + [origin, destination])
+                for origin, destination in dict.fromkeys(
+                    (origin.upper(), destination.upper()) for origin, destination in routes
+                )
+            ]
+        
+        for sql, query_params in queries:
+            for (payload,) in self._conn.execute(sql, query_params):
+                yield json.loads(payload)
+    
+    def count(self) -> int:
+        """Total de voos guardados."""
+        return self._conn.execute("SELECT COUNT(*) FROM availability").fetchone()[0]
+    
+    def prune(self, before_date: str) -> int:
+        """
+        Remove voos com data anterior a before_date (ex: datas que já passaram).
+        
+        Returns:
+            Quantidade de linhas removidas
+        """
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM availability WHERE date < ?", (before_date,))
+        return cursor.rowcount
+    
+    def close(self) -> None:
+        """Fecha a conexão."""
+        self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
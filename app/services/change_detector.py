@@ -0,0 +1,235 @@
+"""
+Change Detector - Envia só o que mudou entre duas varreduras
+
+Cada execução renderizava TODOS os batches, mesmo sem novidade. Aqui cada
+batch vira uma impressão digital compacta, guardada em um snapshot JSON:
+
+- Chave: rota + companhia + programa + cabine
+- Valor: [menor custo, datas de ida, datas de volta], com as datas
+  empacotadas como em CompactFlightBatch (3 bytes por data, base64).
+  Assentos acima de 255 são limitados a 255; datas fora de 2000..2179
+  (ou fora do padrão ISO) vão sem empacotar, como [[data, assentos], ...]
+
+Na varredura seguinte, cada batch é comparado com a impressão anterior
+da mesma chave (O(n), sem guardar os payloads antigos) e só entra no
+envio se tiver:
+- Datas novas
+- Mais assentos em uma data já conhecida
+- Queda no menor custo
+
+Exemplo:
+    >>> detector = ChangeDetector()
+    >>> changes = detector.diff(batches)
+    >>> render_batches(console, [change.batch for change in changes])
+    >>> detector.update(batches)
+    >>> detector.save()
+"""
+
+import base64
+import json
+import os
+import tempfile
+from array import array
+from datetime import date
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from app.core.config import Config
+from app.core.models import FlightBatch, COMPACT_EPOCH, _pack_dates
+
+
+SNAPSHOT_VERSION = 1
+_EPOCH_ORDINAL = COMPACT_EPOCH.toordinal()
+
+# Maior contagem de assentos guardada na impressão (array 'B')
+MAX_FINGERPRINT_SEATS = 255
+
+
+def _encode_dates(dates: List[Tuple[str, int]]) -> Union[str, List[List[Any]]]:
+    """
+    [(data_iso, assentos)] → base64 de dias (array 'H') + assentos (array 'B').
+    
+    Assentos são limitados a 0..255. Se alguma data não couber no formato
+    compacto, devolve a lista [[data, assentos], ...] sem empacotar.
+    """
+    dates = sorted((date_str, min(max(seats, 0), MAX_FINGERPRINT_SEATS)) for date_str, seats in dates)
+    try:
+        days, seats = _pack_dates(dates)
+    except ValueError:
+        # Mesma chave de data do formato compacto (só o dia)
+        return [[date_str[:10], seats] for date_str, seats in dates]
+    return base64.b64encode(days.tobytes() + seats.tobytes()).decode('ascii')
+
+
+def _decode_dates(encoded: Union[str, List[List[Any]]]) -> Dict[str, int]:
+    """Inverso de _encode_dates, como {data_iso: assentos}."""
+    if isinstance(encoded, list):
+        return {date_str: seats for date_str, seats in encoded}
+    
+    raw = base64.b64decode(encoded)
+    count = len(raw) // 3
+    days = array('H')
+    days.frombytes(raw[:count * 2])
+    seats = array('B')
+    seats.frombytes(raw[count * 2:])
+    return {date.fromordinal(_EPOCH_ORDINAL + offset).isoformat(): seat_count
+            for offset, seat_count in zip(days, seats)}
+
+
+@dataclass
+class BatchChange:
+    """
+    O que mudou em um batch desde a varredura anterior.
+    
+    Attributes:
+        batch: FlightBatch atual (completo)
+        is_new: True se a chave não existia no snapshot
+        new_dates: Datas que não existiam (data_iso, assentos)
+        more_seats: Datas com mais assentos (data_iso, antes, agora)
+        previous_cost: Menor custo anterior, se o atual for menor
+    """
+    batch: FlightBatch
+    is_new: bool = False
+    new_dates: List[Tuple[str, int]] = field(default_factory=list)
+    more_seats: List[Tuple[str, int, int]] = field(default_factory=list)
+    previous_cost: Optional[int] = None
+    
+    def summary(self) -> str:
+        """Resumo curto da mudança (ex: '🆕 2 data(s) nova(s) | 📉 80000 → 70000')."""
+        if self.is_new:
+            return "🆕 Disponibilidade nova"
+        parts = []
+        if self.new_dates:
+            parts.append(f"🆕 {len(self.new_dates)} data(s) nova(s)")
+        if self.more_seats:
+            parts.append(f"📈 {len(self.more_seats)} data(s) com mais assentos")
+        if self.previous_cost is not None:
+            parts.append(f"📉 {self.previous_cost} → {self.batch.min_cost} milhas")
+        return " | ".join(parts)
+
+
+class ChangeDetector:
+    """
+    Compara batches com o snapshot da varredura anterior.
+    
+    O snapshot é um JSON pequeno (impressões digitais, não payloads) e
+    só é gravado em save(), depois que os alertas foram enviados.
+    """
+    
+    def __init__(self, path: Union[str, Path, None] = None):
+        """
+        Args:
+            path: Arquivo do snapshot (padrão: Config.SNAPSHOT_FILE).
+                  Ausente ou inválido = primeira varredura (tudo é novo).
+        """
+        self.path = Path(path or Config.SNAPSHOT_FILE)
+        self.fingerprints: Dict[str, List[Any]] = {}
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return
+        if isinstance(snapshot, dict) and snapshot.get('version') == SNAPSHOT_VERSION:
+            self.fingerprints = snapshot.get('batches', {})
+    
+    @staticmethod
+    def batch_key(batch: FlightBatch) -> str:
+        """Chave estável do batch: rota, companhia, programa e cabine."""
+        return f"{batch.origin_code}-{batch.dest_code}|{batch.airline}|{batch.program}|{batch.cabin}"
+    
+    @staticmethod
+    def fingerprint(batch: FlightBatch) -> List[Any]:
+        """Impressão digital compacta: [menor custo, ida, volta]."""
+        return [
+            batch.min_cost or 0,
+            _encode_dates(batch.dates_outbound),
+            _encode_dates(batch.dates_inbound),
+        ]
+    
+    def compare(self, batch: FlightBatch) -> Optional[BatchChange]:
+        """
+        Compara UM batch com a impressão anterior da mesma chave.
+        
+        Returns:
+            BatchChange se houver novidade, None se nada melhorou
+        """
+        current = self.fingerprint(batch)
+        previous = self.fingerprints.get(self.batch_key(batch))
+        if previous is None:
+            return BatchChange(batch, is_new=True)
+        if previous == current:
+            return None  # Caminho rápido: nada mudou (sem decodificar datas)
+        
+        change = BatchChange(batch)
+        old_cost, new_cost = previous[0], current[0]
+        if old_cost and new_cost and new_cost < old_cost:
+            change.previous_cost = old_cost
+        
+        for old_encoded, new_encoded in zip(previous[1:], current[1:]):
+            if old_encoded == new_encoded:
+                continue
+            old_dates = _decode_dates(old_encoded)
+            for date_str, seats in _decode_dates(new_encoded).items():
+                before = old_dates.get(date_str)
+                if before is None:
+                    change.new_dates.append((date_str, seats))
+                elif seats > before:
+                    change.more_seats.append((date_str, before, seats))
+        
+        if change.new_dates or change.more_seats or change.previous_cost is not None:
+            return change
+        return None
+    
+    def diff(self, batches: Iterable[FlightBatch]) -> List[BatchChange]:
+        """
+        Batches novos ou melhorados desde o snapshot (ordem preservada).
+        
+        Não altera o snapshot; chame update() + save() depois do envio.
+        """
+        changes = []
+        for batch in batches:
+            change = self.compare(batch)
+            if change is not None:
+                changes.append(change)
+        return changes
+    
+    def update(
+        self,
+        batches: Iterable[FlightBatch],
+        routes: Optional[Iterable[Tuple[str, str]]] = None
+    ) -> None:
+        """
+        Troca as impressões pelas da varredura atual.
+        
+        Args:
+            batches: TODOS os batches da varredura (não só os alterados)
+            routes: Rotas (origem, destino) varridas. Chaves dessas rotas
+                    que sumiram da varredura são descartadas (se voltarem,
+                    contam como novas); as de outras rotas são mantidas.
+        """
+        if routes is not None:
+            prefixes = tuple(f"{origin.upper()}-{destination.upper()}|" for origin, destination in routes)
+            if prefixes:
+                self.fingerprints = {
+                    key: value for key, value in self.fingerprints.items()
+                    if not key.startswith(prefixes)
+                }
+        
+        for batch in batches:
+            self.fingerprints[self.batch_key(batch)] = self.fingerprint(batch)
+    
+    def save(self) -> None:
+        """Grava o snapshot (escrita atômica)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'batches': self.fingerprints}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
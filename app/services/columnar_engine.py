@@ -0,0 +1,359 @@
+"""
+Columnar Engine - Filtro e agrupamento vetorizados (NumPy)
+
+Caminho alternativo ao loop de SeatsAeroClient.process_search_results
+para varreduras grandes (centenas de milhares de voos):
+
+1. UMA passada pelos dicts crus monta as colunas, lendo só os campos
+   que os filtros e o agrupamento usam (sem AvailabilityRecord por voo).
+   Filtros de programa, direto e companhia descartam o voo já na passada,
+   como no caminho padrão (programa e companhia com decisão em cache por
+   valor cru distinto)
+2. Colunas de texto (rota, companhia, programa, data, custo cru) são
+   fatoradas com um dict valor → código; maiúsculas, minúsculas, custo
+   e decisões de filtro são calculados UMA vez por valor distinto
+3. Os demais filtros (staleness, rota, custo) viram máscaras booleanas
+4. Grupos (origem, destino, companhia, programa) e custos min/max saem
+   de reduções agrupadas; assentos só são lidos nas linhas que viram data
+
+A saída é a MESMA lista de FlightBatch (mesma ordem) do caminho padrão.
+Diferença conhecida: LastSeen sem fuso é lido como UTC (o caminho
+padrão usa o fuso local); a API manda sempre com 'Z'.
+
+NumPy é opcional: sem ele, process_columnar() levanta ValueError e o
+caminho padrão continua funcionando normalmente.
+
+Ver benchmarks/bench_engines.py para a comparação com o caminho padrão.
+"""
+
+import time
+import warnings
+from typing import Any, Dict, Iterable, List
+from app.core.models import FlightBatch
+from app.services.seats_client import (
+    SeatsAeroClient, FilterPlan, AirlineResolutionStats, CABIN_COST_FIELDS
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+
+NUMPY_AVAILABLE = np is not None
+
+# Origem da companhia (AvailabilityRecord.airline_origin) como código
+_KINDS = ('direct', 'source', 'fallback', 'unknown')
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+def _codes(values: List[int]):
+    """Lista de códigos → array int64."""
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+
+def _remap(raw: Dict[Any, int], canonical):
+    """
+    Junta valores crus que viram o mesmo valor canônico (ex: 'United'/'united').
+    
+    Args:
+        raw: Fatoração crua (valor → código)
+        canonical: Função valor cru → valor canônico
+    
+    Returns:
+        Tupla (fatoração canônica, array código cru → código canônico)
+    """
+    key = {}
+    mapping = np.empty(len(raw), dtype=np.int64)
+    for value, code in raw.items():
+        value = canonical(value)
+        target = key.get(value)
+        if target is None:
+            target = key[value] = len(key)
+        mapping[code] = target
+    return key, mapping
+
+
+def _parse_epochs(values: List[Any]):
+    """
+    LastSeen crus → epoch (float64, NaN se ausente/inválido).
+    
+    Converte o array inteiro de uma vez; se algum valor não for ISO 8601,
+    cai no parse por valor do caminho padrão.
+    """
+    try:
+        with warnings.catch_warnings():
+            # NumPy avisa ao converter fusos ('Z', '+03:00') para UTC
+            warnings.simplefilter('ignore')
+            parsed = np.array(values, dtype='datetime64[us]')
+    except (ValueError, TypeError):
+        parse = SeatsAeroClient._parse_last_seen
+        return np.array([parse(value) for value in values], dtype=np.float64)
+    
+    epochs = parsed.astype(np.int64) / 1e6
+    epochs[np.isnat(parsed)] = np.nan
+    return epochs
+
+
+def process_columnar(
+    results: Iterable[Dict[str, Any]],
+    filter_plan: FilterPlan,
+    requested_cabin: str = 'business'
+) -> List[FlightBatch]:
+    """
+    Versão colunar de SeatsAeroClient.process_search_results.
+    
+    Mesma saída do caminho padrão; ver process_search_results.
+    
+    Args:
+        results: Lista (ou iterável) de voos da API
+        filter_plan: Filtros pré-compilados da consulta
+        requested_cabin: Classe solicitada ("economy", "business", "first")
+    
+    Raises:
+        ValueError: Se NumPy não estiver instalado
+    """
+    if not NUMPY_AVAILABLE:
+        raise ValueError("❌ Engine 'columnar' requer NumPy (pip install numpy)")
+    
+    safe_int = SeatsAeroClient._safe_int
+    fallback_cost = SeatsAeroClient._fallback_cost
+    cost_field = CABIN_COST_FIELDS.get(requested_cabin, 'JMileageCost')
+    read_last_seen = bool(filter_plan.max_age)
+    check_direct = filter_plan.direct_only
+    check_program = bool(filter_plan.program_lower)
+    check_airline = bool(filter_plan.airline_lower)
+    resolve_airline = SeatsAeroClient._resolve_airline
+    
+    # Decisões de filtro por valor cru: programa, companhia do voo e
+    # companhia inferida pelo programa (voo sem companhia)
+    program_ok: Dict[Any, bool] = {}
+    airline_ok: Dict[Any, bool] = {}
+    inferred_ok: Dict[Any, bool] = {}
+    
+    # Fatorações cruas (valor → código, ordem da primeira aparição);
+    # companhia 0 = sem companhia no voo (inferida pelo programa)
+    source_raw: Dict[Any, int] = {}
+    airline_raw: Dict[Any, int] = {None: 0}
+    origin_raw: Dict[Any, int] = {}
+    dest_raw: Dict[Any, int] = {}
+    date_raw: Dict[Any, int] = {}
+    cost_cache: Dict[Any, int] = {}
+    
+    flights = []
+    source_col, airline_col, origin_col, dest_col, date_col, cost_col = [], [], [], [], [], []
+    last_seen_col = []
+    
+    # Uma passada pelos dicts crus
+    for flight in (results or ()):
+        get = flight.get
+        
+        source = get('Source')
+        if check_program:
+            ok = program_ok.get(source)
+            if ok is None:
+                ok = program_ok[source] = filter_plan.matches_program((source or '').lower())
+            if not ok:
+                continue
+        
+        if check_direct:
+            value = get('Direct')
+            if value is None:
+                value = get('NumStops', 1) == 0
+            if not value:
+                continue
+        
+        # Companhia (mesma prioridade de _resolve_airline) e aeroportos
+        airline = get('Airline')
+        route = get('Route')
+        if isinstance(route, dict):
+            if not airline:
+                airline = route.get('Airline')
+            origin = route.get('OriginAirport')
+            destination = route.get('DestinationAirport')
+        else:
+            origin = get('OriginAirport')
+            if origin is None:
+                origin = get('Origin')
+            destination = get('DestinationAirport')
+            if destination is None:
+                destination = get('Destination')
+        if not airline:
+            airline = get('MarketingCarrier') or get('OperatedBy') or None
+        
+        # Se não encontrou companhia, não aplica filtro (mantém voo)
+        if check_airline:
+            if airline:
+                ok = airline_ok.get(airline)
+                if ok is None:
+                    ok = airline_ok[airline] = filter_plan.matches_airline(airline)
+            else:
+                ok = inferred_ok.get(source)
+                if ok is None:
+                    name, kind = resolve_airline({}, (source or '').lower())
+                    ok = inferred_ok[source] = kind == 'unknown' or filter_plan.matches_airline(name)
+            if not ok:
+                continue
+        
+        flights.append(flight)
+        
+        code = source_raw.get(source)
+        if code is None:
+            code = source_raw[source] = len(source_raw)
+        source_col.append(code)
+        
+        code = airline_raw.get(airline)
+        if code is None:
+            code = airline_raw[airline] = len(airline_raw)
+        airline_col.append(code)
+        
+        code = origin_raw.get(origin)
+        if code is None:
+            code = origin_raw[origin] = len(origin_raw)
+        origin_col.append(code)
+        
+        code = dest_raw.get(destination)
+        if code is None:
+            code = dest_raw[destination] = len(dest_raw)
+        dest_col.append(code)
+        
+        value = get('Date')
+        if value is None:
+            value = get('DepartureDate')
+            if value is None:
+                value = get('DepartDate')
+        code = date_raw.get(value)
+        if code is None:
+            code = date_raw[value] = len(date_raw)
+        date_col.append(code)
+        
+        # Custo: conversão em cache por valor cru
+        value = get(cost_field)
+        cost = cost_cache.get(value)
+        if cost is None:
+            cost = cost_cache[value] = safe_int(value)
+        if not cost:
+            value = fallback_cost(flight)
+            cost = cost_cache.get(value)
+            if cost is None:
+                cost = cost_cache[value] = safe_int(value)
+        cost_col.append(cost)
+        
+        if read_last_seen:
+            value = get('LastSeen')
+            if value is None:
+                value = get('UpdatedAt')
+                if value is None:
+                    value = get('CreatedAt')
+            last_seen_col.append(value if isinstance(value, str) else '')
+        
+    if not flights:
+        return []
+    
+    # Valores canônicos (calculados por valor distinto, não por linha)
+    sources, source_map = _remap(source_raw, lambda value: (value or '').lower())
+    origins, origin_map = _remap(origin_raw, lambda value: (value or '').upper())
+    dests, dest_map = _remap(dest_raw, lambda value: (value or '').upper())
+    source_codes = source_map[_codes(source_col)]
+    origin_codes = origin_map[_codes(origin_col)]
+    dest_codes = dest_map[_codes(dest_col)]
+    airline_raw_codes = _codes(airline_col)
+    date_codes = _codes(date_col)
+    costs = _codes(cost_col)
+    
+    # Companhia resolvida: a do voo ou a inferida pelo programa
+    airlines, airline_map = _remap(airline_raw, lambda value: value)
+    source_airline = np.empty(len(sources), dtype=np.int64)
+    source_kind = np.empty(len(sources), dtype=np.int64)
+    for source, code in sources.items():
+        name, kind = resolve_airline({}, source)
+        target = airlines.get(name)
+        if target is None:
+            target = airlines[name] = len(airlines)
+        source_airline[code] = target
+        source_kind[code] = _KIND_CODES[kind]
+    
+    has_airline = airline_raw_codes != 0
+    airline_codes = np.where(has_airline, airline_map[airline_raw_codes], source_airline[source_codes])
+    kinds = np.where(has_airline, _KIND_CODES['direct'], source_kind[source_codes])
+    
+    # Filtros por linha (máscaras)
+    keep = np.ones(len(flights), dtype=bool)
+    
+    if read_last_seen:
+        age = time.time() - _parse_epochs(last_seen_col)
+        # NaN (data ausente/inválida) compara False → mantém
+        keep &= ~(age > filter_plan.max_age)
+    
+    # Diagnóstico: como a companhia foi obtida (mesmo resumo do caminho padrão)
+    stats = AirlineResolutionStats()
+    source_names = list(sources)
+    tally = np.bincount(source_codes[keep] * len(_KINDS) + kinds[keep],
+                        minlength=len(sources) * len(_KINDS))
+    for index in np.flatnonzero(tally).tolist():
+        source_code, kind = divmod(index, len(_KINDS))
+        stats.add_count(source_names[source_code], _KINDS[kind], int(tally[index]))
+    stats.log_summary()
+    
+    # Rota precisa de origem e destino
+    origin_names = list(origins)
+    dest_names = list(dests)
+    keep &= np.array([bool(name) for name in origin_names], dtype=bool)[origin_codes]
+    keep &= np.array([bool(name) for name in dest_names], dtype=bool)[dest_codes]
+    
+    kept = np.flatnonzero(keep)
+    if not len(kept):
+        return []
+    
+    # Grupos na ordem da primeira aparição (igual ao dict do caminho padrão)
+    keys = ((origin_codes[kept] * len(dests) + dest_codes[kept]) * len(airlines)
+            + airline_codes[kept]) * len(sources) + source_codes[kept]
+    _, first_index, group_ids = np.unique(keys, return_index=True, return_inverse=True)
+    group_ids = group_ids.reshape(-1)
+    order_of_group = np.empty(len(first_index), dtype=np.int64)
+    order_of_group[np.argsort(first_index, kind='stable')] = np.arange(len(first_index))
+    group_rank = order_of_group[group_ids]
+    
+    # Linhas que entram nas datas do batch
+    date_values = [value or '' for value in date_raw]
+    has_date = np.array([bool(value) for value in date_values], dtype=bool)
+    row_costs = costs[kept]
+    contributes = has_date[date_codes[kept]] & (row_costs != 0)
+    if filter_plan.max_cost:
+        contributes &= row_costs <= filter_plan.max_cost
+    
+    rows = kept[contributes]
+    if not len(rows):
+        return []
+    ranks = group_rank[contributes]
+    row_costs = row_costs[contributes]
+    
+    # Ordenação estável: agrupa mantendo a ordem original das datas
+    order = np.argsort(ranks, kind='stable')
+    rows, ranks, row_costs = rows[order], ranks[order], row_costs[order]
+    starts = np.flatnonzero(np.r_[True, ranks[1:] != ranks[:-1]])
+    ends = np.r_[starts[1:], len(rows)]
+    
+    # Reduções agrupadas
+    min_costs = np.minimum.reduceat(row_costs, starts).tolist()
+    max_costs = np.maximum.reduceat(row_costs, starts).tolist()
+    
+    airline_names = list(airlines)
+    raw_seats = SeatsAeroClient._raw_seats
+    row_dates = date_codes[rows].tolist()
+    rows = rows.tolist()
+    
+    batches = []
+    for start, end, min_cost, max_cost in zip(starts.tolist(), ends.tolist(), min_costs, max_costs):
+        first = rows[start]
+        dates = [
+            (date_values[row_dates[i]], safe_int(raw_seats(flights[rows[i]], requested_cabin), default=4))
+            for i in range(start, end)
+        ]
+        batches.append(SeatsAeroClient._make_batch(
+            origin_names[origin_codes[first]], dest_names[dest_codes[first]],
+            airline_names[airline_codes[first]], source_names[source_codes[first]],
+            dates, min_cost, max_cost, requested_cabin
+        ))
+    
+    return batches
@@ -5,7 +5,10 @@ Este módulo é responsável por ler e parsear arquivos no formato input.txt
 e transformá-los em objetos FlightBatch.
 """
 
-from typing import List, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 import re
 from app.core.models import FlightBatch
 
@@ -22,6 +25,16 @@ MONTH_TO_NUM = {
     'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
 }
 
+# Padrões compilados uma vez (usados em todas as linhas/blocos)
+# Chave "CHAVE:" = sequência de [A-Z_] colada ao ':' (não começa no meio de outra)
+KEY_PATTERN = re.compile(r'(?<![A-Z_])([A-Z_]+):')
+# "Mar 2026: 31 (1), 05 (2)"
+MONTH_LINE_PATTERN = re.compile(r'(\w+)\s+(\d{4}):\s*(.+)')
+MONTH_HEADER_PATTERN = re.compile(r'\w+\s+\d{4}:')
+# "31 (1)"
+DAY_SEATS_PATTERN = re.compile(r'(\d+)\s*\((\d+)\)')
+ROUTE_SEPARATOR_PATTERN = re.compile(r'[\s,\-]+')
+
 
 def parse_date_block(text_block: str) -> List[Tuple[str, int]]:
     """
@@ -38,7 +51,7 @@ def parse_date_block(text_block: str) -> List[Tuple[str, int]]:
             continue
         
         # Regex: "Mar 2026: 31 (1), 05 (2)"
-        match = re.match(r'(\w+)\s+(\d{4}):\s*(.+)', line)
+        match = MONTH_LINE_PATTERN.match(line)
         if not match:
             continue
         
@@ -48,14 +61,12 @@ def parse_date_block(text_block: str) -> List[Tuple[str, int]]:
         month_en = MONTH_MAP.get(month_pt, month_pt)
         month_num = MONTH_TO_NUM.get(month_en, 1)
         
-        # Parseia dias: "31 (1), 05 (2)"
-        day_matches = re.findall(r'(\d+)\s*\((\d+)\)', days_str)
-        
-        for day_str, seats_str in day_matches:
-            day = int(day_str)
-            seats = int(seats_str)
-            date_iso = f"{year}-{month_num:02d}-{day:02d}"
-            dates.append((date_iso, seats))
+        # Parseia dias: "31 (1), 05 (2)" (prefixo "YYYY-MM-" montado uma vez por linha)
+        prefix = f"{year}-{month_num:02d}-"
+        dates.extend(
+            (f"{prefix}{int(day_str):02d}", int(seats_str))
+            for day_str, seats_str in DAY_SEATS_PATTERN.findall(days_str)
+        )
     
     return dates
 
@@ -71,7 +82,7 @@ def parse_dates_string(dates_str: str) -> List[Tuple[str, int]]:
     dates_str = dates_str.strip()
     
     # Detecta formato novo: tem quebra de linha OU padrão "Mês YYYY:"
-    if '\n' in dates_str or re.search(r'\w+\s+\d{4}:', dates_str):
+    if '\n' in dates_str or MONTH_HEADER_PATTERN.search(dates_str):
         return parse_date_block(dates_str)
     else:
         # Formato antigo
@@ -126,6 +137,8 @@ def parse_file_batch(filepath: str) -> List[FlightBatch]:
     Lê arquivo com MÚLTIPLOS voos separados por '---'.
     Retorna List[FlightBatch].
     
+    Para arquivos muito grandes, prefira iter_file_batch() (streaming).
+    
     Exemplo de input.txt:
     ```
     ROUTE: GRU MIA
@@ -137,47 +150,238 @@ def parse_file_batch(filepath: str) -> List[FlightBatch]:
     ...
     ```
     """
+    return list(iter_file_batch(filepath))
+
+
+def iter_file_blocks(filepath: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Lê o arquivo linha a linha e entrega o texto de cada bloco separado
+    por '---', sem parsear (base de iter_file_batch e parse_file_parallel).
+    
+    Blocos vazios são pulados, mas contam na numeração.
+    
+    Yields:
+        Tuplas (número do bloco, linha inicial, texto do bloco)
+    """
+    block_no = 1
+    block_lines = []
+    start_line = None
+    
     with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+        for line_no, line in enumerate(f, 1):
+            # Separador pode aparecer no meio da linha (mesma regra do split('---'))
+            parts = line.split('---')
+            for index, part in enumerate(parts):
+                if index > 0:
+                    block = "".join(block_lines).strip()
+                    if block:
+                        yield block_no, start_line, block
+                    block_no += 1
+                    block_lines = []
+                    start_line = None
+                
+                if start_line is None and part.strip():
+                    start_line = line_no
+                block_lines.append(part)
+    
+    block = "".join(block_lines).strip()
+    if block:
+        yield block_no, start_line, block
+
+
+def _parse_numbered_block(block_no: int, start_line: int, block: str) -> FlightBatch:
+    """parse_flight_block com a posição do bloco na mensagem de erro."""
+    try:
+        return parse_flight_block(block)
+    except Exception as e:
+        raise ValueError(f"Erro no bloco {block_no} (linha {start_line}): {e}")
+
+
+def iter_file_batch(filepath: str) -> Iterator[FlightBatch]:
+    """
+    Versão streaming de parse_file_batch(): lê o arquivo linha a linha
+    e entrega cada FlightBatch assim que o '---' do bloco aparece.
+    
+    Só o bloco atual fica na memória, então exports com dezenas de
+    milhares de voos não são carregados (nem copiados) inteiros.
     
-    # Divide por separador ---
-    blocks = content.split('---')
+    Raises:
+        ValueError: "Erro no bloco N (linha L): ..." no primeiro bloco
+                    inválido, ou se o arquivo não tiver nenhum voo
+    """
+    found = 0
+    for block_no, start_line, block in iter_file_blocks(filepath):
+        found += 1
+        yield _parse_numbered_block(block_no, start_line, block)
     
+    if not found:
+        raise ValueError("Nenhum voo encontrado no arquivo")
+
+
+def _parse_chunk(blocks: List[Tuple[int, int, str]], enrich: bool) -> List[FlightBatch]:
+    """Parseia (e enriquece) um lote de blocos no processo worker."""
     batches = []
-    for i, block in enumerate(blocks):
-        block = block.strip()
-        if not block:
-            continue
-        
-        try:
-            batch = parse_flight_block(block)
-            batches.append(batch)
-        except Exception as e:
-            raise ValueError(f"Erro no bloco {i+1}: {e}")
+    for block_no, start_line, block in blocks:
+        batch = _parse_numbered_block(block_no, start_line, block)
+        if enrich:
+            batch.enrich_airport_data()
+        batches.append(batch)
+    return batches
+
+
+def parse_file_parallel(
+    filepath: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    enrich: bool = True
+) -> Iterator[FlightBatch]:
+    """
+    Parseia o arquivo em um pool de processos, mantendo a ordem do arquivo.
+    
+    Cada bloco é independente: o processo principal só separa os blocos
+    (iter_file_blocks) e envia lotes de chunk_size para os workers, que
+    fazem parse_flight_block e enrich_airport_data. No máximo 2 lotes por
+    worker ficam em andamento, então o arquivo continua sendo lido aos
+    poucos (mesmo esquema do render_alerts).
+    
+    Args:
+        filepath: Arquivo no formato input.txt
+        workers: Processos (None/1 = no processo atual, igual a iter_file_batch)
+        chunk_size: Blocos por tarefa enviada ao pool
+        enrich: Preenche cidade/bandeira nos workers
+    
+    Yields:
+        FlightBatch na ordem do arquivo
+    
+    Raises:
+        ValueError: Mesmas mensagens de iter_file_batch
+    """
+    if not workers or workers <= 1:
+        for batch in iter_file_batch(filepath):
+            if enrich:
+                batch.enrich_airport_data()
+            yield batch
+        return
     
-    if not batches:
+    blocks = iter_file_blocks(filepath)
+    pending = deque()
+    found = 0
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # Mantém o pool ocupado sem ler o arquivo inteiro de uma vez
+            while len(pending) < workers * 2:
+                chunk = list(islice(blocks, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_parse_chunk, chunk, enrich))
+            
+            if not pending:
+                break
+            
+            future = pending.popleft()
+            try:
+                batches = future.result()
+            except ValueError:
+                # Primeiro bloco inválido na ordem do arquivo; descarta o resto
+                for other in pending:
+                    other.cancel()
+                raise
+            
+            for batch in batches:
+                found += 1
+                yield batch
+    
+    if not found:
         raise ValueError("Nenhum voo encontrado no arquivo")
+
+
+def parse_routes_file(filepath: str) -> List[Tuple[str, str]]:
+    """
+    Lê arquivo com lista de rotas para busca multi-rota (--routes-file).
     
-    return batches
+    Uma rota por linha, origem e destino separados por espaço, '-' ou ','.
+    Linhas vazias e comentários (#) são ignorados; rotas repetidas também.
+    
+    Exemplo de routes.txt:
+    ```
+    # Rotas monitoradas
+    GRU MIA
+    GIG-LIS
+    GRU,DOH
+    ```
+    """
+    routes = []
+    seen = set()
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            
+            parts = ROUTE_SEPARATOR_PATTERN.split(line)
+            if len(parts) != 2:
+                raise ValueError(f"Linha {line_no}: rota deve ter 2 códigos IATA: {line}")
+            
+            route = (parts[0].upper(), parts[1].upper())
+            if route not in seen:
+                seen.add(route)
+                routes.append(route)
+    
+    if not routes:
+        raise ValueError("Nenhuma rota encontrada no arquivo")
+    
+    return routes
 
 
-def parse_flight_block(content: str) -> FlightBatch:
+def tokenize_block(content: str) -> Dict[str, str]:
     """
-    Parseia um bloco de texto representando UM voo.
-    Usado por parse_file() e parse_file_batch().
+    Separa um bloco em {CHAVE: valor} (valor multilinha até a próxima CHAVE).
+    
+    Tokenizador de passada única, linha a linha: cada linha é varrida uma
+    vez por KEY_PATTERN e o texto entre chaves vai para o valor atual.
+    Mesmo resultado da regex antiga com lookahead negativo, mas em tempo
+    linear (NOTE/DATES longos não causam backtracking).
+    
+    Returns:
+        Dict com as chaves encontradas (valores vazios são descartados)
     """
     data = {}
+    key = None
+    parts = []
     
-    # Regex: CHAVE: valor (multilinha até próxima CHAVE)
-    pattern = r'([A-Z_]+):\s*((?:(?![A-Z_]+:).)*)'
-    matches = re.findall(pattern, content, re.DOTALL)
-    
-    for key, value in matches:
-        key = key.strip().upper()
-        value = value.strip()
+    def finish():
+        value = "".join(parts).strip()
         if value:
             data[key] = value
     
+    for line in content.splitlines(keepends=True):
+        position = 0
+        for match in KEY_PATTERN.finditer(line):
+            if key is not None:
+                parts.append(line[position:match.start()])
+                finish()
+            key = match.group(1)
+            parts = []
+            position = match.end()
+        
+        if key is not None:
+            parts.append(line[position:])
+    
+    if key is not None:
+        finish()
+    
+    return data
+
+
+def parse_flight_block(content: str) -> FlightBatch:
+    """
+    Parseia um bloco de texto representando UM voo.
+    Usado por parse_file() e parse_file_batch().
+    """
+    data = tokenize_block(content)
+    
     # Valida campos
     required = ['ROUTE', 'AIRLINE', 'PROGRAM', 'COST', 'CABIN', 'NOTE', 'DATES_OUT', 'DATES_IN']
     missing = [f for f in required if f not in data]
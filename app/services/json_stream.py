@@ -0,0 +1,170 @@
+"""
+JSON Stream - Leitura incremental do array de voos de uma resposta JSON
+
+response.json() só devolve algo depois de baixar e parsear o documento
+inteiro, então o pico de memória é a resposta completa (texto + objetos).
+Aqui a resposta é lida em pedaços e o array de voos ('data') é entregue
+item a item:
+
+1. Pedaços de bytes (já descomprimidos) viram texto com um decoder UTF-8
+   incremental (caracteres multibyte podem vir cortados entre pedaços)
+2. json.JSONDecoder.raw_decode parseia UM valor por vez a partir do buffer
+3. Se o valor ainda não chegou inteiro, lê mais um pedaço e tenta de novo
+4. O texto já consumido é descartado do buffer
+
+Os outros campos do objeto (hasMore, cursor, count...) vão para
+`metadata`, que fica completo quando a iteração termina (a API pode
+mandá-los depois do array).
+
+Exemplo:
+    >>> stream = JSONArrayStream(response.iter_content(65536))
+    >>> for flight in stream:
+    ...     process(flight)
+    >>> stream.metadata
+    {'hasMore': True, 'cursor': 123}
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+
+# Buffer consumido é cortado só a partir deste tamanho (corte amortizado)
+_COMPACT_AT = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]}'
+
+
+class JSONArrayStream:
+    """
+    Itera os itens do array `array_keys` de um objeto JSON recebido em pedaços.
+    
+    Também aceita um documento que é o próprio array (lista no topo).
+    Itera uma vez só.
+    """
+    
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        array_keys: Sequence[str] = ('data', 'results', 'flights'),
+        encoding: str = 'utf-8'
+    ):
+        """
+        Args:
+            chunks: Pedaços de bytes da resposta (ex: response.iter_content())
+            array_keys: Chaves cujo array é entregue item a item (a primeira
+                        encontrada; as demais vão para metadata)
+            encoding: Codificação do texto
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._array_keys = tuple(array_keys)
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.metadata: Dict[str, Any] = {}
+        self.array_key = None
+        self.count = 0
+    
+    def _fill(self) -> bool:
+        """Lê mais um pedaço para o buffer. False se a resposta acabou."""
+        if self._eof:
+            return False
+        if self._pos >= _COMPACT_AT:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+    
+    def _peek(self) -> str:
+        """Próximo caractere não-branco ('' no fim da resposta), sem consumi-lo."""
+        while True:
+            buffer = self._buffer
+            while self._pos < len(buffer) and buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buffer):
+                return buffer[self._pos]
+            if not self._fill():
+                return ''
+    
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            found = repr(char) if char else 'fim da resposta'
+            raise ValueError(f"❌ JSON inválido na resposta: esperado {' ou '.join(chars)}, veio {found}")
+        self._pos += 1
+        return char
+    
+    def _value(self) -> Any:
+        """Parseia o próximo valor completo do buffer (lendo mais se preciso)."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise ValueError("❌ JSON inválido ou truncado na resposta")
+            # Número pode estar cortado ("12" de "1234", "-1" de "-1.5"):
+            # só aceita se depois vier um delimitador (ou a resposta acabar)
+            if end == len(self._buffer) or (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and self._buffer[end] not in _DELIMITERS
+            ):
+                if self._fill():
+                    continue
+            self._pos = end
+            return value
+    
+    def __iter__(self) -> Iterator[Any]:
+        first = self._expect('{[')
+        if first == '[':
+            yield from self._items()
+        else:
+            yield from self._object()
+        
+        if self._peek():
+            raise ValueError("❌ JSON inválido na resposta: conteúdo após o fim do documento")
+    
+    def _items(self) -> Iterator[Any]:
+        """Itens de um array cujo '[' já foi consumido."""
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            item = self._value()
+            self.count += 1
+            yield item
+            if self._expect(',]') == ']':
+                return
+    
+    def _object(self) -> Iterator[Any]:
+        """Campos de um objeto cujo '{' já foi consumido."""
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                self._expect('"')
+            key = self._value()
+            self._expect(':')
+            
+            if self.array_key is None and key in self._array_keys and self._peek() == '[':
+                self.array_key = key
+                self._pos += 1
+                yield from self._items()
+            else:
+                self.metadata[key] = self._value()
+            
+            if self._expect(',}') == '}':
+                return
@@ -0,0 +1,251 @@
+"""
+Rate Limiter - Controle de ritmo das requisições à API Seats.aero
+
+Este módulo contém:
+- TokenBucket: limitador token-bucket compartilhado entre threads e tasks,
+  que se adapta quando a API responde 429 (reduz o ritmo e pausa)
+- RetryPolicy: política de retry com backoff exponencial + jitter,
+  respeitando o header Retry-After
+- get_shared_rate_limiter(): limitador único do processo, usado por padrão
+  pelos clientes síncrono e assíncrono
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+from app.core.config import Config
+
+
+# Teto padrão (s) de um Retry-After: um header hostil ou com defeito
+# ("86400", "inf") não pode parar todos os workers por horas
+MAX_RETRY_AFTER = 300.0
+
+
+def clamp_retry_after(retry_after: Optional[float], limit: float = MAX_RETRY_AFTER) -> Optional[float]:
+    """
+    Limita um Retry-After a 0..limit segundos.
+    
+    Returns:
+        Segundos limitados, ou None se ausente ou não finito (NaN/inf)
+    """
+    if retry_after is None or not math.isfinite(retry_after):
+        return None
+    return min(max(0.0, retry_after), limit)
+
+
+class TokenBucket:
+    """
+    Limitador token-bucket thread-safe com ajuste adaptativo (AIMD).
+    
+    Como funciona:
+    - Tokens são repostos a `rate` por segundo, até `capacity`
+    - Cada requisição consome 1 token; sem token, espera a reposição
+    - Em 429: o ritmo cai pela metade e todos esperam o Retry-After
+    - Em sucesso: o ritmo volta aos poucos até o máximo configurado
+    
+    A reserva do token é feita sob um lock e a espera acontece FORA dele,
+    então a mesma instância serve threads (acquire) e tasks (acquire_async).
+    
+    Exemplo:
+        >>> limiter = TokenBucket(rate=2)   # 2 req/s
+        >>> limiter.acquire()               # bloqueia se necessário
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        max_pause: float = MAX_RETRY_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            rate: Requisições por segundo (ritmo máximo)
+            capacity: Rajada máxima permitida (padrão: max(1, rate))
+            min_rate: Piso do ritmo após 429s seguidos (padrão: rate / 10)
+            max_pause: Pausa máxima por 429, mesmo com Retry-After maior
+            clock: Relógio monotônico (injetável para testes)
+            sleep: Função de espera síncrona (injetável para testes)
+        """
+        if rate <= 0:
+            raise ValueError("rate deve ser maior que zero")
+        
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 10
+        self.capacity = capacity or max(1.0, rate)
+        self.max_pause = max_pause
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Reserva um token e retorna quantos segundos esperar antes de usá-lo.
+        
+        Returns:
+            Segundos de espera (0 se há token disponível)
+        """
+        with self._lock:
+            now = self._clock()
+            
+            # Repõe tokens (não repõe durante pausa por 429)
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            
+            self._tokens -= 1
+            wait = self._updated - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return max(0.0, wait)
+    
+    def acquire(self) -> None:
+        """Bloqueia a thread atual até poder fazer a próxima requisição."""
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+    
+    async def acquire_async(self) -> None:
+        """Versão assíncrona de acquire() (não bloqueia o event loop)."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """
+        Registra um 429: reduz o ritmo pela metade e pausa o bucket.
+        
+        Args:
+            retry_after: Segundos pedidos pela API (header Retry-After),
+                         limitados a max_pause. Sem ele (ou não finito),
+                         pausa o tempo de repor um token.
+        """
+        retry_after = clamp_retry_after(retry_after, self.max_pause)
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            now = self._clock()
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + pause)
+    
+    def reward(self) -> None:
+        """Registra um sucesso: recupera o ritmo aos poucos (aumento aditivo)."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Política de retry para respostas 429 e 5xx.
+    
+    Attributes:
+        max_retries: Quantas novas tentativas após a primeira
+        base_delay: Espera base em segundos (dobra a cada tentativa)
+        max_delay: Teto da espera em segundos
+        max_retry_after: Teto em segundos para o Retry-After da API
+    """
+    max_retries: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    max_retry_after: float = MAX_RETRY_AFTER
+    
+    def should_retry(self, status_code: int, attempt: int) -> bool:
+        """
+        Indica se a resposta merece nova tentativa.
+        
+        Args:
+            status_code: Status HTTP recebido
+            attempt: Número de tentativas já refeitas (0 na primeira resposta)
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status_code == 429 or status_code >= 500
+    
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Calcula a espera antes da próxima tentativa.
+        
+        Com Retry-After, respeita o pedido da API (mais um pequeno jitter
+        para as threads não voltarem todas juntas). Sem ele, usa backoff
+        exponencial com "full jitter": aleatório entre 0 e base * 2^tentativa.
+        
+        Args:
+            attempt: Número de tentativas já refeitas (0 na primeira)
+            retry_after: Segundos pedidos pela API, se houver (limitados a
+                         max_retry_after; valores não finitos são ignorados)
+        
+        Returns:
+            Segundos de espera
+        """
+        retry_after = clamp_retry_after(retry_after, self.max_retry_after)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o header Retry-After para segundos.
+    
+    Aceita os dois formatos da RFC 9110:
+    - Segundos: "120"
+    - Data HTTP: "Wed, 21 Oct 2026 07:28:00 GMT"
+    
+    Returns:
+        Segundos (>= 0) ou None se ausente/inválido (inclusive "inf"/"nan")
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> TokenBucket:
+    """
+    Retorna o limitador único do processo (criado na primeira chamada).
+    
+    Todos os clientes usam este limitador por padrão, então uma varredura
+    multi-rota (threads ou tasks) respeita UM ritmo global, com o máximo
+    de vazão possível sem tomar 429.
+    """
+    global _shared_limiter
+    
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucket(rate=Config.SEATS_RATE_LIMIT)
+        return _shared_limiter
@@ -0,0 +1,193 @@
+"""
+Response Cache - Cache em disco das respostas da API Seats.aero
+
+Evita gastar cota da API quando a mesma rota é buscada de novo em
+poucos minutos. Cada resposta vira um arquivo JSON em .cache/seats/,
+identificado por endpoint + parâmetros normalizados.
+
+Regras:
+- TTL configurável (entradas mais velhas são ignoradas)
+- Tamanho limitado: ao passar de max_entries, remove as menos usadas (LRU)
+- O mtime do arquivo marca o último acesso (atualizado a cada hit)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from app.core.config import Config
+
+
+# Parâmetros cujo valor não diferencia maiúsculas/minúsculas
+_UPPER_PARAMS = {'origin_airport', 'destination_airport', 'origin'}
+_LOWER_PARAMS = {'cabin'}
+
+
+class ResponseCache:
+    """
+    Cache persistente de respostas JSON, com TTL e despejo LRU.
+    
+    Exemplo:
+        >>> cache = ResponseCache(ttl_seconds=1800)
+        >>> cache.set('/search', {'origin_airport': 'GRU'}, {'data': []})
+        >>> cache.get('/search', {'origin_airport': 'gru'})
+        {'data': []}
+    """
+    
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        ttl_seconds: float = 3600,
+        max_entries: int = Config.SEATS_CACHE_MAX_ENTRIES
+    ):
+        """
+        Args:
+            directory: Pasta do cache (padrão: Config.SEATS_CACHE_DIR)
+            ttl_seconds: Idade máxima de uma resposta para ser reutilizada
+            max_entries: Quantidade máxima de respostas guardadas
+        """
+        self.directory = Path(directory or Config.SEATS_CACHE_DIR)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Gera a chave do cache a partir do endpoint e dos parâmetros.
+        
+        Os parâmetros são normalizados (ordem das chaves, maiúsculas nos
+        aeroportos, minúsculas na cabine, None descartado), então
+        "gru"/"GRU" ou a ordem dos argumentos não geram entradas duplicadas.
+        
+        Returns:
+            Hash SHA-256 hexadecimal
+        """
+        normalized = {}
+        for name, value in (params or {}).items():
+            if value is None:
+                continue
+            value = str(value).strip()
+            if name in _UPPER_PARAMS:
+                value = value.upper()
+            elif name in _LOWER_PARAMS:
+                value = value.lower()
+            normalized[name] = value
+        
+        raw = json.dumps([endpoint, normalized], sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def get_entry(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Lê a entrada completa do cache, SEM checar o TTL.
+        
+        Returns:
+            Dict com 'body', 'stored_at' (epoch) e metadados, ou None
+        """
+        path = self._path(self.make_key(endpoint, params))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        
+        # Marca o acesso (base do despejo LRU)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+    
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Retorna a resposta guardada se ainda estiver dentro do TTL.
+        
+        Returns:
+            Corpo JSON da resposta ou None (ausente/expirada)
+        """
+        entry = self.get_entry(endpoint, params)
+        if entry is None:
+            return None
+        
+        if time.time() - entry.get('stored_at', 0) > self.ttl_seconds:
+            return None
+        return entry.get('body')
+    
+    def set(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        body: Any,
+        **metadata: Any
+    ) -> None:
+        """
+        Guarda uma resposta no cache (escrita atômica).
+        
+        Args:
+            endpoint: Endpoint da API (ex: '/search')
+            params: Parâmetros da requisição
+            body: Corpo JSON da resposta
+            **metadata: Campos extras guardados junto ao corpo
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'endpoint': endpoint,
+            'params': params or {},
+            'stored_at': time.time(),
+            'body': body,
+        }
+        entry.update(metadata)
+        
+        path = self._path(self.make_key(endpoint, params))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        self._evict()
+    
+    def _evict(self) -> None:
+        """Remove as entradas menos usadas quando o limite é ultrapassado."""
+        with self._lock:
+            try:
+                files = list(self.directory.glob('*.json'))
+            except OSError:
+                return
+            
+            excess = len(files) - self.max_entries
+            if excess <= 0:
+                return
+            
+            def last_access(path: Path) -> float:
+                try:
+                    return path.stat().st_mtime
+                except OSError:
+                    return 0.0
+            
+            for path in sorted(files, key=last_access)[:excess]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+    
+    def clear(self) -> None:
+        """Apaga todas as entradas do cache."""
+        for path in self.directory.glob('*.json'):
+            try:
+                path.unlink()
+            except OSError:
+                pass
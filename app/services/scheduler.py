@@ -0,0 +1,142 @@
+"""
+Scheduler - Fila de prioridade das rotas monitoradas no modo daemon
+
+Em vez de um cron por rota (que repete a inicialização do Python, do
+cliente e dos templates a cada execução), o daemon mantém tudo carregado
+e consulta as rotas em ordem de vencimento, usando um heap:
+
+- Rota "quente" (resultado mudou): intervalo cai pela metade, até o mínimo
+- Rota "parada" (nada mudou ou erro): intervalo cresce 1.5x, até o máximo
+- O heap sempre entrega a rota que vence primeiro; empates saem na
+  ordem de cadastro
+
+O limite global de requisições fica no TokenBucket do cliente (ver
+main.mode_daemon): se o orçamento não comporta os intervalos, as
+consultas simplesmente atrasam e as próximas são contadas a partir do
+fim da consulta.
+
+Exemplo:
+    >>> scheduler = PollingScheduler([("GRU", "MIA"), ("GIG", "LIS")], interval=1800)
+    >>> while True:
+    ...     state = scheduler.next_route()      # espera até a rota vencer
+    ...     changed = poll(state.route)
+    ...     scheduler.report(state, changed)
+"""
+
+import heapq
+import itertools
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+class RouteState:
+    """
+    Situação de uma rota no agendador.
+    
+    Attributes:
+        route: (origem, destino)
+        interval: Segundos até a próxima consulta (adaptativo)
+        next_run: Instante (relógio do agendador) da próxima consulta
+        polls: Consultas feitas
+        changes: Consultas que trouxeram novidade
+    """
+    
+    __slots__ = ('route', 'interval', 'next_run', 'polls', 'changes')
+    
+    def __init__(self, route: Tuple[str, str], interval: float, next_run: float):
+        self.route = route
+        self.interval = interval
+        self.next_run = next_run
+        self.polls = 0
+        self.changes = 0
+    
+    def __repr__(self) -> str:
+        origin, destination = self.route
+        return f"RouteState({origin}-{destination}, interval={self.interval:.0f}s, polls={self.polls})"
+
+
+class PollingScheduler:
+    """
+    Agenda consultas por rota com intervalos adaptativos (heap por vencimento).
+    """
+    
+    # Fatores de ajuste do intervalo
+    SPEEDUP = 2.0
+    BACKOFF = 1.5
+    
+    def __init__(
+        self,
+        routes: Iterable[Tuple[str, str]],
+        interval: float,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            routes: Rotas (origem, destino); todas vencem imediatamente
+            interval: Intervalo inicial em segundos
+            min_interval: Menor intervalo de rota quente (padrão: interval / 4)
+            max_interval: Maior intervalo de rota parada (padrão: interval * 8)
+            clock: Relógio monotônico (injetável para testes)
+            sleep: Função de espera (injetável para testes)
+        
+        Raises:
+            ValueError: Sem rotas ou intervalos inválidos
+        """
+        self.min_interval = min_interval or interval / 4
+        self.max_interval = max_interval or interval * 8
+        if interval <= 0 or not self.min_interval <= interval <= self.max_interval:
+            raise ValueError("Intervalos inválidos: precisa de 0 < mínimo <= intervalo <= máximo")
+        
+        self._clock = clock
+        self._sleep = sleep
+        self._order = itertools.count()
+        self._heap: List[Tuple[float, int, RouteState]] = []
+        
+        now = clock()
+        for route in dict.fromkeys((origin.upper(), destination.upper()) for origin, destination in routes):
+            self._push(RouteState(route, interval, now))
+        if not self._heap:
+            raise ValueError("Nenhuma rota para agendar")
+    
+    def _push(self, state: RouteState) -> None:
+        heapq.heappush(self._heap, (state.next_run, next(self._order), state))
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def next_route(self) -> RouteState:
+        """
+        Retira a rota que vence primeiro, esperando até o vencimento.
+        
+        A rota fica fora da fila até report() ser chamado.
+        """
+        next_run, _, state = heapq.heappop(self._heap)
+        wait = next_run - self._clock()
+        if wait > 0:
+            self._sleep(wait)
+        return state
+    
+    def report(self, state: RouteState, changed: bool) -> None:
+        """
+        Devolve a rota à fila com o intervalo ajustado.
+        
+        Args:
+            state: Rota entregue por next_route()
+            changed: True se a consulta trouxe novidade (rota quente)
+        """
+        state.polls += 1
+        if changed:
+            state.changes += 1
+            state.interval = max(self.min_interval, state.interval / self.SPEEDUP)
+        else:
+            state.interval = min(self.max_interval, state.interval * self.BACKOFF)
+        
+        state.next_run = self._clock() + state.interval
+        self._push(state)
+    
+    def states(self) -> List[RouteState]:
+        """Rotas na fila, da que vence primeiro para a última."""
+        return [state for _, _, state in sorted(self._heap)]
@@ -4,14 +4,25 @@ Seats.aero API Client
 Client for interacting with Seats.aero Partner API.
 """
 
+import time
+import logging
 import requests
-from typing import Optional, Dict, Any, List, Tuple
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator
 from datetime import datetime, date, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from app.core.config import Config
-from app.core.models import FlightBatch
+from app.core.models import FlightBatch, AvailabilityRecord
+from app.services.rate_limiter import (
+    TokenBucket, RetryPolicy, get_shared_rate_limiter, parse_retry_after
+)
+from app.services.response_cache import ResponseCache
+from app.services.json_stream import JSONArrayStream
 
 
+logger = logging.getLogger(__name__)
+
 # Mapeamento completo de códigos Seats.aero para nomes de programas de fidelidade
 PROGRAM_MAPPING = {
     # Star Alliance
@@ -133,6 +144,189 @@ SOURCE_TO_AIRLINE = {
     'smiles': 'Gol / Parceiros Smiles',
 }
 
+# Campo de custo de cada cabine (cabines desconhecidas usam a executiva)
+CABIN_COST_FIELDS = {
+    'economy': 'YMileageCost',
+    'business': 'JMileageCost',
+    'first': 'FMileageCost',
+}
+
+
+class FilterPlan:
+    """
+    Filtros locais de uma consulta, pré-compilados UMA vez.
+    
+    Por que existe?
+    - Antes, cada voo recalculava airline_filter.lower(), program_filter.lower()
+      e PROGRAM_MAPPING.get(source, ...) dentro do loop
+    - Aqui o filtro de programa vira um conjunto de códigos Source aceitos
+      (casado contra PROGRAM_MAPPING uma vez só) e a decisão por companhia
+      fica em cache; por linha sobram testes de pertinência
+    - O mesmo plano pode ser reaproveitado em várias chamadas sobre o
+      mesmo conjunto de dados (ex: respostas em cache)
+    
+    Exemplo:
+        >>> plan = FilterPlan(program_filter="Privilege Club", max_cost_filter=90000)
+        >>> 'qr' in plan.program_sources
+        True
+    """
+    
+    def __init__(
+        self,
+        max_staleness_hours: int = 48,
+        direct_only: bool = False,
+        airline_filter: Optional[str] = None,
+        program_filter: Optional[str] = None,
+        max_cost_filter: Optional[int] = None
+    ):
+        """
+        Args:
+            max_staleness_hours: Máximo de horas desde última atualização (0/None desativa)
+            direct_only: Se True, só voos diretos
+            airline_filter: Nome da companhia (substring, sem diferenciar maiúsculas)
+            program_filter: Nome do programa (substring, sem diferenciar maiúsculas)
+            max_cost_filter: Custo máximo em milhas
+        """
+        self.max_age = max_staleness_hours * 3600 if max_staleness_hours else None
+        self.direct_only = direct_only
+        self.max_cost = max_cost_filter
+        self.airline_lower = airline_filter.lower() if airline_filter else None
+        self.program_lower = program_filter.lower() if program_filter else None
+        self._airline_matches: Dict[str, bool] = {}
+        self._program_matches: Dict[str, bool] = {}
+        
+        # Códigos conhecidos que satisfazem --program (nome OU código)
+        self.program_sources = frozenset()
+        if self.program_lower:
+            self.program_sources = frozenset(
+                code for code, name in PROGRAM_MAPPING.items()
+                if self.program_lower in name.lower() or self.program_lower in code
+            )
+    
+    def matches_airline(self, airline: str) -> bool:
+        """Companhia passa no filtro? (decisão em cache por nome)"""
+        if not self.airline_lower:
+            return True
+        match = self._airline_matches.get(airline)
+        if match is None:
+            match = self._airline_matches[airline] = self.airline_lower in airline.lower()
+        return match
+    
+    def matches_program(self, source: str) -> bool:
+        """Código Source passa no filtro de programa?"""
+        if not self.program_lower or source in self.program_sources:
+            return True
+        if source in PROGRAM_MAPPING:
+            return False
+        
+        # Código fora do mapeamento: nome exibido é source.title()
+        match = self._program_matches.get(source)
+        if match is None:
+            match = self._program_matches[source] = (
+                self.program_lower in source.title().lower() or self.program_lower in source
+            )
+        return match
+    
+    def accepts_cost(self, cost: int) -> bool:
+        """Custo dentro do limite --max-cost?"""
+        return not self.max_cost or cost <= self.max_cost
+
+
+class AirlineResolutionStats:
+    """
+    Contadores de como a companhia de cada voo foi obtida, por programa.
+    
+    Substitui o print() por voo do agrupamento: os contadores são
+    emitidos UMA vez por consulta (log_summary), e o detalhe por voo só
+    aparece em DEBUG, limitado a `sample_limit` exemplos por tipo.
+    
+    Tipos (AvailabilityRecord.airline_origin):
+    'direct', 'source', 'fallback', 'unknown'
+    """
+    
+    def __init__(self, sample_limit: int = 5):
+        """
+        Args:
+            sample_limit: Máximo de voos logados em DEBUG por tipo
+        """
+        self.counts: Dict[str, Counter] = defaultdict(Counter)
+        self.sample_limit = sample_limit
+        self._sampled = Counter()
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+    
+    def add_count(self, source: str, kind: str, count: int) -> None:
+        """Conta `count` voos de uma vez (sem amostra em DEBUG; ver add)."""
+        self.counts[source or 'N/A'][kind] += count
+    
+    def add(self, record: AvailabilityRecord) -> None:
+        """Conta um voo (e loga uma amostra em DEBUG)."""
+        kind = record.airline_origin
+        self.counts[record.source or 'N/A'][kind] += 1
+        
+        if not self._debug or self._sampled[kind] >= self.sample_limit:
+            return
+        self._sampled[kind] += 1
+        
+        route = f"{record.origin}-{record.destination}"
+        if kind == 'direct':
+            logger.debug("✅ Companhia detectada: %s (%s)", record.airline, route)
+        elif kind == 'source':
+            logger.debug("ℹ️  Cia inferida via Source: %s -> %s (%s)", record.source, record.airline, route)
+        elif kind == 'fallback':
+            logger.debug("ℹ️  Cia inferida via Source (fallback): %s -> %s (%s)", record.source, record.airline, route)
+        else:
+            logger.debug("⚠️  Companhia não detectada para voo %s (Source: %s)", route, record.source or 'N/A')
+    
+    def total(self, kind: str) -> int:
+        """Total de voos de um tipo, somando todos os programas."""
+        return sum(counts[kind] for counts in self.counts.values())
+    
+    def log_summary(self) -> None:
+        """Emite os contadores agregados (uma linha por programa)."""
+        for source, counts in sorted(self.counts.items()):
+            logger.info(
+                "Companhias em %s: %d detectada(s), %d inferida(s) via Source, "
+                "%d fallback, %d desconhecida(s)",
+                source, counts['direct'], counts['source'], counts['fallback'], counts['unknown']
+            )
+        
+        unknown = self.total('unknown')
+        if unknown:
+            logger.warning("⚠️  %d voo(s) sem companhia detectada", unknown)
+
+
+def check_api_status(status_code: int) -> None:
+    """
+    Map Seats.aero HTTP error statuses to the exceptions callers expect.
+    
+    Compartilhado entre o cliente síncrono e o assíncrono, para que
+    ambos se comportem igual diante de erros da API.
+    
+    Args:
+        status_code: HTTP status code of the response
+    
+    Raises:
+        ValueError: 401, 403 and 429 (problemas de chave/cota)
+        ConnectionError: 5xx (erro no servidor)
+    """
+    if status_code == 401:
+        raise ValueError(
+            "❌ Autenticação falhou! Verifique sua SEATS_API_KEY no .env"
+        )
+    elif status_code == 403:
+        raise ValueError(
+            "❌ Acesso negado. Verifique se sua chave tem permissões corretas."
+        )
+    elif status_code == 429:
+        raise ValueError(
+            "❌ Rate limit excedido. Aguarde alguns minutos e tente novamente."
+        )
+    elif status_code >= 500:
+        raise ConnectionError(
+            f"❌ Erro no servidor Seats.aero (status {status_code}). "
+            "Tente novamente mais tarde."
+        )
+
 
 class SeatsAeroClient:
     """
@@ -141,12 +335,44 @@ class SeatsAeroClient:
     Handles authentication, request formatting, and error handling.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Resultados por página no /search (parâmetro 'take' da API)
+    SEARCH_PAGE_SIZE = 500
+    
+    # Requisições simultâneas por cliente (rotas do search_many × janelas
+    # do chunk_days dividem este orçamento)
+    MAX_ROUTE_WORKERS = 8
+    
+    # Bytes lidos por vez em respostas em streaming (stream=True)
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    # Endpoints cujas respostas podem vir do cache em disco (com TTL)
+    CACHED_ENDPOINTS = ('/search', '/availability')
+    
+    # Catálogos que mudam pouco: guardados com ETag/Last-Modified e
+    # revalidados com GET condicional (304 → resposta do disco)
+    REVALIDATED_ENDPOINTS = ('/routes', '/programs')
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_workers: int = MAX_ROUTE_WORKERS,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        timeout: float = Config.SEATS_TIMEOUT
+    ):
         """
         Initialize Seats.aero client.
         
         Args:
             api_key: Optional API key. If not provided, uses Config.SEATS_API_KEY
+            max_workers: Max concurrent requests (shared by the routes of
+                         search_many() and the chunk_days sub-windows)
+            rate_limiter: Token bucket pacing requests (defaults to the
+                          process-wide limiter shared by all clients)
+            retry_policy: Retry/backoff policy for 429 and 5xx responses
+            cache: Optional on-disk response cache for /search (None disables)
+            timeout: Default request timeout in seconds
         """
         self.api_key = api_key or Config.SEATS_API_KEY
         self.base_url = Config.SEATS_BASE_URL
@@ -161,6 +387,22 @@ class SeatsAeroClient:
             'Content-Type': 'application/json',
             'User-Agent': 'MileageBot/1.0'
         })
+        
+        # Uma conexão por requisição simultânea: search_many e _iter_windows
+        # nunca passam de max_workers requisições ao mesmo tempo
+        self.max_workers = max_workers
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max_workers
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Ritmo global + retry com backoff em 429/5xx
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=Config.SEATS_MAX_RETRIES)
+        self.cache = cache
+        self.timeout = timeout
     
     def _make_request(
         self,
@@ -168,17 +410,26 @@ class SeatsAeroClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
-        timeout: int = 30
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Make HTTP request to Seats.aero API.
         
+        Requests are paced by the shared rate limiter. Responses 429/5xx
+        are retried with jittered exponential backoff (honouring
+        Retry-After); only when retries run out are they mapped to errors.
+        
+        With a cache configured, GETs to CACHED_ENDPOINTS are served from
+        disk while fresh (no network, no rate limiter) and stored on success.
+        GETs to REVALIDATED_ENDPOINTS send If-None-Match/If-Modified-Since
+        with the stored validators and reuse the cached body on 304.
+        
         Args:
             method: HTTP method (GET, POST, etc)
             endpoint: API endpoint (without base URL)
             params: Query parameters
             json_data: JSON body for POST/PUT
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds (defaults to self.timeout)
         
         Returns:
             JSON response as dict
@@ -188,56 +439,220 @@ class SeatsAeroClient:
             ValueError: Invalid response or API error
         """
         url = f"{self.base_url}{endpoint}"
+        timeout = timeout or self.timeout
+        
+        cacheable = (
+            self.cache is not None
+            and method == 'GET'
+            and endpoint in self.CACHED_ENDPOINTS
+        )
+        if cacheable:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        
+        # GET condicional para catálogos (routes/programs)
+        revalidate = (
+            self.cache is not None
+            and method == 'GET'
+            and endpoint in self.REVALIDATED_ENDPOINTS
+        )
+        stored = self.cache.get_entry(endpoint, params) if revalidate else None
+        headers = self._conditional_headers(stored)
         
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json_data,
-                timeout=timeout
-            )
+            response = self._send(method, url, params, json_data, timeout, headers)
+            
+            # 304 Not Modified: o catálogo em disco continua válido
+            if response.status_code == 304 and stored is not None:
+                return stored.get('body')
             
             # Check for HTTP errors
-            if response.status_code == 401:
-                raise ValueError(
-                    "❌ Autenticação falhou! Verifique sua SEATS_API_KEY no .env"
-                )
-            elif response.status_code == 403:
-                raise ValueError(
-                    "❌ Acesso negado. Verifique se sua chave tem permissões corretas."
-                )
-            elif response.status_code == 429:
-                raise ValueError(
-                    "❌ Rate limit excedido. Aguarde alguns minutos e tente novamente."
-                )
-            elif response.status_code >= 500:
-                raise ConnectionError(
-                    f"❌ Erro no servidor Seats.aero (status {response.status_code}). "
-                    "Tente novamente mais tarde."
-                )
+            check_api_status(response.status_code)
             
             response.raise_for_status()
             
             # Parse JSON
             try:
-                return response.json()
+                data = response.json()
             except ValueError:
                 raise ValueError(
                     f"❌ Resposta inválida da API (não é JSON): {response.text[:200]}"
                 )
+            
+            # Cache é best-effort: falha de disco não derruba a busca
+            try:
+                if cacheable:
+                    self.cache.set(endpoint, params, data)
+                elif revalidate:
+                    validators = self._response_validators(response)
+                    if validators:
+                        self.cache.set(endpoint, params, data, **validators)
+            except OSError:
+                pass
+            return data
+        
+        except requests.exceptions.RequestException as e:
+            raise self._connection_error(e, timeout)
+    
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        Send one request with pacing and retry on 429/5xx (no status mapping).
         
-        except requests.exceptions.Timeout:
-            raise ConnectionError(
+        Returns:
+            Final response (after retries run out or a non-retryable status)
+        """
+        # stream só é repassado quando pedido (corpo lido sob demanda)
+        options = {'stream': True} if stream else {}
+        attempt = 0
+        while True:
+            # Respeita o ritmo global (compartilhado entre threads)
+            self.rate_limiter.acquire()
+            
+            response = self.session.request(
+                method=method,
+                url=url,
+                params=params,
+                json=json_data,
+                timeout=timeout,
+                headers=headers,
+                **options
+            )
+            
+            if not self.retry_policy.should_retry(response.status_code, attempt):
+                break
+            
+            # 429/5xx: espera e tenta de novo
+            if stream:
+                response.close()
+            time.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+        
+        if response.status_code < 400:
+            self.rate_limiter.reward()
+        return response
+    
+    @staticmethod
+    def _connection_error(error: requests.exceptions.RequestException, timeout: float) -> ConnectionError:
+        """Map a requests exception to the ConnectionError messages of the client."""
+        if isinstance(error, requests.exceptions.Timeout):
+            return ConnectionError(
                 f"❌ Timeout após {timeout}s. Verifique sua conexão ou tente novamente."
             )
-        except requests.exceptions.ConnectionError as e:
-            raise ConnectionError(
-                f"❌ Erro de conexão: {str(e)}\n"
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return ConnectionError(
+                f"❌ Erro de conexão: {str(error)}\n"
                 "Verifique sua internet ou se a API está disponível."
             )
+        return ConnectionError(f"❌ Erro na requisição: {str(error)}")
+    
+    def _stream_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        GET with a streamed, incrementally parsed body (see JSONArrayStream).
+        
+        Pede resposta comprimida (gzip/deflate); o urllib3 descomprime
+        pedaço a pedaço em iter_content, e cada voo do array 'data' é
+        parseado e entregue assim que chega. O pico de memória fica em
+        torno de um pedaço + um voo, em vez da resposta inteira.
+        
+        Sem cache em disco: guardar a resposta exigiria o corpo completo.
+        
+        Yields:
+            Raw flight dicts; on exhaustion the generator returns the
+            other top-level fields (hasMore, cursor...) as its value
+        
+        Raises:
+            ConnectionError: Network/connection issues (also mid-stream)
+            ValueError: API error status or invalid JSON
+        """
+        url = f"{self.base_url}{endpoint}"
+        timeout = timeout or self.timeout
+        
+        try:
+            response = self._send(
+                'GET', url, params, timeout=timeout,
+                headers={'Accept-Encoding': 'gzip, deflate'}, stream=True
+            )
+            with response:
+                check_api_status(response.status_code)
+                response.raise_for_status()
+                
+                stream = JSONArrayStream(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE))
+                yield from stream
+                return stream.metadata
         except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"❌ Erro na requisição: {str(e)}")
+            raise self._connection_error(e, timeout)
+    
+    @staticmethod
+    def _conditional_headers(stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        """
+        Build If-None-Match / If-Modified-Since headers from a cached entry.
+        
+        Args:
+            stored: Cache entry (with 'etag'/'last_modified') or None
+        
+        Returns:
+            Headers dict, or None when there is nothing to revalidate
+        """
+        if not stored:
+            return None
+        
+        headers = {}
+        if stored.get('etag'):
+            headers['If-None-Match'] = stored['etag']
+        if stored.get('last_modified'):
+            headers['If-Modified-Since'] = stored['last_modified']
+        return headers or None
+    
+    @staticmethod
+    def _response_validators(response: requests.Response) -> Dict[str, str]:
+        """
+        Extract the cache validators (ETag / Last-Modified) of a response.
+        
+        Returns:
+            Dict with 'etag' and/or 'last_modified' (empty if none)
+        """
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['last_modified'] = response.headers['Last-Modified']
+        return validators
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """
+        Compute how long to wait before retrying a 429/5xx response.
+        
+        Em 429 o limitador compartilhado também desacelera, para que as
+        outras threads não continuem estourando a cota.
+        
+        Args:
+            response: Response with status 429 or 5xx
+            attempt: Retries already made (0 on the first failure)
+        
+        Returns:
+            Seconds to wait
+        """
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        
+        if response.status_code == 429:
+            self.rate_limiter.penalize(retry_after)
+        
+        return self.retry_policy.backoff(attempt, retry_after)
     
     @staticmethod
     def _safe_int(value: Any, default: int = 0) -> int:
@@ -284,6 +699,52 @@ class SeatsAeroClient:
         # Qualquer outro tipo, retorna default
         return default
     
+    @staticmethod
+    def _build_search_params(
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the query params accepted by the /search endpoint.
+        
+        Args:
+            origin: Origin airport code (e.g., "GRU")
+            destination: Destination airport code (e.g., "MIA")
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+        
+        Returns:
+            Dict with query params
+        """
+        # Calculate dates if not provided
+        if not date_start:
+            date_start = datetime.now().date().isoformat()
+        
+        if not date_end:
+            start_date_obj = datetime.fromisoformat(date_start).date()
+            end_date_obj = start_date_obj + timedelta(days=days)
+            date_end = end_date_obj.isoformat()
+        
+        # IMPORTANTE: Apenas parâmetros aceitos pela API Seats.aero
+        params = {
+            'origin_airport': origin.upper(),
+            'destination_airport': destination.upper(),
+            'start_date': date_start,
+            'end_date': date_end,
+        }
+        
+        # Cabin é opcional
+        if cabin_class:
+            params['cabin'] = cabin_class.lower()
+        
+        return params
+    
     def search_availability(
         self,
         origin: str,
@@ -300,6 +761,9 @@ class SeatsAeroClient:
         NÃO são enviados para a API. Eles devem ser aplicados localmente
         via process_search_results().
         
+        Retorna apenas a PRIMEIRA página da busca. Para rotas movimentadas,
+        use iter_search_results(), que segue a paginação da API.
+        
         Args:
             origin: Origin airport code (e.g., "GRU")
             destination: Destination airport code (e.g., "MIA")
@@ -327,26 +791,9 @@ class SeatsAeroClient:
             ...     max_staleness_hours=24
             ... )
         """
-        # Calculate dates if not provided
-        if not date_start:
-            date_start = datetime.now().date().isoformat()
-        
-        if not date_end:
-            start_date_obj = datetime.fromisoformat(date_start).date()
-            end_date_obj = start_date_obj + timedelta(days=days)
-            date_end = end_date_obj.isoformat()
-        
-        # IMPORTANTE: Apenas parâmetros aceitos pela API Seats.aero
-        params = {
-            'origin_airport': origin.upper(),
-            'destination_airport': destination.upper(),
-            'start_date': date_start,
-            'end_date': date_end,
-        }
-        
-        # Cabin é opcional
-        if cabin_class:
-            params['cabin'] = cabin_class.lower()
+        params = self._build_search_params(
+            origin, destination, date_start, date_end, days, cabin_class
+        )
         
         # Try common endpoint patterns
         endpoint = '/search'
@@ -363,10 +810,420 @@ class SeatsAeroClient:
                     pass
             raise e
     
+    @staticmethod
+    def extract_flights(results: Any) -> List[Dict[str, Any]]:
+        """
+        Extract the list of flights from a raw /search response.
+        
+        A API pode retornar a lista direto ou envelopada em
+        'data', 'results' ou 'flights'.
+        
+        Args:
+            results: Raw JSON response (dict or list)
+        
+        Returns:
+            List of raw flight dicts (empty if none)
+        """
+        if isinstance(results, dict):
+            return results.get('data', results.get('results', results.get('flights', []))) or []
+        return results or []
+    
+    @staticmethod
+    def _next_page_params(
+        params: Dict[str, Any],
+        response: Any,
+        fetched: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the params for the next /search page, or None if this was the last one.
+        
+        A API pagina com 'hasMore' + 'cursor': a próxima página é pedida
+        repetindo a busca com o mesmo cursor e 'skip' = total já recebido.
+        
+        Args:
+            params: Params used for the first page
+            response: Raw JSON response of the current page
+            fetched: Total number of flights received so far
+        
+        Returns:
+            Params dict for the next page, or None
+        """
+        if not isinstance(response, dict) or not response.get('hasMore'):
+            return None
+        
+        next_params = dict(params)
+        cursor = response.get('cursor')
+        if cursor is not None:
+            next_params['cursor'] = cursor
+        next_params['skip'] = fetched
+        return next_params
+    
+    def iter_search_pages(
+        self,
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        page_size: int = SEARCH_PAGE_SIZE,
+        max_pages: Optional[int] = None,
+        prefetch: bool = True
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream /search results page by page, following the API pagination.
+        
+        Com prefetch=True a próxima página já é requisitada (em uma thread
+        auxiliar) ANTES de entregar a página atual. Assim quem consome o
+        gerador (ex: process_search_results) filtra a página 1 enquanto a
+        página 2 ainda está em trânsito.
+        
+        Args:
+            origin: Origin airport code (e.g., "GRU")
+            destination: Destination airport code (e.g., "MIA")
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+            page_size: Results per page ('take' param)
+            max_pages: Optional safety limit of pages to fetch
+            prefetch: Fetch the next page while the current one is consumed
+        
+        Yields:
+            List of raw flight dicts for each page
+        
+        Example:
+            >>> with SeatsAeroClient() as client:
+            ...     for page in client.iter_search_pages("GRU", "MIA", days=365):
+            ...         print(len(page))
+        """
+        params = self._build_search_params(
+            origin, destination, date_start, date_end, days, cabin_class
+        )
+        params['take'] = page_size
+        
+        def fetch(page_params: Dict[str, Any]) -> Any:
+            return self._make_request('GET', '/search', params=page_params)
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        
+        try:
+            response = fetch(params)
+            pages = 0
+            fetched = 0
+            
+            while True:
+                flights = self.extract_flights(response)
+                pages += 1
+                fetched += len(flights)
+                
+                # Página vazia encerra (evita loop infinito com cursor inválido)
+                next_params = self._next_page_params(params, response, fetched) if flights else None
+                if max_pages is not None and pages >= max_pages:
+                    next_params = None
+                
+                # Dispara a próxima página antes de entregar a atual
+                future = None
+                if next_params is not None and executor is not None:
+                    future = executor.submit(fetch, next_params)
+                
+                if flights:
+                    yield flights
+                
+                if next_params is None:
+                    break
+                
+                response = future.result() if future is not None else fetch(next_params)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _split_window(date_start: str, date_end: str, chunk_days: int) -> List[Tuple[str, str]]:
+        """
+        Split [date_start, date_end] into consecutive sub-windows of chunk_days.
+        
+        As janelas não se sobrepõem (o fim de uma é o dia anterior ao
+        início da próxima) e a última termina exatamente em date_end.
+        
+        Returns:
+            List of (start ISO, end ISO), in date order
+        """
+        start = date.fromisoformat(date_start)
+        end = date.fromisoformat(date_end)
+        step = timedelta(days=max(1, chunk_days))
+        
+        windows = []
+        while start <= end:
+            window_end = min(end, start + step - timedelta(days=1))
+            windows.append((start.isoformat(), window_end.isoformat()))
+            start = window_end + timedelta(days=1)
+        return windows
+    
+    @staticmethod
+    def _flight_key(flight: Dict[str, Any]) -> Any:
+        """Identity of a raw flight for de-duplication ('ID' when the API sends it)."""
+        flight_id = flight.get('ID', flight.get('id'))
+        if flight_id is not None:
+            return flight_id
+        route = flight.get('Route') if isinstance(flight.get('Route'), dict) else {}
+        return (
+            route.get('OriginAirport', flight.get('OriginAirport', flight.get('Origin'))),
+            route.get('DestinationAirport', flight.get('DestinationAirport', flight.get('Destination'))),
+            flight.get('Date', flight.get('DepartureDate')),
+            flight.get('Source'),
+        )
+    
+    def _iter_windows(
+        self,
+        origin: str,
+        destination: str,
+        windows: List[Tuple[str, str]],
+        cabin_class: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        **page_options: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch date sub-windows concurrently and stream them merged, in date order.
+        
+        Todas as janelas são disparadas juntas (até max_workers threads); os
+        voos da 1ª janela saem assim que ELA termina, sem esperar as demais.
+        Voos repetidos entre janelas (mesmo ID, ou mesma rota/data/programa)
+        saem uma vez só.
+        """
+        page_options['prefetch'] = False  # o paralelismo já vem das janelas
+        
+        def fetch_window(window: Tuple[str, str]) -> List[Dict[str, Any]]:
+            window_start, window_end = window
+            return list(self.iter_search_results(
+                origin, destination, window_start, window_end,
+                cabin_class=cabin_class, **page_options
+            ))
+        
+        workers = min(max_workers or self.max_workers, len(windows))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        seen = set()
+        
+        try:
+            futures = [executor.submit(fetch_window, window) for window in windows]
+            for future in futures:
+                for flight in future.result():
+                    key = self._flight_key(flight)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield flight
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def iter_search_results(
+        self,
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        chunk_days: Optional[int] = None,
+        stream: bool = False,
+        max_workers: Optional[int] = None,
+        **page_options: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every flight of a /search, across all pages.
+        
+        Atalho sobre iter_search_pages() que entrega voo a voo, pronto
+        para ser passado direto a process_search_results().
+        
+        Com chunk_days, uma janela longa (ex: 365 dias) vira várias buscas
+        menores (ex: 30 dias) feitas em paralelo, mescladas em ordem de
+        data e sem duplicatas (ver _iter_windows). Cada requisição fica
+        leve (longe do timeout) e os primeiros voos chegam antes.
+        
+        Com stream=True cada página é baixada comprimida e parseada voo a
+        voo (ver _stream_request): o primeiro voo já segue para a
+        normalização/filtro enquanto o resto da página ainda chega.
+        
+        Args:
+            origin: Origin airport code (e.g., "GRU")
+            destination: Destination airport code (e.g., "MIA")
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+            chunk_days: Split the window into sub-windows of this many days
+            stream: Parse each page incrementally instead of response.json()
+            max_workers: Concurrent sub-window requests with chunk_days
+                         (defaults to self.max_workers)
+            **page_options: page_size, max_pages, prefetch (ignored with stream)
+        
+        Yields:
+            Raw flight dicts
+        
+        Example:
+            >>> with SeatsAeroClient() as client:
+            ...     flights = client.iter_search_results("GRU", "MIA", days=365, chunk_days=30)
+            ...     batches = SeatsAeroClient.process_search_results(flights)
+        """
+        if chunk_days:
+            params = self._build_search_params(origin, destination, date_start, date_end, days)
+            windows = self._split_window(params['start_date'], params['end_date'], chunk_days)
+            if len(windows) > 1:
+                yield from self._iter_windows(
+                    origin, destination, windows, cabin_class,
+                    max_workers=max_workers, stream=stream, **page_options
+                )
+                return
+        
+        if stream:
+            yield from self._iter_search_stream(
+                origin, destination, date_start, date_end, days, cabin_class,
+                page_size=page_options.get('page_size', self.SEARCH_PAGE_SIZE),
+                max_pages=page_options.get('max_pages')
+            )
+            return
+        
+        for page in self.iter_search_pages(
+            origin, destination, date_start, date_end, days, cabin_class, **page_options
+        ):
+            yield from page
+    
+    def _iter_search_stream(
+        self,
+        origin: str,
+        destination: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        page_size: int = SEARCH_PAGE_SIZE,
+        max_pages: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streamed version of the /search pagination (one flight at a time).
+        
+        hasMore/cursor só são conhecidos no fim de cada página (podem vir
+        depois do array), então a próxima página é pedida ao terminar a
+        atual, sem prefetch.
+        """
+        params = self._build_search_params(
+            origin, destination, date_start, date_end, days, cabin_class
+        )
+        params['take'] = page_size
+        
+        page_params = params
+        pages = 0
+        fetched = 0
+        
+        while page_params is not None:
+            page = self._stream_request('/search', params=page_params)
+            received = 0
+            try:
+                while True:
+                    try:
+                        flight = next(page)
+                    except StopIteration as done:
+                        metadata = done.value or {}
+                        break
+                    received += 1
+                    yield flight
+            finally:
+                page.close()  # libera a conexão se o consumidor parar no meio
+            
+            pages += 1
+            fetched += received
+            
+            # Página vazia encerra (evita loop infinito com cursor inválido)
+            page_params = self._next_page_params(params, metadata, fetched) if received else None
+            if max_pages is not None and pages >= max_pages:
+                page_params = None
+    
+    def search_many(
+        self,
+        routes: Iterable[Tuple[str, str]],
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        days: int = 60,
+        cabin_class: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        chunk_days: Optional[int] = None,
+        stream: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Dict[Tuple[str, str], Exception]]:
+        """
+        Search several origin/destination pairs in parallel.
+        
+        As buscas rodam em um pool limitado de threads que compartilha a
+        mesma requests.Session (e seu pool de conexões). O tempo total fica
+        próximo ao da busca mais lenta, e não à soma de todas.
+        
+        Com chunk_days, rotas e janelas dividem o mesmo orçamento de
+        max_workers: cada rota usa max_workers // rotas simultâneas
+        threads de janela, então nunca há mais que max_workers
+        requisições (nem conexões) ao mesmo tempo.
+        
+        Uma rota com erro não derruba as demais: o erro é devolvido no
+        dicionário de falhas e as outras rotas seguem normalmente.
+        
+        Args:
+            routes: Iterable of (origin, destination) pairs
+            date_start: Start date ISO "YYYY-MM-DD" (defaults to today)
+            date_end: End date ISO (defaults to date_start + days)
+            days: Days forward to search (default 60, max 365)
+            cabin_class: Cabin filter ("economy", "business", "first")
+            max_workers: Concurrent requests, routes × windows (defaults to self.max_workers)
+            chunk_days: Split each route's window (see iter_search_results)
+            stream: Parse responses incrementally (see iter_search_results)
+        
+        Returns:
+            Tuple (flights, errors):
+            - flights: raw flights of all routes, merged in route order
+            - errors: {(origin, destination): exception} for failed routes
+        
+        Example:
+            >>> with SeatsAeroClient() as client:
+            ...     flights, errors = client.search_many([("GRU", "MIA"), ("GIG", "LIS")])
+            ...     batches = SeatsAeroClient.process_search_results(flights)
+        """
+        routes = [(origin.upper(), destination.upper()) for origin, destination in routes]
+        if not routes:
+            return [], {}
+        
+        # Orçamento dividido: rotas simultâneas × janelas por rota <= budget
+        budget = max_workers or self.max_workers
+        workers = min(budget, len(routes))
+        window_workers = max(1, budget // workers)
+        
+        def fetch_route(route: Tuple[str, str]) -> List[Dict[str, Any]]:
+            origin, destination = route
+            # Sem prefetch: o paralelismo já vem do pool de rotas
+            return list(self.iter_search_results(
+                origin, destination, date_start, date_end, days, cabin_class,
+                chunk_days=chunk_days, stream=stream, max_workers=window_workers,
+                prefetch=False
+            ))
+        
+        flights: List[Dict[str, Any]] = []
+        errors: Dict[Tuple[str, str], Exception] = {}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(fetch_route, route) for route in routes]
+            
+            # Junta na ordem das rotas (resultado determinístico)
+            for route, future in zip(routes, futures):
+                try:
+                    flights.extend(future.result())
+                except Exception as e:
+                    errors[route] = e
+        
+        return flights, errors
+    
     def get_routes(self, origin: Optional[str] = None) -> Dict[str, Any]:
         """
         Get available routes from Seats.aero.
         
+        Com cache configurado, a resposta fica em disco e é revalidada
+        com GET condicional (ETag/Last-Modified) a cada chamada.
+        
         Args:
             origin: Optional origin filter
         
@@ -383,6 +1240,8 @@ class SeatsAeroClient:
         """
         Get list of supported loyalty programs.
         
+        Revalidado com GET condicional quando há cache (ver get_routes).
+        
         Returns:
             JSON with program data
         """
@@ -401,140 +1260,204 @@ class SeatsAeroClient:
         self.close()
     
     @staticmethod
-    def process_search_results(
-        results: List[Dict[str, Any]],
-        max_staleness_hours: int = 48,
-        direct_only: bool = False,
-        airline_filter: Optional[str] = None,
-        program_filter: Optional[str] = None
-    ) -> List[FlightBatch]:
+    def _resolve_airline(flight: Dict[str, Any], source_code: str) -> Tuple[str, str]:
         """
-        Processa e agrupa resultados da API Seats.aero.
+        Descobre a companhia aérea de um voo (BUSCA ROBUSTA com múltiplas fontes).
         
-        Filtros aplicados:
-        - max_staleness_hours: Descarta voos vistos há mais tempo
-        - direct_only: Descarta voos com conexão
-        - airline_filter: Filtra por companhia específica
-        - program_filter: Filtra por programa de milhas
+        Prioridade:
+        1. Campo direto 'Airline'
+        2. Route.Airline (estrutura aninhada)
+        3. MarketingCarrier
+        4. OperatedBy
+        5. Inferir via Source (SOURCE_TO_AIRLINE)
+        6. Fallback: Source capitalizado
+        
+        Cada fonte só é consultada se as anteriores estiverem vazias.
         
         Args:
-            results: Lista de voos da API
-            max_staleness_hours: Máximo de horas desde última atualização
-            direct_only: Se True, só voos diretos
-            airline_filter: Nome da companhia (ex: "United")
-            program_filter: Nome do programa (ex: "Privilege Club")
+            flight: Voo cru da API
+            source_code: Código do programa já em minúsculas
         
         Returns:
-            Lista de FlightBatch agrupados
+            Tupla (companhia, origem) onde origem é 'direct', 'source',
+            'fallback' ou 'unknown' (ver AvailabilityRecord.airline_origin)
         """
-        if not results:
-            return []
+        # Prioridade 1: Campo direto 'Airline'
+        airline = flight.get('Airline')
         
-        # Filtrar resultados
-        filtered_results = []
-        now = datetime.now()
+        # Prioridade 2: Route.Airline (estrutura aninhada)
+        if not airline:
+            route = flight.get('Route')
+            if isinstance(route, dict):
+                airline = route.get('Airline')
         
-        for flight in results:
-            # Filtro 1: Staleness (última vez visto)
-            last_seen_str = flight.get('LastSeen', flight.get('UpdatedAt', ''))
-            if last_seen_str:
-                try:
-                    last_seen = datetime.fromisoformat(last_seen_str.replace('Z', '+00:00'))
-                    hours_ago = (now - last_seen).total_seconds() / 3600
-                    if hours_ago > max_staleness_hours:
-                        continue  # Descarta (muito antigo)
-                except:
-                    pass  # Se não conseguir parsear, mantém
-            
-            # Filtro 2: Direct only
-            if direct_only:
-                is_direct = flight.get('Direct', flight.get('Nonstop', True))
-                if not is_direct:
-                    continue  # Descarta (tem conexão)
-            
-            # Filtro 3: Airline (case insensitive substring match)
-            if airline_filter:
-                airline = flight.get('Airline', '')
-                # Aceita substring: 'latam' matches 'LATAM Airlines'
-                if airline_filter.lower() not in airline.lower():
-                    continue  # Descarta (companhia diferente)
-            
-            # Filtro 4: Program (case insensitive substring match)
-            if program_filter:
-                source = flight.get('Source', '').lower()
-                # Traduzir código para nome do programa
-                program_name = PROGRAM_MAPPING.get(source, source.title())
-                
-                # Verifica se program_filter está no nome traduzido OU no código
-                # Ex: 'Qatar' matches 'Qatar Privilege Club'
-                # Ex: 'privilege' matches 'privilege' (código)
-                filter_lower = program_filter.lower()
-                if (filter_lower not in program_name.lower() and 
-                    filter_lower not in source):
-                    continue  # Descarta (programa diferente)
-            
-            filtered_results.append(flight)
+        # Prioridades 3 e 4: MarketingCarrier, OperatedBy
+        if not airline:
+            airline = flight.get('MarketingCarrier') or flight.get('OperatedBy')
         
-        if not filtered_results:
-            return []
+        if airline:
+            return airline, 'direct'
         
-        # Agrupar por (Origin, Destination, Airline, Source)
-        groups = defaultdict(list)
+        # Prioridade 5: Inferir via Source (programa de milhas)
+        inferred = SOURCE_TO_AIRLINE.get(source_code)
+        if inferred:
+            return inferred, 'source'
         
-        for flight in filtered_results:
-            key = (
-                flight.get('Origin', '').upper(),
-                flight.get('Destination', '').upper(),
-                flight.get('Airline', ''),
-                flight.get('Source', '').lower()
-            )
-            groups[key].append(flight)
+        # Fallback final: Capitalizar o source
+        if source_code:
+            return source_code.title(), 'fallback'
         
-        # Criar FlightBatch para cada grupo
-        batches = []
+        return "Companhia Desconhecida", 'unknown'
+    
+    @staticmethod
+    def _parse_last_seen(value: Any) -> Optional[float]:
+        """
+        Converte LastSeen/UpdatedAt da API (ISO 8601) para epoch.
         
-        for (origin_code, dest_code, airline, source), flights in groups.items():
-            # Traduzir código do programa para nome legível
-            program = PROGRAM_MAPPING.get(source, source.title())
-            
-            dates = []
-            costs = []
-            cabin_class = None
-            
-            for flight in flights:
-                # Data
-                date_str = flight.get('Date', flight.get('DepartureDate', ''))
-                if not date_str:
-                    continue
-                
-                # Assentos
-                seats = flight.get('RemainingSeats', flight.get('Seats', None))
-                if seats is None:
-                    seats = 4
-                
-                dates.append((date_str, seats))
-                
-                # Custo
-                miles_cost = flight.get('MilesCost', flight.get('Miles', 0))
-                if miles_cost:
-                    costs.append(miles_cost)
-                
-                # Classe
-                if cabin_class is None:
-                    cabin_class = flight.get('CabinClass', flight.get('Cabin', 'economy'))
-            
-            if not dates:
-                continue
-            
+        Returns:
+            Epoch em segundos, ou None se ausente/inválido
+        """
+        if not value or not isinstance(value, str):
+            return None
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _raw_seats(flight: Dict[str, Any], requested_cabin: str) -> Any:
+        """Assentos disponíveis na classe solicitada, como vieram da API (None se ausente)."""
+        seats = flight.get('RemainingSeats')
+        if seats is None:
+            availability = flight.get('Availability')
+            if isinstance(availability, dict):
+                seats = availability.get(requested_cabin.title())
+            else:
+                seats = flight.get('Seats')
+        return seats
+    
+    @staticmethod
+    def _fallback_cost(flight: Dict[str, Any]) -> Any:
+        """Custo genérico (MilesCost, MileageCost, Miles, Cost) como veio da API."""
+        get = flight.get
+        cost = get('MilesCost')
+        if cost is None:
+            cost = get('MileageCost')
+            if cost is None:
+                cost = get('Miles')
+                if cost is None:
+                    cost = get('Cost')
+        return cost
+    
+    @staticmethod
+    def normalize_flight(
+        flight: Dict[str, Any],
+        requested_cabin: str = 'business',
+        plan: Optional[FilterPlan] = None,
+        now: Optional[float] = None
+    ) -> Optional[AvailabilityRecord]:
+        """
+        Converte UM voo cru da API em AvailabilityRecord.
+        
+        Todas as buscas por campos alternativos (Route, MarketingCarrier,
+        Date/DepartureDate, custo da cabine...) acontecem aqui, uma única
+        vez por voo e só até achar um valor. Só o custo e os assentos da
+        cabine pedida são extraídos.
+        
+        Com `plan`, os filtros baratos (programa, direto, companhia) rodam
+        sobre os campos crus e o LastSeen só é parseado depois deles: voo
+        descartado não chega a virar registro.
+        
+        Args:
+            flight: Voo cru da API (dict em CamelCase)
+            requested_cabin: Classe solicitada (define custo e assentos extraídos)
+            plan: Filtros da consulta (None = não filtra)
+            now: Epoch atual para o filtro de staleness (padrão: time.time())
+        
+        Returns:
+            AvailabilityRecord normalizado, ou None se `plan` descartou o voo
+        """
+        safe_int = SeatsAeroClient._safe_int
+        get = flight.get
+        
+        source = (get('Source') or '').lower()
+        if plan is not None and plan.program_lower and not plan.matches_program(source):
+            return None
+        
+        direct = get('Direct')
+        if direct is None:
+            direct = get('NumStops', 1) == 0
+        direct = bool(direct)
+        if plan is not None and plan.direct_only and not direct:
+            return None
+        
+        # Se não encontrou companhia, não aplica filtro (mantém voo)
+        airline, airline_origin = SeatsAeroClient._resolve_airline(flight, source)
+        if (plan is not None and plan.airline_lower and airline_origin != 'unknown'
+                and not plan.matches_airline(airline)):
+            return None
+        
+        # Staleness (se não conseguir parsear a data, mantém)
+        last_seen = get('LastSeen')
+        if last_seen is None:
+            last_seen = get('UpdatedAt')
+            if last_seen is None:
+                last_seen = get('CreatedAt')
+        last_seen = SeatsAeroClient._parse_last_seen(last_seen)
+        if plan is not None and plan.max_age and last_seen is not None:
+            if (now if now is not None else time.time()) - last_seen > plan.max_age:
+                return None
+        
+        # Aeroportos (tentar múltiplas estruturas)
+        route = get('Route')
+        if isinstance(route, dict):
+            origin = route.get('OriginAirport') or ''
+            destination = route.get('DestinationAirport') or ''
+        else:
+            origin = get('OriginAirport')
+            if origin is None:
+                origin = get('Origin') or ''
+            destination = get('DestinationAirport')
+            if destination is None:
+                destination = get('Destination') or ''
+        
+        # Data (múltiplos campos possíveis)
+        date_str = get('Date')
+        if date_str is None:
+            date_str = get('DepartureDate')
+            if date_str is None:
+                date_str = get('DepartDate')
+        
+        # Custo da cabine; sem ele, custo genérico (mock ou APIs antigas)
+        cost = safe_int(get(CABIN_COST_FIELDS.get(requested_cabin, 'JMileageCost')))
+        if not cost:
+            cost = safe_int(SeatsAeroClient._fallback_cost(flight))
+        
+        return AvailabilityRecord(
+            origin=origin.upper(),
+            destination=destination.upper(),
+            airline=airline,
+            airline_origin=airline_origin,
+            source=source,
+            date=date_str or '',
+            # Converter para int (pode vir como string da API)
+            seats=safe_int(SeatsAeroClient._raw_seats(flight, requested_cabin), default=4),
+            cost=cost,
+            last_seen=last_seen,
+            direct=direct
+        )
+    
     @staticmethod
     def process_search_results(
-        results: List[Dict[str, Any]],
+        results: Iterable[Dict[str, Any]],
         max_staleness_hours: int = 48,
         direct_only: bool = False,
         airline_filter: Optional[str] = None,
         program_filter: Optional[str] = None,
         requested_cabin: str = 'business',
-        max_cost_filter: Optional[int] = None
+        max_cost_filter: Optional[int] = None,
+        engine: str = 'python',
+        filter_plan: Optional[FilterPlan] = None
     ) -> List[FlightBatch]:
         """
         Processa e agrupa resultados da API Seats.aero.
@@ -542,6 +1465,16 @@ class SeatsAeroClient:
         IMPORTANTE: A API Seats.aero usa CamelCase e estrutura específica.
         Este método mapeia corretamente os campos para nosso modelo.
         
+        Aceita lista OU iterável (ex: iter_search_results()): os voos são
+        filtrados conforme chegam, então a filtragem da página 1 acontece
+        enquanto a página 2 ainda está sendo baixada.
+        
+        Pipeline:
+        1. Normalização + filtros: cada voo aceito vira um AvailabilityRecord
+           (os descartados param nos campos crus)
+        2. Agrupamento: por (origem, destino, companhia, programa)
+        3. Montagem dos FlightBatch
+        
         Filtros aplicados (LOCALMENTE):
         - max_staleness_hours: Descarta voos vistos há mais tempo
         - direct_only: Descarta voos com conexão
@@ -550,290 +1483,201 @@ class SeatsAeroClient:
         - max_cost_filter: Descarta voos com custo acima do limite
         
         Args:
-            results: Lista de voos da API
+            results: Lista (ou iterável) de voos da API
             max_staleness_hours: Máximo de horas desde última atualização
             direct_only: Se True, só voos diretos
             airline_filter: Nome da companhia (ex: "United")
             program_filter: Nome do programa (ex: "Privilege Club")
             requested_cabin: Classe solicitada ("economy", "business", "first")
             max_cost_filter: Custo máximo em milhas (ex: 100000)
+            engine: 'python' (loop padrão, streaming) ou 'columnar'
+                    (NumPy, para varreduras grandes; ver columnar_engine.py)
+            filter_plan: FilterPlan já montado (substitui os filtros acima;
+                         útil para reaproveitar o plano entre chamadas)
         
         Returns:
             Lista de FlightBatch agrupados e enriquecidos
+        
+        Raises:
+            ValueError: Se engine for inválida ou 'columnar' sem NumPy
         """
+        plan = filter_plan or FilterPlan(
+            max_staleness_hours=max_staleness_hours,
+            direct_only=direct_only,
+            airline_filter=airline_filter,
+            program_filter=program_filter,
+            max_cost_filter=max_cost_filter
+        )
+        
+        if engine == 'columnar':
+            from app.services.columnar_engine import process_columnar
+            return process_columnar(results, plan, requested_cabin=requested_cabin)
+        if engine != 'python':
+            raise ValueError(f"❌ Engine inválida: {engine} (use 'python' ou 'columnar')")
+        
         if not results:
             return []
         
-        # DEBUG: Descomente para ver estrutura real da API
-        # if results:
-        #     print(f"\n🔍 DEBUG - Estrutura do primeiro resultado:")
-        #     print(f"Chaves disponíveis: {list(results[0].keys())}")
-        #     print(f"Amostra: {results[0]}")
-        #     print()
-        
-        # Mapeamento de cabines para campos de custo
-        cabin_cost_map = {
-            'economy': 'YMileageCost',
-            'business': 'JMileageCost',
-            'first': 'FMileageCost'
-        }
-        cost_field = cabin_cost_map.get(requested_cabin, 'JMileageCost')
-        
-        # Filtrar resultados
-        filtered_results = []
-        now = datetime.now()
+        # Normalizar + filtrar (staleness, direct only, airline e program):
+        # voos descartados nem chegam a virar registro
+        filtered_records = []
+        normalize = SeatsAeroClient.normalize_flight
+        now = time.time()
         
         for flight in results:
-            # Filtro 1: Staleness (última vez visto)
-            last_seen_str = flight.get('LastSeen', flight.get('UpdatedAt', flight.get('CreatedAt', '')))
-            if last_seen_str and max_staleness_hours:
-                try:
-                    last_seen = datetime.fromisoformat(last_seen_str.replace('Z', '+00:00'))
-                    hours_ago = (now - last_seen).total_seconds() / 3600
-                    if hours_ago > max_staleness_hours:
-                        continue  # Descarta (muito antigo)
-                except:
-                    pass  # Se não conseguir parsear, mantém
-            
-            # Filtro 2: Direct only
-            if direct_only:
-                is_direct = flight.get('Direct', flight.get('NumStops', 1) == 0)
-                if not is_direct:
-                    continue  # Descarta (tem conexão)
-            
-            # Filtro 3: Airline (case insensitive substring match)
-            if airline_filter:
-                # Busca robusta de airline (mesma lógica do agrupamento)
-                airline = None
-                
-                # Prioridade 1: Campo direto 'Airline'
-                if 'Airline' in flight and flight['Airline']:
-                    airline = flight['Airline']
-                
-                # Prioridade 2: Route.Airline
-                elif 'Route' in flight and isinstance(flight['Route'], dict):
-                    airline = flight['Route'].get('Airline', None)
-                
-                # Prioridade 3: MarketingCarrier
-                if not airline and 'MarketingCarrier' in flight:
-                    airline = flight['MarketingCarrier']
-                
-                # Prioridade 4: OperatedBy
-                if not airline and 'OperatedBy' in flight:
-                    airline = flight['OperatedBy']
-                
-                # Prioridade 5: Inferir via Source
-                if not airline:
-                    source_code = flight.get('Source', '').lower()
-                    if source_code in SOURCE_TO_AIRLINE:
-                        airline = SOURCE_TO_AIRLINE[source_code]
-                    else:
-                        airline = source_code.title() if source_code else None
-                
-                # Se não encontrou companhia, não aplica filtro (mantém voo)
-                # Se encontrou, aplica filtro (substring case insensitive)
-                if airline and airline_filter.lower() not in airline.lower():
-                    continue  # Descarta (companhia diferente)
-            
-            # Filtro 4: Program (case insensitive substring match)
-            if program_filter:
-                source = flight.get('Source', '').lower()
-                program_name = PROGRAM_MAPPING.get(source, source.title())
-                
-                filter_lower = program_filter.lower()
-                if (filter_lower not in program_name.lower() and 
-                    filter_lower not in source):
-                    continue  # Descarta (programa diferente)
-            
-            filtered_results.append(flight)
+            record = normalize(flight, requested_cabin, plan, now)
+            if record is not None:
+                filtered_records.append(record)
         
-        if not filtered_results:
+        if not filtered_records:
             return []
         
         # Agrupar por (Origin, Destination, Airline, Source)
         groups = defaultdict(list)
+        stats = AirlineResolutionStats()
         
-        for flight in filtered_results:
-            # Extrair aeroportos (tentar múltiplas estruturas)
-            origin = None
-            destination = None
+        for record in filtered_records:
+            origin, destination = record.origin, record.destination
             
-            # Tentar estruturas comuns da API
-            if 'Route' in flight and isinstance(flight['Route'], dict):
-                origin = flight['Route'].get('OriginAirport', '').upper()
-                destination = flight['Route'].get('DestinationAirport', '').upper()
-            else:
-                origin = flight.get('OriginAirport', flight.get('Origin', '')).upper()
-                destination = flight.get('DestinationAirport', flight.get('Destination', '')).upper()
-            
-            # Extrair airline (BUSCA ROBUSTA com múltiplas fontes)
-            airline = None
-            
-            # Prioridade 1: Campo direto 'Airline'
-            if 'Airline' in flight and flight['Airline']:
-                airline = flight['Airline']
-            
-            # Prioridade 2: Route.Airline (estrutura aninhada)
-            elif 'Route' in flight and isinstance(flight['Route'], dict):
-                airline = flight['Route'].get('Airline', None)
-            
-            # Prioridade 3: MarketingCarrier
-            if not airline and 'MarketingCarrier' in flight:
-                airline = flight['MarketingCarrier']
-            
-            # Prioridade 4: OperatedBy
-            if not airline and 'OperatedBy' in flight:
-                airline = flight['OperatedBy']
-            
-            # Prioridade 5: Inferir via Source (programa de milhas)
-            if not airline:
-                source_code = flight.get('Source', '').lower()
-                if source_code in SOURCE_TO_AIRLINE:
-                    airline = SOURCE_TO_AIRLINE[source_code]
-                    print(f"ℹ️  Cia inferida via Source: {source_code} -> {airline} ({origin}-{destination})")
-                else:
-                    # Fallback final: Capitalizar o source
-                    airline = source_code.title() if source_code else "Companhia Desconhecida"
-                    if airline == "Companhia Desconhecida":
-                        print(f"⚠️  Companhia não detectada para voo {origin}-{destination} (Source: {source_code or 'N/A'})")
-                    else:
-                        print(f"ℹ️  Cia inferida via Source (fallback): {source_code} -> {airline} ({origin}-{destination})")
-            else:
-                # Debug: Log da companhia detectada
-                print(f"✅ Companhia detectada: {airline} ({origin}-{destination})")
-            
-            source = flight.get('Source', '').lower()
+            # Diagnóstico: como a companhia foi obtida (resumo no fim)
+            stats.add(record)
             
             if not origin or not destination:
                 continue  # Skip se não conseguir extrair rota
             
-            key = (origin, destination, airline, source)
-            groups[key].append(flight)
+            key = (origin, destination, record.airline, record.source)
+            groups[key].append(record)
+        
+        stats.log_summary()
         
         # Criar FlightBatch para cada grupo
         batches = []
         
-        for (origin_code, dest_code, airline, source), flights in groups.items():
-            # Traduzir código do programa para nome legível
-            program = PROGRAM_MAPPING.get(source, source.title())
-            
+        for (origin_code, dest_code, airline, source), records in groups.items():
             dates = []
             costs = []
             
-            for flight in flights:
-                # Data (múltiplos campos possíveis)
-                date_str = flight.get('Date', flight.get('DepartureDate', flight.get('DepartDate', '')))
-                if not date_str:
+            for record in records:
+                if not record.date:
                     continue
                 
-                # Assentos disponíveis
-                seats = None
-                if 'RemainingSeats' in flight:
-                    seats = flight['RemainingSeats']
-                elif 'Availability' in flight and isinstance(flight['Availability'], dict):
-                    seats = flight['Availability'].get(requested_cabin.title(), None)
-                elif 'Seats' in flight:
-                    seats = flight['Seats']
-                
-                # Converter para int (pode vir como string da API)
-                seats = SeatsAeroClient._safe_int(seats, default=4)
-                
-                # Custo em milhas (baseado na classe solicitada)
-                # Prioridade:
-                # 1. Campos específicos por cabine (JMileageCost, YMileageCost, FMileageCost)
-                # 2. Campos genéricos (MilesCost, MileageCost, Miles, Cost)
-                miles_cost = flight.get(cost_field, None)
-                
-                # Fallback para campos genéricos (mock ou APIs antigas)
-                if miles_cost is None or miles_cost == 0:
-                    miles_cost = flight.get('MilesCost', 
-                                 flight.get('MileageCost', 
-                                 flight.get('Miles', 
-                                 flight.get('Cost', 0))))
-                
-                # Converter para int (API pode retornar string "77000")
-                miles_cost = SeatsAeroClient._safe_int(miles_cost, default=0)
+                # Custo em milhas (da classe solicitada)
+                miles_cost = record.cost
                 
-                # Se AINDA é 0, pular (sem disponibilidade)
+                # Se é 0, pular (sem disponibilidade)
                 if miles_cost == 0:
                     continue
                 
                 # Filtro de custo máximo
-                if max_cost_filter and miles_cost > max_cost_filter:
+                if not plan.accepts_cost(miles_cost):
                     continue  # Descarta voos acima do limite
                 
-                dates.append((date_str, seats))
+                dates.append((record.date, record.seats))
                 costs.append(miles_cost)
             
             if not dates:
                 continue  # Skip se não tem datas válidas
             
-            # Calcular min e max cost
-            min_cost = min(costs) if costs else None
-            max_cost = max(costs) if costs else None
-            
-            # Formatar custo display
-            if min_cost:
-                if min_cost >= 1000:
-                    cost_str = f"{min_cost // 1000}k"
-                else:
-                    cost_str = str(min_cost)
-                
-                # Se há variação de preço
-                if max_cost and max_cost != min_cost:
-                    max_str = f"{max_cost // 1000}k" if max_cost >= 1000 else str(max_cost)
-                    cost_str = f"{cost_str}-{max_str}"
+            batches.append(SeatsAeroClient._make_batch(
+                origin_code, dest_code, airline, source,
+                dates, min(costs), max(costs), requested_cabin
+            ))
+        
+        return batches
+    
+    @staticmethod
+    def _make_batch(
+        origin_code: str,
+        dest_code: str,
+        airline: str,
+        source: str,
+        dates: List[Tuple[str, int]],
+        min_cost: Optional[int],
+        max_cost: Optional[int],
+        requested_cabin: str
+    ) -> FlightBatch:
+        """
+        Monta o FlightBatch de um grupo (origem, destino, companhia, programa).
+        
+        Formata custo e cabine para exibição, gera a nota com estatísticas
+        e enriquece com os dados dos aeroportos.
+        
+        Args:
+            origin_code: IATA de origem
+            dest_code: IATA de destino
+            airline: Companhia do grupo
+            source: Código do programa (ex: 'united')
+            dates: Lista de tuplas (data, assentos) do grupo
+            min_cost: Menor custo em milhas do grupo
+            max_cost: Maior custo em milhas do grupo
+            requested_cabin: Classe solicitada
+        
+        Returns:
+            FlightBatch pronto para renderizar
+        """
+        # Traduzir código do programa para nome legível
+        program = PROGRAM_MAPPING.get(source, source.title())
+        
+        # Formatar custo display
+        if min_cost:
+            if min_cost >= 1000:
+                cost_str = f"{min_cost // 1000}k"
             else:
-                cost_str = "Consultar"
-            
-            # Mapear cabin para nome em português
-            cabin_map = {
-                'economy': 'Econômica',
-                'premium_economy': 'Econômica Premium',
-                'business': 'Executiva',
-                'first': 'Primeira Classe'
-            }
-            cabin_display = cabin_map.get(requested_cabin, requested_cabin.title())
-            
-            # Nota com estatísticas
-            notes_parts = [f"Encontrado via API Seats.aero"]
-            notes_parts.append(f"{len(dates)} opções disponíveis")
-            if min_cost and max_cost and max_cost != min_cost:
-                notes_parts.append(f"Variação de preço: {min_cost//1000}k-{max_cost//1000}k")
+                cost_str = str(min_cost)
             
-            # Criar FlightBatch
-            batch = FlightBatch(
-                origin="",
-                origin_code=origin_code,
-                origin_flag="",
-                destination="",
-                dest_code=dest_code,
-                dest_flag="",
-                airline=airline,
-                program=program,
-                cost=cost_str,
-                cabin=cabin_display,
-                dates_outbound=dates,
-                dates_inbound=[],
-                notes=" | ".join(notes_parts),
-                min_cost=min_cost,
-                max_cost=max_cost
-            )
-            
-            # CRÍTICO: Enriquecer com dados de aeroportos
-            # Sem isso, origem/destino/bandeiras ficam vazios!
-            try:
-                batch.enrich_airport_data()
-            except Exception as e:
-                # Se falhar, pelo menos preenche com códigos
-                batch.origin = origin_code
-                batch.destination = dest_code
-                batch.origin_flag = "✈️"
-                batch.dest_flag = "✈️"
-            
-            batches.append(batch)
+            # Se há variação de preço
+            if max_cost and max_cost != min_cost:
+                max_str = f"{max_cost // 1000}k" if max_cost >= 1000 else str(max_cost)
+                cost_str = f"{cost_str}-{max_str}"
+        else:
+            cost_str = "Consultar"
         
-        return batches
+        # Mapear cabin para nome em português
+        cabin_map = {
+            'economy': 'Econômica',
+            'premium_economy': 'Econômica Premium',
+            'business': 'Executiva',
+            'first': 'Primeira Classe'
+        }
+        cabin_display = cabin_map.get(requested_cabin, requested_cabin.title())
+        
+        # Nota com estatísticas
+        notes_parts = [f"Encontrado via API Seats.aero"]
+        notes_parts.append(f"{len(dates)} opções disponíveis")
+        if min_cost and max_cost and max_cost != min_cost:
+            notes_parts.append(f"Variação de preço: {min_cost//1000}k-{max_cost//1000}k")
+        
+        # Criar FlightBatch
+        batch = FlightBatch(
+            origin="",
+            origin_code=origin_code,
+            origin_flag="",
+            destination="",
+            dest_code=dest_code,
+            dest_flag="",
+            airline=airline,
+            program=program,
+            cost=cost_str,
+            cabin=cabin_display,
+            dates_outbound=dates,
+            dates_inbound=[],
+            notes=" | ".join(notes_parts),
+            min_cost=min_cost,
+            max_cost=max_cost
+        )
+        
+        # CRÍTICO: Enriquecer com dados de aeroportos
+        # Sem isso, origem/destino/bandeiras ficam vazios!
+        try:
+            batch.enrich_airport_data()
+        except Exception as e:
+            # Se falhar, pelo menos preenche com códigos
+            batch.origin = origin_code
+            batch.destination = dest_code
+            batch.origin_flag = "✈️"
+            batch.dest_flag = "✈️"
+        
+        return batch
 
 
 def main():
@@ -866,7 +1710,7 @@ def main():
         console.print("[green]✅ Busca realizada![/green]\n")
         console.print("[bold]Resposta da API:[/bold]")
         console.print(JSON(str(results)))
-        
+    
     except ValueError as e:
         console.print(f"[red]{e}[/red]")
     except ConnectionError as e:
@@ -5,17 +5,73 @@ Este módulo é responsável por transformar objetos FlightBatch
 em textos formatados usando templates Jinja2.
 """
 
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+from app.core.config import Config
 from app.core.models import FlightBatch
 
 
+# Pasta templates/ na raiz do projeto (independe do diretório atual)
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates"
+
+_environment: Optional[Environment] = None
+_environment_lock = threading.Lock()
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """Cache em disco do template compilado (None se a pasta não puder ser criada)."""
+    try:
+        Config.TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(str(Config.TEMPLATE_CACHE_DIR))
+
+
+def get_environment() -> Environment:
+    """
+    Retorna o Environment Jinja2 único do processo (criado na primeira chamada).
+    
+    Por que reaproveitar?
+    - Antes, cada render_alert criava um Environment e recompilava o .j2
+    - Agora o template é compilado uma vez e fica em memória
+    - O bytecode vai para .cache/jinja/, então até a primeira renderização
+      de uma nova execução pula a compilação
+    - auto_reload: o template só é recompilado se o mtime do .j2 mudar
+    """
+    global _environment
+    
+    if _environment is not None:
+        return _environment
+    
+    with _environment_lock:
+        if _environment is None:
+            # trim_blocks e lstrip_blocks removem espaços em branco desnecessários
+            _environment = Environment(
+                loader=FileSystemLoader(str(TEMPLATES_DIR)),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                auto_reload=True,
+                bytecode_cache=_bytecode_cache()
+            )
+        return _environment
+
+
+def get_template(template_name: str) -> Template:
+    """Template compilado da pasta templates/ (cacheado pelo Environment)."""
+    return get_environment().get_template(template_name)
+
+
 def render_alert(batch: FlightBatch, template_name: str) -> str:
     """
     Renderiza um alerta de voo usando um template Jinja2.
     
     Como funciona:
-    1. Carrega o template especificado da pasta templates/
+    1. Pega o template já compilado da pasta templates/
     2. Extrai os dados do objeto FlightBatch
     3. Formata as datas usando os métodos helpers
     4. Injeta tudo no template Jinja2
@@ -34,20 +90,28 @@ def render_alert(batch: FlightBatch, template_name: str) -> str:
         >>> alert_text = render_alert(flight, "padrao_whatsapp.j2")
         >>> print(alert_text)  # ou enviar via API
     """
-    # Configura o Jinja2 para buscar templates na pasta "templates/"
-    # trim_blocks e lstrip_blocks removem espaços em branco desnecessários
-    env = Environment(
-        loader=FileSystemLoader("templates"),
-        trim_blocks=True,
-        lstrip_blocks=True
-    )
+    # Template já compilado (Environment compartilhado, ver get_environment)
+    template = get_template(template_name)
     
-    # Carrega o template especificado
-    template = env.get_template(template_name)
+    # Renderiza e retorna o texto final
+    return template.render(build_context(batch))
+
+
+def build_context(batch: FlightBatch) -> Dict[str, Any]:
+    """
+    Monta o contexto do template a partir de um FlightBatch.
+    
+    Os agrupamentos de datas por mês são calculados uma vez aqui e
+    passados prontos ao template.
     
-    # Prepara os dados para injetar no template
+    Args:
+        batch: Objeto FlightBatch com os dados do voo
+    
+    Returns:
+        Dict com as variáveis usadas pelos templates .j2
+    """
     # Note que usamos os métodos "_dict" para templates que precisam iterar
-    context = {
+    return {
         "origin": batch.origin,
         "origin_code": batch.origin_code,
         "origin_flag": batch.origin_flag,
@@ -67,9 +131,105 @@ def render_alert(batch: FlightBatch, template_name: str) -> str:
         "formatted_inbound": batch.get_inbound_dates_dict(),
         "notes": batch.notes
     }
+
+
+def _ensure_enriched(batch: FlightBatch) -> None:
+    """Preenche cidade/bandeira se o batch ainda não foi enriquecido."""
+    if batch.origin:
+        return
+    try:
+        batch.enrich_airport_data()
+    except Exception:
+        # Se falhar, pelo menos preenche com códigos
+        batch.origin = batch.origin_code
+        batch.destination = batch.dest_code
+        batch.origin_flag = "✈️"
+        batch.dest_flag = "✈️"
+
+
+def _render_chunk(batches: List[FlightBatch], template_name: str) -> List[Union[str, Exception]]:
+    """Renderiza um lote no processo worker (erros voltam como valor)."""
+    results = []
+    for batch in batches:
+        try:
+            results.append(render_alert(batch, template_name))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def render_alerts(
+    batches: Iterable[FlightBatch],
+    template_name: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    on_error: Optional[Callable[[FlightBatch, Exception], None]] = None
+) -> Iterator[Tuple[FlightBatch, str]]:
+    """
+    Renderiza vários alertas, entregando os textos conforme ficam prontos.
     
-    # Renderiza e retorna o texto final
-    return template.render(context)
+    É um gerador: os textos saem na ordem dos batches e nada é acumulado,
+    então milhares de alertas podem ir direto para um envio sem ficar
+    todos na memória. Batches sem cidade/bandeira são enriquecidos antes.
+    
+    Com workers > 1, os lotes (chunk_size batches) são renderizados em um
+    pool de processos, com no máximo 2 lotes por worker em andamento.
+    
+    Args:
+        batches: Lista (ou iterável) de FlightBatch
+        template_name: Nome do arquivo .j2 na pasta templates/
+        workers: Processos para renderizar (None/1 = no processo atual)
+        chunk_size: Batches por tarefa enviada ao pool
+        on_error: Chamado com (batch, erro) quando um alerta falha; o batch
+                  é pulado. Sem ele, o erro é propagado.
+    
+    Yields:
+        Tuplas (batch, texto do alerta)
+    
+    Exemplo:
+        >>> for batch, text in render_alerts(batches, "padrao_whatsapp.j2"):
+        ...     sender.send(text)
+    """
+    def deliver(batch, result):
+        if isinstance(result, Exception):
+            if on_error is None:
+                raise result
+            on_error(batch, result)
+            return False
+        return True
+    
+    if not workers or workers <= 1:
+        for batch in batches:
+            _ensure_enriched(batch)
+            try:
+                result = render_alert(batch, template_name)
+            except Exception as e:
+                result = e
+            if deliver(batch, result):
+                yield batch, result
+        return
+    
+    iterator = iter(batches)
+    pending = deque()
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # Mantém o pool ocupado sem ler todos os batches de uma vez
+            while len(pending) < workers * 2:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                for batch in chunk:
+                    _ensure_enriched(batch)
+                pending.append((chunk, pool.submit(_render_chunk, chunk, template_name)))
+            
+            if not pending:
+                break
+            
+            chunk, future = pending.popleft()
+            for batch, result in zip(chunk, future.result()):
+                if deliver(batch, result):
+                    yield batch, result
 
 
 def main():
@@ -2,5 +2,6 @@
 Utils - Módulo de utilitários e helpers
 
 Este módulo contém:
-- helpers.py: Funções auxiliares (load_airport_data, etc)
+- helpers.py: Funções auxiliares (load_airport_data, AirportIndex, etc)
+- airport_db.py: Base binária de aeroportos (compilação + leitura via mmap)
 """
@@ -0,0 +1,208 @@
+"""
+Airport DB - Base binária de aeroportos com leitura via mmap
+
+Para a tabela mundial de IATA (~10k aeroportos), ler e parsear um JSON
+de vários MB a cada execução da CLI é lento. Este módulo:
+
+1. Compila o JSON em um arquivo binário ordenado de registros de
+   tamanho fixo (build_airport_db)
+2. Lê esse arquivo via mmap e faz busca binária pelo código IATA
+   (AirportDB), sem carregar a tabela inteira na memória
+
+Formato do arquivo (little-endian):
+- Cabeçalho: magic b'ARPT', versão, tamanho do registro, quantidade
+- Registros ordenados por código: IATA (3 bytes), cidade, país, bandeira,
+  fuso horário (UTF-8 com padding de \\0), latitude e longitude (float32)
+
+Compilar:
+    python -m app.utils.airport_db data/airports.json data/airports.bin
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+MAGIC = b'ARPT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+RECORD = struct.Struct('<3s64s48s16s40sff')
+
+# Campos de texto do registro: (chave no JSON, tamanho em bytes)
+TEXT_FIELDS = (('city', 64), ('country', 48), ('flag', 16), ('timezone', 40))
+
+
+def _encode(value: Any, size: int) -> bytes:
+    """Codifica em UTF-8 cortando no limite de um caractere (nunca no meio)."""
+    raw = str(value or '').encode('utf-8')
+    if len(raw) <= size:
+        return raw
+    return raw[:size].decode('utf-8', errors='ignore').encode('utf-8')
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b'\0').decode('utf-8')
+
+
+def build_airport_db(
+    json_path: Union[str, Path],
+    db_path: Union[str, Path]
+) -> int:
+    """
+    Compila o JSON de aeroportos no formato binário ordenado.
+    
+    O JSON segue o formato de data/airports.json, com campos extras
+    opcionais: {"GRU": {"city": "São Paulo", "flag": "🇧🇷",
+    "country": "Brasil", "timezone": "America/Sao_Paulo",
+    "lat": -23.43, "lon": -46.47}}
+    
+    Args:
+        json_path: JSON de origem
+        db_path: Arquivo binário de saída (escrita atômica)
+    
+    Returns:
+        Quantidade de aeroportos gravados
+    
+    Raises:
+        ValueError: Se algum código não tiver 3 caracteres ASCII
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        airports = json.load(f)
+    
+    records = []
+    for code, data in airports.items():
+        code = code.upper().strip()
+        if len(code) != 3 or not code.isascii():
+            raise ValueError(f"Código IATA inválido: '{code}'")
+        
+        texts = [_encode(data.get(name), size) for name, size in TEXT_FIELDS]
+        lat = float(data.get('lat') or 0.0)
+        lon = float(data.get('lon') or 0.0)
+        records.append(RECORD.pack(code.encode('ascii'), *texts, lat, lon))
+    
+    # Ordenação pelos 3 primeiros bytes (o código) = ordem da busca binária
+    records.sort(key=lambda record: record[:3])
+    
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=db_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(records)))
+            f.writelines(records)
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    return len(records)
+
+
+class AirportDB:
+    """
+    Leitor da base binária: mmap + busca binária por código IATA.
+    
+    Exemplo:
+        >>> with AirportDB("data/airports.bin") as db:
+        ...     db.get("gru")
+        {"city": "São Paulo", "flag": "🇧🇷", "country": "Brasil", ...}
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Arquivo gerado por build_airport_db
+        
+        Raises:
+            OSError: Se o arquivo não puder ser aberto
+            ValueError: Se o arquivo não estiver no formato esperado
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            magic, version, record_size, count = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic, version, record_size, count = b'', 0, 0, 0
+        
+        if (magic != MAGIC or version != VERSION or record_size != RECORD.size
+                or HEADER.size + count * record_size > len(self._mm)):
+            self._mm.close()
+            raise ValueError(f"Arquivo de aeroportos inválido: {self.path}")
+        
+        self.count = count
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _code_at(self, index: int) -> bytes:
+        offset = HEADER.size + index * RECORD.size
+        return self._mm[offset:offset + 3]
+    
+    def get(self, iata_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um aeroporto pelo código IATA.
+        
+        Returns:
+            Dict com city, flag e os campos extras preenchidos, ou None
+        """
+        try:
+            code = iata_code.upper().strip().encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._code_at(middle) < code:
+                low = middle + 1
+            else:
+                high = middle
+        
+        if low == self.count or self._code_at(low) != code:
+            return None
+        
+        _, *texts, lat, lon = RECORD.unpack_from(self._mm, HEADER.size + low * RECORD.size)
+        data = {}
+        for (name, _), raw in zip(TEXT_FIELDS, texts):
+            value = _decode(raw)
+            if value or name in ('city', 'flag'):
+                data[name] = value
+        if lat or lon:
+            data['lat'] = round(lat, 5)
+            data['lon'] = round(lon, 5)
+        return data
+    
+    def close(self) -> None:
+        """Libera o mmap."""
+        self._mm.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def main():
+    """Compila data/airports.json (ou o JSON informado) para o formato binário."""
+    from app.utils.helpers import AIRPORTS_FILE, AIRPORTS_DB_FILE
+    
+    json_path = sys.argv[1] if len(sys.argv) > 1 else AIRPORTS_FILE
+    db_path = sys.argv[2] if len(sys.argv) > 2 else AIRPORTS_DB_FILE
+    
+    count = build_airport_db(json_path, db_path)
+    print(f"✅ {count} aeroportos compilados em {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,150 @@ Funções auxiliares para carregar dados e fazer operações comuns.
 """
 
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple, Union
+from app.utils.airport_db import AirportDB
+
+
+# Caminho para o arquivo JSON de aeroportos
+# Path(__file__).parent = pasta 'app/utils/'
+# .parent.parent = app/
+# .parent.parent.parent = raiz do projeto
+AIRPORTS_FILE = Path(__file__).parent.parent.parent / "data" / "airports.json"
+
+# Versão compilada (python -m app.utils.airport_db); usada quando existir
+# e for mais nova que o JSON
+AIRPORTS_DB_FILE = AIRPORTS_FILE.with_suffix(".bin")
+
+
+def _unknown_airport(iata_code: str) -> Dict[str, str]:
+    """Dados genéricos para código não encontrado: o próprio código + ✈️."""
+    return {
+        "city": iata_code,
+        "flag": "✈️"
+    }
+
+
+class AirportIndex:
+    """
+    Índice dos aeroportos (IATA → dados), compartilhado no processo.
+    
+    Por que esta classe existe?
+    - load_airport_data era chamado 2x por batch e relia o JSON a cada vez
+    - Agora a base é aberta UMA vez (na primeira consulta, sob demanda)
+    - Se o arquivo mudar em disco (mtime diferente), é reaberto automaticamente
+    
+    Duas fontes possíveis:
+    - Base binária compilada (db_path): lida via mmap + busca binária,
+      sem parsear a tabela inteira; usada se for mais nova que o JSON
+    - JSON (path): carregado em um dict na memória
+    
+    Exemplo:
+        >>> index = AirportIndex("data/airports.json")
+        >>> index.lookup_many(["GRU", "mia"])
+        {"GRU": {"city": "São Paulo", "flag": "🇧🇷"}, "MIA": {...}}
+    """
+    
+    def __init__(self, path: Union[str, Path], db_path: Union[str, Path, None] = None):
+        """
+        Args:
+            path: Caminho do JSON de aeroportos
+            db_path: Caminho da base binária compilada (opcional)
+        """
+        self.path = Path(path)
+        self.db_path = Path(db_path) if db_path else None
+        self._source = {}
+        self._mtimes: Optional[Tuple[Optional[float], Optional[float]]] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _mtime(path: Optional[Path]) -> Optional[float]:
+        if path is None:
+            return None
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+    
+    def _refresh(self):
+        """
+        Abre a base se ainda não foi aberta ou se algum arquivo mudou.
+        
+        Returns:
+            Objeto com .get(código) → dados ou None (dict ou AirportDB)
+        """
+        mtimes = (self._mtime(self.path), self._mtime(self.db_path))
+        if mtimes == self._mtimes:
+            return self._source
+        
+        with self._lock:
+            if mtimes == self._mtimes:
+                return self._source
+            
+            json_mtime, db_mtime = mtimes
+            source = None
+            
+            # Base binária: preferida quando não está desatualizada
+            if db_mtime is not None and (json_mtime is None or db_mtime >= json_mtime):
+                try:
+                    source = AirportDB(self.db_path)
+                except (OSError, ValueError):
+                    source = None
+            
+            if source is None:
+                source = {}
+                if json_mtime is not None:
+                    try:
+                        with open(self.path, "r", encoding="utf-8") as f:
+                            source = json.load(f)
+                    except (OSError, json.JSONDecodeError):
+                        # JSON mal formatado: mantém vazio até o arquivo mudar
+                        source = {}
+            
+            # A base anterior (se mmap) é liberada pelo coletor quando
+            # nenhuma consulta em andamento a estiver usando
+            self._source = source
+            self._mtimes = mtimes
+            return source
+    
+    def get(self, iata_code: str) -> Dict[str, str]:
+        """
+        Dados de um aeroporto (ver load_airport_data).
+        
+        Returns:
+            {"city": ..., "flag": ...} ou dados genéricos se não encontrado
+        """
+        code = iata_code.upper().strip()
+        data = self._refresh().get(code)
+        return dict(data) if data else _unknown_airport(code)
+    
+    def lookup_many(self, codes: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Busca vários códigos de uma vez (uma única checagem do arquivo).
+        
+        Args:
+            codes: Códigos IATA (maiúsculas ou minúsculas)
+        
+        Returns:
+            Dict código normalizado → {"city": ..., "flag": ...}
+        """
+        airports = self._refresh()
+        result = {}
+        for iata_code in codes:
+            code = iata_code.upper().strip()
+            data = airports.get(code)
+            result[code] = dict(data) if data else _unknown_airport(code)
+        return result
+
+
+_airport_index = AirportIndex(AIRPORTS_FILE, AIRPORTS_DB_FILE)
+
+
+def get_airport_index() -> AirportIndex:
+    """Retorna o índice de aeroportos único do processo."""
+    return _airport_index
 
 
 def load_airport_data(iata_code: str) -> Dict[str, str]:
@@ -19,7 +161,7 @@ def load_airport_data(iata_code: str) -> Dict[str, str]:
     - Permite adicionar novos aeroportos sem alterar código
     
     Como funciona:
-    1. Lê o arquivo data/airports.json
+    1. Consulta o índice em memória (data/airports.json lido uma vez)
     2. Busca o código IATA (case insensitive: "gru" vira "GRU")
     3. Retorna {"city": "São Paulo", "flag": "🇧🇷"}
     4. Se não encontrar, retorna dados genéricos
@@ -47,45 +189,7 @@ def load_airport_data(iata_code: str) -> Dict[str, str]:
         >>> load_airport_data("XYZ")  # Código desconhecido
         {"city": "XYZ", "flag": "✈️"}
     """
-    # Caminho para o arquivo JSON de aeroportos
-    # Path(__file__).parent = pasta 'app/utils/'
-    # .parent.parent = app/
-    # .parent.parent.parent = raiz do projeto
-    airports_file = Path(__file__).parent.parent.parent / "data" / "airports.json"
-    
-    # Normaliza o código para maiúsculas (GRU, gru, Gru → GRU)
-    iata_code_upper = iata_code.upper().strip()
-    
-    try:
-        # Tenta abrir e ler o arquivo JSON
-        with open(airports_file, "r", encoding="utf-8") as f:
-            airports_data = json.load(f)
-        
-        # Busca o código no dicionário
-        if iata_code_upper in airports_data:
-            return airports_data[iata_code_upper]
-        else:
-            # Código não encontrado - retorna dados genéricos
-            return {
-                "city": iata_code_upper,
-                "flag": "✈️"
-            }
-    
-    except FileNotFoundError:
-        # Arquivo airports.json não existe
-        # Retorna dados genéricos para não quebrar o código
-        return {
-            "city": iata_code_upper,
-            "flag": "✈️"
-        }
-    
-    except json.JSONDecodeError:
-        # JSON mal formatado
-        # Retorna dados genéricos
-        return {
-            "city": iata_code_upper,
-            "flag": "✈️"
-        }
+    return get_airport_index().get(iata_code)
 
 
 def get_airport_info(iata_code: str) -> tuple[str, str]:
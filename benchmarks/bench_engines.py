@@ -0,0 +1,94 @@
+"""
+Benchmark das engines de process_search_results (python x columnar).
+
+Gera N voos sintéticos no formato da API (Route aninhado, custos como
+string, LastSeen ISO) e mede cada engine com e sem filtros, conferindo
+que as duas devolvem os mesmos batches.
+
+Execute:
+  python benchmarks/bench_engines.py            # 200k voos
+  python benchmarks/bench_engines.py 50000      # tamanho customizado
+"""
+
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.seats_client import SeatsAeroClient
+
+AIRPORTS = ['GRU', 'GIG', 'MIA', 'LIS', 'DOH', 'JFK', 'CDG', 'LHR']
+SOURCES = ['united', 'aeroplan', 'qatar', 'smiles', 'flyingblue', 'american']
+AIRLINES = ['United', 'Qatar Airways', 'TAP', 'Air France', 'American Airlines', 'LATAM', None]
+
+SCENARIOS = [
+    ("sem filtros", {}),
+    ("--airline qatar", {'airline_filter': 'qatar'}),
+    ("--program aeroplan --max-cost 80000", {'program_filter': 'aeroplan', 'max_cost_filter': 80000}),
+    ("--direct --cabin economy", {'direct_only': True, 'requested_cabin': 'economy'}),
+]
+
+
+def make_flights(size: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    flights = []
+    for _ in range(size):
+        flight = {
+            'Route': {'OriginAirport': rng.choice(AIRPORTS), 'DestinationAirport': rng.choice(AIRPORTS)},
+            'Source': rng.choice(SOURCES),
+            'Date': f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'YMileageCost': str(rng.choice([0, 30000, 45000])),
+            'JMileageCost': str(rng.choice([0, 55000, 77000, 120000])),
+            'FMileageCost': '0',
+            'RemainingSeats': rng.randint(0, 9),
+            'LastSeen': (now - timedelta(hours=rng.randint(0, 96))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'Direct': rng.random() < 0.5
+        }
+        airline = rng.choice(AIRLINES)
+        if airline:
+            flight['Airline'] = airline
+        flights.append(flight)
+    return flights
+
+
+def best_of(func, repeat: int = 3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def signature(batches):
+    return [(b.origin_code, b.dest_code, b.airline, b.program, b.min_cost, b.max_cost, b.dates_outbound)
+            for b in batches]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    logging.disable(logging.CRITICAL)  # resumo de companhias fora da medição
+    flights = make_flights(size)
+    
+    print(f"\n📊 Benchmark das engines ({size:,} voos, melhor de 3)\n")
+    print(f"  {'Cenário':<38} {'python':>9} {'columnar':>9} {'ganho':>7}")
+    
+    for label, filters in SCENARIOS:
+        expected, python_time = best_of(lambda: SeatsAeroClient.process_search_results(flights, **filters))
+        actual, columnar_time = best_of(
+            lambda: SeatsAeroClient.process_search_results(flights, engine='columnar', **filters)
+        )
+        assert signature(actual) == signature(expected), f"Engines divergem em: {label}"
+        print(f"  {label:<38} {python_time:8.3f}s {columnar_time:8.3f}s {python_time / columnar_time:6.2f}x")
+    
+    print("\n  ✅ Mesmos batches nas duas engines\n")
+
+
+if __name__ == "__main__":
+    main()
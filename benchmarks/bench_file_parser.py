@@ -0,0 +1,103 @@
+"""
+Benchmark do parser de input.txt (tokenizador linear x regex antiga).
+
+Gera um arquivo sintético com N blocos (padrão: 50.000), com NOTE e
+DATES longos, e mede:
+1. parse_file_batch() completo (tokenizador + datas + FlightBatch)
+2. Só a separação em chaves: tokenize_block() x regex com lookahead,
+   incluindo a escala com NOTE longa (linear x quadrática)
+
+Execute:
+  python benchmarks/bench_file_parser.py            # 50k blocos
+  python benchmarks/bench_file_parser.py 5000       # tamanho customizado
+"""
+
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.file_service import parse_file_batch, tokenize_block
+
+
+# Implementação anterior (para comparação)
+LEGACY_PATTERN = r'([A-Z_]+):\s*((?:(?![A-Z_]+:).)*)'
+
+MONTHS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+
+def legacy_tokenize(content: str) -> dict:
+    data = {}
+    for key, value in re.findall(LEGACY_PATTERN, content, re.DOTALL):
+        value = value.strip()
+        if value:
+            data[key.strip().upper()] = value
+    return data
+
+
+def make_block(i: int) -> str:
+    """Bloco com 12 meses de datas e uma NOTE longa."""
+    dates = "\n".join(
+        f"{month} 2026: " + ", ".join(f"{day:02d} ({(day + i) % 9 + 1})" for day in range(1, 29, 2))
+        for month in MONTHS
+    )
+    note = " ".join(["Taxas em torno de R$ 600, melhor disponibilidade às quartas."] * 20)
+    return (
+        f"ROUTE: GRU A{i % 100:02d}\n"
+        f"AIRLINE: United\n"
+        f"PROGRAM: MileagePlus\n"
+        f"COST: 77k\n"
+        f"CABIN: Executiva\n"
+        f"NOTE: {note}\n"
+        f"DATES_OUT:\n{dates}\n"
+        f"DATES_IN:\n{dates}\n"
+    )
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38} {elapsed:9.3f}s")
+    return result, elapsed
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    
+    print(f"\n📊 Benchmark do parser ({blocks:,} blocos)\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "input.txt"
+        with open(input_file, "w", encoding="utf-8") as f:
+            for i in range(blocks):
+                if i:
+                    f.write("---\n")
+                f.write(make_block(i))
+        size_mb = input_file.stat().st_size / 1024 / 1024
+        print(f"  Arquivo: {size_mb:.1f} MB\n")
+        
+        batches, elapsed = timed("parse_file_batch()", lambda: parse_file_batch(str(input_file)))
+        print(f"  {'':<38} {len(batches) / elapsed:8.0f} blocos/s\n")
+    
+    # Só a tokenização, em uma amostra (a regex antiga é lenta demais para 50k)
+    sample = [make_block(i) for i in range(min(blocks, 2_000))]
+    new, new_time = timed(f"tokenize_block() x{len(sample)}", lambda: [tokenize_block(b) for b in sample])
+    old, old_time = timed(f"regex com lookahead x{len(sample)}", lambda: [legacy_tokenize(b) for b in sample])
+    assert new == old, "Tokenizador diverge da regex antiga!"
+    
+    # Escala: NOTE com sequências longas de [A-Z_] (ex: linhas "_____")
+    print("\n  NOTE com sequência [A-Z_] de N caracteres:")
+    for length in (1_000, 4_000, 16_000):
+        block = f"ROUTE: GRU MIA\nNOTE: {'_' * length}\nCOST: 77k\n"
+        _, new_time = timed(f"  tokenize_block() N={length:,}", lambda: tokenize_block(block))
+        _, old_time = timed(f"  regex com lookahead N={length:,}", lambda: legacy_tokenize(block))
+    
+    print("\n  ✅ Mesmo resultado; tempo do tokenizador cresce linearmente\n")
+
+if __name__ == "__main__":
+    main()
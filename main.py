@@ -2,28 +2,41 @@
 Mileage Bot - Main Entry Point
 
 CLI para gerar alertas de passagens.
-Modos: 'file' (lê input.txt) ou 'api' (busca em Seats.aero)
+Modos: 'file' (lê input.txt), 'api' (busca em Seats.aero) ou 'daemon'
+(monitora rotas continuamente, enviando só novidades)
 
 Execute: 
   python main.py                           # Modo file (padrão)
   python main.py --mode api --origin GRU --dest MIA
+  python main.py --mode daemon --routes-file routes.txt
 """
 
 import argparse
+import logging
+import time
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 from rich.console import Console
-from app.services.file_service import parse_file_batch
-from app.ui.renderer import render_alert
-from app.services.seats_client import SeatsAeroClient
+from rich.logging import RichHandler
+from app.services.file_service import parse_file_parallel, parse_routes_file
+from app.ui.renderer import render_alerts, get_environment
+from app.services.seats_client import SeatsAeroClient, FilterPlan
+from app.services.rate_limiter import TokenBucket
+from app.services.scheduler import PollingScheduler
+from app.utils.helpers import get_airport_index
+from app.services.response_cache import ResponseCache
+from app.services.availability_store import AvailabilityStore
+from app.services.change_detector import ChangeDetector
+from app.core.config import Config
 
 
-def mode_file(console: Console):
-    """Modo FILE: Lê input.txt e gera alertas."""
+def mode_file(console: Console, workers: int = None):
+    """Modo FILE: Lê input.txt e gera alertas (com --workers, parse e render em paralelo)."""
     
     console.print("[bold yellow]📄 Modo FILE - Lendo input.txt...[/bold yellow]\n")
     
     try:
-        batches = parse_file_batch("input.txt")
+        batches = list(parse_file_parallel("input.txt", workers=workers))
         console.print(f"[bold green]✅ {len(batches)} voo(s) encontrado(s)![/bold green]\n")
     except FileNotFoundError:
         console.print("[bold red]❌ Arquivo 'input.txt' não encontrado![/bold red]\n")
@@ -32,16 +45,32 @@ def mode_file(console: Console):
         console.print(f"[bold red]❌ Erro ao parsear:[/bold red] {e}\n")
         return
     
-    render_batches(console, batches)
+    render_batches(console, batches, workers=workers)
 
 
 def mode_api(console: Console, args):
     """Modo API: Busca em Seats.aero e gera alertas."""
     
+    routes = None
+    if args.routes_file:
+        try:
+            routes = parse_routes_file(args.routes_file)
+        except FileNotFoundError:
+            console.print(f"[bold red]❌ Arquivo '{args.routes_file}' não encontrado![/bold red]\n")
+            return
+        except ValueError as e:
+            console.print(f"[bold red]❌ Erro ao ler rotas:[/bold red] {e}\n")
+            return
+    
     console.print(f"[bold yellow]🔌 Modo API - Buscando em Seats.aero...[/bold yellow]\n")
-    console.print(f"  • Origem: {args.origin}")
-    console.print(f"  • Destino: {args.dest}")
+    if routes:
+        console.print(f"  • Rotas: {len(routes)} (de {args.routes_file})")
+    else:
+        console.print(f"  • Origem: {args.origin}")
+        console.print(f"  • Destino: {args.dest}")
     console.print(f"  • Período: Próximos {args.days} dias")
+    if args.chunk_days and args.chunk_days < args.days:
+        console.print(f"  • Janelas: {args.chunk_days} dias em paralelo")
     console.print(f"  • Classe: {args.cabin}")
     console.print(f"  • Max staleness: {args.max_staleness}h")
     if args.direct:
@@ -50,32 +79,72 @@ def mode_api(console: Console, args):
         console.print(f"  • Programa: {args.program}")
     if args.airline:
         console.print(f"  • Companhia: {args.airline}")
+    if args.engine != 'python':
+        console.print(f"  • Engine: {args.engine}")
+    cache = build_cache(args)
+    if args.offline:
+        console.print(f"  • Offline: base local {args.store} (sem requisições)")
+    elif args.stream:
+        console.print(f"  • Streaming: respostas comprimidas, parseadas voo a voo (sem cache)")
+    elif cache:
+        console.print(f"  • Cache: {int(cache.ttl_seconds // 60)} min")
+    else:
+        console.print(f"  • Cache: desativado")
+    if args.store and not args.offline:
+        console.print(f"  • Gravando em: {args.store}")
     console.print()
     
-    # Buscar na API
+    # Buscar na API (ou na base local com --offline)
+    errors = {}
     try:
-        console.print("[cyan]🔍 Conectando à API...[/cyan]\n")
-        
-        with SeatsAeroClient() as client:
-            # IMPORTANTE: Passar apenas parâmetros aceitos pela API
-            # Filtros de cliente (airline, direct, staleness, program)
-            # serão aplicados localmente via process_search_results
-            results = client.search_availability(
-                origin=args.origin,
-                destination=args.dest,
-                days=args.days,
-                cabin_class=args.cabin
+        with ExitStack() as stack:
+            store = stack.enter_context(AvailabilityStore(args.store)) if args.store else None
+            
+            if args.offline:
+                # Mesmos voos crus da API, lidos da base: só os filtros mudam
+                date_start = datetime.now().date()
+                flights = store.iter_flights(
+                    args.cabin,
+                    routes=routes or [(args.origin, args.dest)],
+                    date_start=date_start.isoformat(),
+                    date_end=(date_start + timedelta(days=args.days)).isoformat()
+                )
+                source_label = "lido(s) da base local"
+            else:
+                console.print("[cyan]🔍 Conectando à API...[/cyan]\n")
+                client = stack.enter_context(SeatsAeroClient(cache=cache, timeout=args.timeout))
+                flights, errors = fetch_flights(console, client, args, routes)
+                if store:
+                    # Grava em lotes enquanto o pipeline consome os voos
+                    flights = store.record(flights, args.cabin)
+                source_label = "retornado(s) pela API"
+            
+            stats = {'received': 0}
+            
+            # Processar e agrupar (AQUI aplicamos os filtros localmente)
+            console.print("[cyan]🔄 Buscando, filtrando e agrupando...[/cyan]\n")
+            batches = SeatsAeroClient.process_search_results(
+                count_flights(flights, stats),
+                max_staleness_hours=args.max_staleness,
+                direct_only=args.direct,
+                airline_filter=args.airline,
+                program_filter=args.program,
+                requested_cabin=args.cabin,  # Importante: para extrair custo correto
+                max_cost_filter=args.max_cost,  # Novo: filtro de custo máximo
+                engine=args.engine
             )
         
         console.print(f"[green]✅ Busca realizada![/green]\n")
         
-        # Extrair lista de voos
-        if isinstance(results, dict):
-            flights_list = results.get('data', results.get('results', results.get('flights', [])))
-        else:
-            flights_list = results
+        # Rotas que falharam não entram no snapshot: as impressões da
+        # varredura anterior continuam valendo (senão a próxima varredura
+        # alertaria tudo dessas rotas como novo)
+        scanned = [
+            (origin, dest) for origin, dest in (routes or [(args.origin, args.dest)])
+            if (origin.upper(), dest.upper()) not in errors
+        ]
         
-        if not flights_list:
+        if not stats['received']:
             console.print("[bold yellow]⚠️  Nenhum voo encontrado com esses filtros.[/bold yellow]")
             console.print("\n💡 Dica: Tente:")
             console.print("  • Aumentar o período (--days 90 ou --days 365)")
@@ -83,31 +152,28 @@ def mode_api(console: Console, args):
             console.print("  • Remover filtro de companhia")
             console.print("  • Remover filtro de programa")
             console.print("  • Tentar outra rota\n")
+            if args.only_changes:
+                # Rota que ficou sem voos sai do snapshot (se voltarem, são novidade)
+                render_changes(console, [], ChangeDetector(args.snapshot), scanned)
             return
         
-        console.print(f"[green]✅ {len(flights_list)} voo(s) retornado(s) pela API[/green]\n")
-        
-        # Processar e agrupar (AQUI aplicamos os filtros localmente)
-        console.print("[cyan]🔄 Processando, filtrando e agrupando...[/cyan]\n")
-        batches = SeatsAeroClient.process_search_results(
-            flights_list,
-            max_staleness_hours=args.max_staleness,
-            direct_only=args.direct,
-            airline_filter=args.airline,
-            program_filter=args.program,
-            requested_cabin=args.cabin,  # Importante: para extrair custo correto
-            max_cost_filter=args.max_cost  # Novo: filtro de custo máximo
-        )
+        console.print(f"[green]✅ {stats['received']} voo(s) {source_label}[/green]\n")
         
         if not batches:
             console.print("[bold yellow]⚠️  Nenhum batch criado após filtros.[/bold yellow]")
             console.print("Todos os voos foram descartados pelos filtros aplicados.\n")
+            if args.only_changes:
+                # Rotas sem resultado saem do snapshot (se voltarem, são novidade)
+                render_changes(console, [], ChangeDetector(args.snapshot), scanned)
             return
         
         console.print(f"[green]✅ Agrupados em {len(batches)} batch(es) após filtros![/green]\n")
         
-        render_batches(console, batches)
-        
+        if args.only_changes:
+            render_changes(console, batches, ChangeDetector(args.snapshot), scanned)
+        else:
+            render_batches(console, batches)
+    
     except ValueError as e:
         console.print(f"[bold red]{e}[/bold red]\n")
         return
@@ -119,30 +185,84 @@ def mode_api(console: Console, args):
         return
 
 
-def render_batches(console: Console, batches: list):
-    """Renderiza e imprime todos os batches."""
+def fetch_flights(console: Console, client: SeatsAeroClient, args, routes=None):
+    """
+    Busca os voos crus na API (uma rota em streaming ou várias em paralelo).
+    
+    Returns:
+        Tupla (voos, erros): erros = {(origem, destino): exceção} das rotas
+        que falharam no multi-rota (uma rota só levanta a exceção)
+    """
+    # IMPORTANTE: Passar apenas parâmetros aceitos pela API
+    # Filtros de cliente (airline, direct, staleness, program)
+    # serão aplicados localmente via process_search_results
+    #
+    if routes:
+        # Multi-rota: buscas em paralelo, resultados juntos
+        # em UMA passada do process_search_results
+        flights, errors = client.search_many(
+            routes,
+            days=args.days,
+            cabin_class=args.cabin,
+            chunk_days=args.chunk_days,
+            stream=args.stream
+        )
+        for (origin, dest), error in errors.items():
+            console.print(f"[red]⚠️  {origin} → {dest}: {error}[/red]")
+        return flights, errors
+    
+    # A busca é paginada em streaming: a filtragem começa na
+    # página 1 enquanto as próximas ainda estão sendo baixadas
+    return client.iter_search_results(
+        origin=args.origin,
+        destination=args.dest,
+        days=args.days,
+        cabin_class=args.cabin,
+        chunk_days=args.chunk_days,
+        stream=args.stream
+    ), {}
+
+
+def build_cache(args):
+    """
+    Cria o cache em disco das respostas do /search (ou None com --no-cache).
+    
+    O TTL é o menor entre --cache-ttl e --max-staleness: uma resposta em
+    cache nunca é mais velha do que a idade máxima aceita para os voos.
+    """
+    if args.no_cache:
+        return None
+    
+    ttl_seconds = args.cache_ttl * 60
+    if args.max_staleness:
+        ttl_seconds = min(ttl_seconds, args.max_staleness * 3600)
+    
+    return ResponseCache(ttl_seconds=ttl_seconds)
+
+
+def count_flights(flights, stats: dict):
+    """Repassa os voos recebidos da API contando quantos chegaram."""
+    for flight in flights:
+        stats['received'] += 1
+        yield flight
+
+
+def render_batches(console: Console, batches: list, workers: int = None):
+    """Renderiza e imprime todos os batches (streaming, ver render_alerts)."""
+    
+    def report_error(batch, error):
+        console.print(f"[bold red]❌ Erro ao renderizar {batch.origin_code} → {batch.dest_code}:[/bold red] {error}\n")
     
-    for i, batch in enumerate(batches, 1):
-        console.print(f"[bold cyan]🎯 Processando voo {i}/{len(batches)}...[/bold cyan]")
+    rendered = 0
+    alerts = render_alerts(batches, "padrao_whatsapp.j2", workers=workers, on_error=report_error)
+    
+    for i, (batch, alert_text) in enumerate(alerts, 1):
+        rendered += 1
+        console.print(f"[bold cyan]🎯 Voo {i}/{len(batches)}[/bold cyan]")
         console.print(f"  • Rota: {batch.origin_code} → {batch.dest_code}")
         console.print(f"  • Cia: {batch.airline}")
-        
-        # Se ainda não foi enriquecido, enriquecer agora
-        if not batch.origin:
-            try:
-                batch.enrich_airport_data()
-            except Exception as e:
-                console.print(f"[red]⚠️  Erro ao enriquecer: {e}[/red]")
-        
         console.print()
         
-        # Renderizar
-        try:
-            alert_text = render_alert(batch, "padrao_whatsapp.j2")
-        except Exception as e:
-            console.print(f"[bold red]❌ Erro ao renderizar:[/bold red] {e}\n")
-            continue
-        
         # Separador e texto puro
         print("." * 70)
         print(alert_text)
@@ -151,10 +271,149 @@ def render_batches(console: Console, batches: list):
     
     # Resumo final
     console.print("=" * 70)
-    console.print(f"✅ {len(batches)} alerta(s) gerado(s) com sucesso!")
+    console.print(f"✅ {rendered} alerta(s) gerado(s) com sucesso!")
     console.print("=" * 70 + "\n")
 
 
+def render_changes(console: Console, batches: list, detector: ChangeDetector, routes=None) -> int:
+    """
+    Renderiza só os batches novos/melhorados desde a última varredura
+    (ver ChangeDetector) e grava o snapshot depois do envio.
+    
+    Returns:
+        Quantidade de batches com novidade
+    """
+    changes = detector.diff(batches)
+    
+    if changes:
+        console.print(f"[green]🔔 {len(changes)} de {len(batches)} batch(es) com novidades[/green]\n")
+        for change in changes:
+            change.batch.notes = f"{change.batch.notes} | {change.summary()}"
+        render_batches(console, [change.batch for change in changes])
+    elif batches:
+        console.print("[bold yellow]💤 Nada novo desde a última varredura.[/bold yellow]\n")
+    
+    detector.update(batches, routes)
+    detector.save()
+    return len(changes)
+
+
+def mode_daemon(console: Console, args):
+    """
+    Modo DAEMON: monitora as rotas continuamente, enviando só novidades.
+    
+    Cliente HTTP, índice de aeroportos, templates compilados, FilterPlan
+    e snapshot ficam carregados entre as consultas. As rotas saem de um
+    PollingScheduler (quentes mais vezes, paradas com backoff) e TODAS as
+    requisições passam por um TokenBucket com o orçamento diário (--budget).
+    """
+    try:
+        routes = parse_routes_file(args.routes_file) if args.routes_file else [(args.origin.upper(), args.dest.upper())]
+        scheduler = PollingScheduler(
+            routes,
+            interval=args.interval * 60,
+            max_interval=args.max_interval * 60
+        )
+    except FileNotFoundError:
+        console.print(f"[bold red]❌ Arquivo '{args.routes_file}' não encontrado![/bold red]\n")
+        return
+    except ValueError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]\n")
+        return
+    
+    console.print(f"[bold yellow]🛰️  Modo DAEMON - Monitorando {len(routes)} rota(s)...[/bold yellow]\n")
+    console.print(f"  • Intervalo: {args.interval} min (até {args.max_interval} min em rotas paradas)")
+    console.print(f"  • Orçamento: {args.budget} requisições/dia")
+    console.print(f"  • Snapshot: {args.snapshot or Config.SNAPSHOT_FILE}")
+    console.print("  • Ctrl+C para parar\n")
+    
+    # Orçamento global: ritmo médio de --budget/dia, com rajada de uma
+    # varredura inicial (uma requisição por rota)
+    budget = TokenBucket(
+        rate=min(Config.SEATS_RATE_LIMIT, args.budget / 86400),
+        capacity=min(args.budget, len(routes))
+    )
+    plan = FilterPlan(
+        max_staleness_hours=args.max_staleness,
+        direct_only=args.direct,
+        airline_filter=args.airline,
+        program_filter=args.program,
+        max_cost_filter=args.max_cost
+    )
+    detector = ChangeDetector(args.snapshot)
+    
+    # Aquece índice de aeroportos (abre a base e busca as rotas agendadas)
+    # e templates antes da primeira consulta
+    get_airport_index().lookup_many(code for route in routes for code in route)
+    get_environment().get_template("padrao_whatsapp.j2")
+    
+    polls = 0
+    with ExitStack() as stack:
+        # Sem cache de respostas: cada consulta precisa ver a API atual
+        try:
+            client = stack.enter_context(SeatsAeroClient(rate_limiter=budget, timeout=args.timeout))
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]\n")
+            return
+        store = stack.enter_context(AvailabilityStore(args.store)) if args.store else None
+        
+        try:
+            while not args.max_polls or polls < args.max_polls:
+                state = scheduler.next_route()
+                origin, destination = state.route
+                polls += 1
+                started = time.perf_counter()
+                
+                try:
+                    flights = client.iter_search_results(
+                        origin=origin,
+                        destination=destination,
+                        days=args.days,
+                        cabin_class=args.cabin,
+                        chunk_days=args.chunk_days,
+                        stream=args.stream
+                    )
+                    if store:
+                        flights = store.record(flights, args.cabin)
+                    batches = SeatsAeroClient.process_search_results(
+                        flights,
+                        requested_cabin=args.cabin,
+                        engine=args.engine,
+                        filter_plan=plan
+                    )
+                    changed = render_changes(console, batches, detector, [state.route])
+                except (ValueError, ConnectionError) as e:
+                    # Erro conta como "sem novidade": a rota recua
+                    console.print(f"[red]⚠️  {origin} → {destination}: {e}[/red]")
+                    changed = 0
+                except Exception as e:
+                    # Qualquer outra falha (SQLite do --store, disco do snapshot,
+                    # HTTP...) também só recua a rota: o daemon continua
+                    console.print(f"[bold red]❌ {origin} → {destination}: erro inesperado ({type(e).__name__}): {e}[/bold red]")
+                    changed = 0
+                
+                scheduler.report(state, bool(changed))
+                console.print(
+                    f"[dim]🛰️  {origin} → {destination}: {changed} novidade(s) em "
+                    f"{time.perf_counter() - started:.1f}s; próxima em {state.interval / 60:.1f} min[/dim]"
+                )
+        except KeyboardInterrupt:
+            console.print("\n[bold yellow]⏹️  Daemon interrompido.[/bold yellow]\n")
+
+
+def setup_logging(console: Console, verbose: bool = False):
+    """Envia os logs do app para o console rich (DEBUG com --verbose)."""
+    handler = RichHandler(console=console, show_time=False, show_path=False)
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(message)s",
+        handlers=[handler]
+    )
+    # Bibliotecas HTTP ficam em WARNING mesmo no modo verbose
+    for name in ('urllib3', 'httpx', 'httpcore'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
 def main():
     # Configurar argparse
     parser = argparse.ArgumentParser(
@@ -167,14 +426,21 @@ Exemplos:
   python main.py --mode api --origin GRU --dest MIA --days 365 --cabin economy --direct
   python main.py --mode api --origin GRU --dest DOH --days 180 --program "Privilege Club"
   python main.py --mode api --origin GRU --dest MIA --airline United --days 90
+  python main.py --mode api --routes-file routes.txt --days 180
+  python main.py --mode api --origin GRU --dest DOH --days 365 --chunk-days 30
+  python main.py --mode api --origin GRU --dest MIA --store      # grava na base local
+  python main.py --mode api --origin GRU --dest MIA --offline --max-cost 80000
+  python main.py --mode api --routes-file routes.txt --only-changes   # só novidades
+  python main.py --mode daemon --routes-file routes.txt --interval 30 --budget 1000
+  python main.py --workers 4                        # input.txt grande, 4 processos
         """
     )
     
     parser.add_argument(
         '--mode',
-        choices=['file', 'api'],
+        choices=['file', 'api', 'daemon'],
         default='file',
-        help='Modo de operação: file (lê input.txt) ou api (busca Seats.aero)'
+        help='Modo de operação: file (lê input.txt), api (busca Seats.aero) ou daemon (monitora rotas)'
     )
     
     parser.add_argument(
@@ -189,6 +455,12 @@ Exemplos:
         help='Código IATA destino (ex: MIA) - Obrigatório no modo API'
     )
     
+    parser.add_argument(
+        '--routes-file',
+        type=str,
+        help='Arquivo com várias rotas (uma "ORIGEM DESTINO" por linha), buscadas em paralelo'
+    )
+    
     parser.add_argument(
         '--days',
         type=int,
@@ -196,6 +468,26 @@ Exemplos:
         help='Quantos dias para frente buscar (padrão: 60, máx: 365)'
     )
     
+    parser.add_argument(
+        '--chunk-days',
+        type=int,
+        default=None,
+        help='Divide --days em janelas desse tamanho buscadas em paralelo (ex: 30 para buscas anuais)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=Config.SEATS_TIMEOUT,
+        help=f'Timeout de cada requisição em segundos (padrão: {Config.SEATS_TIMEOUT:g})'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Baixa o /search comprimido e processa voo a voo (pouca memória em respostas grandes; ignora o cache)'
+    )
+    
     parser.add_argument(
         '--cabin',
         choices=['economy', 'business', 'first'],
@@ -224,6 +516,96 @@ Exemplos:
         help='Máximo de horas desde última atualização na API (padrão: 48h)'
     )
     
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=30,
+        help='Minutos que uma resposta da API fica em cache (padrão: 30, limitado por --max-staleness)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignora o cache em disco e sempre consulta a API'
+    )
+    
+    parser.add_argument(
+        '--store',
+        nargs='?',
+        const=str(Config.AVAILABILITY_DB),
+        default=None,
+        metavar='ARQUIVO',
+        help=f'Grava os voos recebidos na base local SQLite (padrão: {Config.AVAILABILITY_DB})'
+    )
+    
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Usa a base local (--store) em vez da API: reavalia filtros sem novas requisições'
+    )
+    
+    parser.add_argument(
+        '--only-changes',
+        action='store_true',
+        help='Envia só batches com datas novas, mais assentos ou custo menor que na última varredura'
+    )
+    
+    parser.add_argument(
+        '--snapshot',
+        type=str,
+        default=None,
+        metavar='ARQUIVO',
+        help=f'Snapshot usado por --only-changes (padrão: {Config.SNAPSHOT_FILE})'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=int,
+        default=30,
+        help='Modo daemon: minutos entre consultas de cada rota (cai pela metade em rotas com novidades; padrão: 30)'
+    )
+    
+    parser.add_argument(
+        '--max-interval',
+        type=int,
+        default=240,
+        help='Modo daemon: maior intervalo em minutos para rotas sem mudanças (padrão: 240)'
+    )
+    
+    parser.add_argument(
+        '--budget',
+        type=int,
+        default=1000,
+        help='Modo daemon: máximo de requisições à API por dia (padrão: 1000)'
+    )
+    
+    parser.add_argument(
+        '--max-polls',
+        type=int,
+        default=None,
+        help='Modo daemon: para depois de N consultas (padrão: sem limite)'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=['python', 'columnar'],
+        default='python',
+        help='Motor de filtro/agrupamento: python (padrão) ou columnar (NumPy, para varreduras grandes)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Modo file: processos para parsear e renderizar em paralelo (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Logs detalhados (amostra por voo de como a companhia foi detectada)'
+    )
+    
     parser.add_argument(
         '--program',
         type=str,
@@ -239,27 +621,49 @@ Exemplos:
     args = parser.parse_args()
     
     console = Console()
+    setup_logging(console, args.verbose)
     
     # Banner
     console.print("\n" + "=" * 70)
     console.print("🛫 MILEAGE BOT - Gerador de Alertas de Passagens")
     console.print("=" * 70 + "\n")
     
-    # Validar argumentos para modo API
-    if args.mode == 'api':
-        if not args.origin or not args.dest:
-            console.print("[bold red]❌ Modo API requer --origin e --dest![/bold red]\n")
+    # Validar argumentos para modo API (e daemon, que usa as mesmas rotas)
+    if args.mode in ('api', 'daemon'):
+        if not args.routes_file and (not args.origin or not args.dest):
+            console.print("[bold red]❌ Modo API requer --origin e --dest (ou --routes-file)![/bold red]\n")
             parser.print_help()
             return
         
+        # --offline lê da base padrão se --store não indicar outra
+        if args.offline and not args.store:
+            args.store = str(Config.AVAILABILITY_DB)
+        
         # Validar days
         if args.days < 1 or args.days > 365:
             console.print("[bold red]❌ --days deve estar entre 1 e 365![/bold red]\n")
             return
         
-        mode_api(console, args)
+        if args.chunk_days is not None and args.chunk_days < 1:
+            console.print("[bold red]❌ --chunk-days deve ser pelo menos 1![/bold red]\n")
+            return
+        
+        if args.mode == 'daemon':
+            if args.offline:
+                console.print("[bold red]❌ --offline não se aplica ao modo daemon![/bold red]\n")
+                return
+            if args.budget < 1 or args.interval < 1 or args.max_interval < args.interval:
+                console.print("[bold red]❌ Use --budget >= 1 e 1 <= --interval <= --max-interval![/bold red]\n")
+                return
+            mode_daemon(console, args)
+        else:
+            mode_api(console, args)
     else:
-        mode_file(console)
+        if args.workers is not None and args.workers < 1:
+            console.print("[bold red]❌ --workers deve ser pelo menos 1![/bold red]\n")
+            return
+        
+        mode_file(console, args.workers)
 
 
 if __name__ == "__main__":
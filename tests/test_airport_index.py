@@ -0,0 +1,167 @@
+"""
+Teste do índice de aeroportos em memória (AirportIndex).
+
+Valida leitura única do JSON, recarga quando o arquivo muda
+e os fallbacks de load_airport_data.
+"""
+import sys
+import os
+import json
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.models import FlightBatch
+from app.utils import helpers
+from app.utils.helpers import AirportIndex
+from app.utils.airport_db import AirportDB, build_airport_db
+
+
+def write_airports(path, data, mtime):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_index_reads_file_once(tmp_path, monkeypatch):
+    """Teste 1: 500 batches enriquecidos = 1 leitura do arquivo."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Leitura única do airports.json")
+    print("=" * 70)
+    
+    airports_file = tmp_path / "airports.json"
+    write_airports(airports_file, {
+        "GRU": {"city": "São Paulo", "flag": "🇧🇷"},
+        "MIA": {"city": "Miami", "flag": "🇺🇸"}
+    }, mtime=1_000_000)
+    
+    index = AirportIndex(airports_file)
+    monkeypatch.setattr(helpers, "_airport_index", index)
+    
+    reads = []
+    original_load = json.load
+    monkeypatch.setattr(helpers.json, "load", lambda f: reads.append(1) or original_load(f))
+    
+    for _ in range(500):
+        batch = FlightBatch(
+            origin="", origin_code="gru", origin_flag="",
+            destination="", dest_code="MIA", dest_flag="",
+            airline="United", program="United MileagePlus", cost="77k",
+            cabin="Executiva", dates_outbound=[], dates_inbound=[], notes=""
+        )
+        batch.enrich_airport_data()
+    
+    assert (batch.origin, batch.origin_flag) == ("São Paulo", "🇧🇷")
+    assert (batch.destination, batch.dest_flag) == ("Miami", "🇺🇸")
+    assert len(reads) == 1
+    print("✅ 1 leitura para 500 batches")
+    print()
+
+
+def test_index_reloads_on_mtime_change(tmp_path):
+    """Teste 2: Arquivo alterado em disco é relido."""
+    print("=" * 70)
+    print("TESTE 2: Recarga por mtime")
+    print("=" * 70)
+    
+    airports_file = tmp_path / "airports.json"
+    write_airports(airports_file, {"LIS": {"city": "Lisboa", "flag": "🇵🇹"}}, mtime=1_000_000)
+    index = AirportIndex(airports_file)
+    assert index.get("lis")["city"] == "Lisboa"
+    
+    write_airports(airports_file, {"LIS": {"city": "Lisbon", "flag": "🇵🇹"}}, mtime=1_000_100)
+    assert index.lookup_many(["LIS", "xyz"]) == {
+        "LIS": {"city": "Lisbon", "flag": "🇵🇹"},
+        "XYZ": {"city": "XYZ", "flag": "✈️"}
+    }
+    print("✅ Dados atualizados sem reiniciar")
+    print()
+
+
+def test_index_fallbacks(tmp_path):
+    """Teste 3: Arquivo ausente ou inválido cai nos dados genéricos."""
+    print("=" * 70)
+    print("TESTE 3: Fallbacks")
+    print("=" * 70)
+    
+    assert AirportIndex(tmp_path / "missing.json").get("gru") == {"city": "GRU", "flag": "✈️"}
+    
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json", encoding="utf-8")
+    assert AirportIndex(broken).get("MIA") == {"city": "MIA", "flag": "✈️"}
+    
+    # Resultado é cópia: alterar não contamina o índice
+    airports_file = tmp_path / "airports.json"
+    write_airports(airports_file, {"GRU": {"city": "São Paulo", "flag": "🇧🇷"}}, mtime=1_000_000)
+    index = AirportIndex(airports_file)
+    index.get("GRU")["city"] = "X"
+    assert index.get("GRU")["city"] == "São Paulo"
+    print("✅ Fallbacks preservados")
+    print()
+
+
+def test_binary_db_roundtrip(tmp_path):
+    """Teste 4: JSON compilado para binário e lido via mmap."""
+    print("=" * 70)
+    print("TESTE 4: Base binária de aeroportos")
+    print("=" * 70)
+    
+    airports = {
+        f"{a}{b}{c}": {"city": f"Cidade {a}{b}{c}", "flag": "🇧🇷"}
+        for a in "ABC" for b in "XYZ" for c in "QRS"
+    }
+    airports["GRU"] = {
+        "city": "São Paulo", "flag": "🇧🇷", "country": "Brasil",
+        "timezone": "America/Sao_Paulo", "lat": -23.4356, "lon": -46.4731
+    }
+    airports["LIS"] = {"city": "L" * 100, "flag": "🇵🇹"}  # cortado em 64 bytes
+    
+    json_file = tmp_path / "airports.json"
+    db_file = tmp_path / "airports.bin"
+    write_airports(json_file, airports, mtime=1_000_000)
+    
+    assert build_airport_db(json_file, db_file) == len(airports)
+    
+    with AirportDB(db_file) as db:
+        assert len(db) == len(airports)
+        assert db.get("gru") == {
+            "city": "São Paulo", "flag": "🇧🇷", "country": "Brasil",
+            "timezone": "America/Sao_Paulo", "lat": -23.4356, "lon": -46.4731
+        }
+        for code, data in airports.items():
+            assert db.get(code)["flag"] == data["flag"]
+        assert db.get("LIS")["city"] == "L" * 64
+        assert db.get("AAA") is None and db.get("ZZZ") is None
+        assert db.get("São") is None
+    
+    # Índice usa a base binária (mais nova que o JSON)
+    os.utime(db_file, (1_000_100, 1_000_100))
+    index = AirportIndex(json_file, db_file)
+    assert index.get("GRU")["country"] == "Brasil"
+    assert index.get("XYZ") == {"city": "XYZ", "flag": "✈️"}
+    print(f"✅ {len(airports)} aeroportos compilados e consultados")
+    print()
+
+
+def test_stale_or_broken_db_falls_back_to_json(tmp_path):
+    """Teste 5: Base desatualizada ou corrompida → JSON."""
+    print("=" * 70)
+    print("TESTE 5: Fallback da base binária")
+    print("=" * 70)
+    
+    json_file = tmp_path / "airports.json"
+    db_file = tmp_path / "airports.bin"
+    write_airports(json_file, {"MIA": {"city": "Miami", "flag": "🇺🇸"}}, mtime=1_000_000)
+    build_airport_db(json_file, db_file)
+    os.utime(db_file, (1_000_100, 1_000_100))
+    
+    # JSON editado depois da compilação: a base binária é ignorada
+    write_airports(json_file, {"MIA": {"city": "Miami Intl", "flag": "🇺🇸"}}, mtime=1_000_200)
+    index = AirportIndex(json_file, db_file)
+    assert index.get("MIA")["city"] == "Miami Intl"
+    
+    db_file.write_bytes(b"lixo")
+    os.utime(db_file, (1_000_300, 1_000_300))
+    assert index.get("MIA")["city"] == "Miami Intl"
+    print("✅ JSON usado quando a base não serve")
+    print()
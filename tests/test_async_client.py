@@ -0,0 +1,150 @@
+"""
+Teste do cliente assíncrono (AsyncSeatsAeroClient).
+
+Usa httpx.MockTransport para simular a API sem acessar a rede.
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from app.services.async_seats_client import AsyncSeatsAeroClient
+from app.core.config import Config
+from app.services.rate_limiter import TokenBucket, RetryPolicy
+from datetime import datetime
+
+
+def make_flight(origin, destination, date_str):
+    return {
+        'Origin': origin,
+        'Destination': destination,
+        'Airline': 'United',
+        'Source': 'united',
+        'Date': date_str,
+        'MilesCost': 77000,
+        'RemainingSeats': 4,
+        'LastSeen': datetime.now().isoformat()
+    }
+
+
+def run_with_handler(handler, coro_factory, **options):
+    """Executa coro_factory(client) com um cliente sobre MockTransport."""
+    async def runner():
+        async with AsyncSeatsAeroClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            rate_limiter=TokenBucket(rate=1000),
+            retry_policy=RetryPolicy(max_retries=0),
+            **options
+        ) as client:
+            return await coro_factory(client)
+    return asyncio.run(runner())
+
+
+def test_async_error_mapping():
+    """Teste 1: 401/403/429 → ValueError, 5xx → ConnectionError."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Mapeamento de erros igual ao cliente síncrono")
+    print("=" * 70)
+    
+    expected = {401: ValueError, 403: ValueError, 429: ValueError, 503: ConnectionError}
+    
+    for status, error_type in expected.items():
+        def handler(request, status=status):
+            return httpx.Response(status, json={})
+        
+        try:
+            run_with_handler(handler, lambda client: client.get_programs())
+            assert False, f"Status {status} deveria gerar erro"
+        except error_type as e:
+            print(f"  • {status} → {type(e).__name__}")
+    
+    print("✅ Erros mapeados corretamente")
+    print()
+
+
+def test_async_pagination_and_headers():
+    """Teste 2: Paginação com cursor e header de autenticação."""
+    print("=" * 70)
+    print("TESTE 2: Paginação assíncrona")
+    print("=" * 70)
+    
+    seen = []
+    
+    def handler(request):
+        seen.append(request)
+        assert request.headers['Partner-Authorization'] == 'test-key'
+        if 'skip' not in request.url.params:
+            return httpx.Response(200, json={
+                'data': [make_flight('GRU', 'MIA', '2026-06-01')],
+                'hasMore': True,
+                'cursor': 42
+            })
+        return httpx.Response(200, json={
+            'data': [make_flight('GRU', 'MIA', '2026-06-02')],
+            'hasMore': False
+        })
+    
+    async def collect(client):
+        return [flight async for flight in client.iter_search_results('gru', 'mia')]
+    
+    flights = run_with_handler(handler, collect)
+    
+    assert [f['Date'] for f in flights] == ['2026-06-01', '2026-06-02']
+    assert seen[1].url.params['cursor'] == '42'
+    assert seen[1].url.params['skip'] == '1'
+    
+    batches = AsyncSeatsAeroClient.process_search_results(flights)
+    assert len(batches) == 1 and len(batches[0].dates_outbound) == 2
+    print("✅ 2 páginas buscadas e processadas")
+    print()
+
+
+def test_async_search_many():
+    """Teste 3: search_many concorrente isola falhas por rota."""
+    print("=" * 70)
+    print("TESTE 3: search_many assíncrono")
+    print("=" * 70)
+    
+    def handler(request):
+        origin = request.url.params['origin_airport']
+        destination = request.url.params['destination_airport']
+        if destination == 'LIS':
+            return httpx.Response(500, json={})
+        return httpx.Response(200, json={
+            'data': [make_flight(origin, destination, '2026-06-01')],
+            'hasMore': False
+        })
+    
+    flights, errors = run_with_handler(
+        handler,
+        lambda client: client.search_many([('GRU', 'MIA'), ('GIG', 'LIS'), ('GRU', 'DOH')])
+    )
+    
+    assert [f['Destination'] for f in flights] == ['MIA', 'DOH']
+    assert list(errors) == [('GIG', 'LIS')]
+    assert isinstance(errors[('GIG', 'LIS')], ConnectionError)
+    print("✅ 2 rotas ok, 1 falha isolada")
+    print()
+
+
+def test_async_timeout_follows_config():
+    """Teste 4: Timeout padrão igual ao do cliente síncrono (Config.SEATS_TIMEOUT / --timeout)."""
+    print("=" * 70)
+    print("TESTE 4: Timeout das requisições")
+    print("=" * 70)
+    
+    timeouts = []
+    
+    def handler(request):
+        timeouts.append(request.extensions['timeout']['read'])
+        return httpx.Response(200, json={'data': []})
+    
+    run_with_handler(handler, lambda client: client.get_programs())
+    run_with_handler(handler, lambda client: client.get_programs(), timeout=12)
+    assert timeouts == [Config.SEATS_TIMEOUT, 12]
+    print(f"✅ Padrão {Config.SEATS_TIMEOUT:g}s, configurável por cliente")
+    print()
@@ -0,0 +1,149 @@
+"""
+Teste da base local de disponibilidade (AvailabilityStore / --store / --offline).
+"""
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.availability_store import AvailabilityStore
+from app.services.seats_client import SeatsAeroClient
+
+
+def make_flight(dest, date, source='united', cost=77000, airline='United'):
+    return {
+        'Route': {'OriginAirport': 'GRU', 'DestinationAirport': dest},
+        'Airline': airline,
+        'Source': source,
+        'Date': date,
+        'JMileageCost': cost,
+        'RemainingSeats': 4,
+        'LastSeen': datetime.now().isoformat()
+    }
+
+
+def test_upsert_replaces_same_key(tmp_path):
+    """Teste 1: Chave (origem, destino, data, programa, cabine) sem duplicatas."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Upsert por chave")
+    print("=" * 70)
+    
+    with AvailabilityStore(tmp_path / "availability.sqlite3") as store:
+        assert store.upsert([
+            make_flight('MIA', '2026-06-01'),
+            make_flight('MIA', '2026-06-02'),
+            make_flight('MIA', '2026-06-01', source='aeroplan'),
+            {'Source': 'united', 'Date': '2026-06-01'},  # sem rota: ignorado
+            {'Origin': 'GRU', 'Destination': 'MIA', 'Source': 'united'},  # sem data: ignorado
+        ]) == 3
+        
+        # Estrutura plana e campos alternativos caem na mesma chave
+        store.upsert([
+            {'Origin': 'gru', 'Destination': 'mia', 'Source': 'United', 'DepartureDate': '2026-06-02T00:00:00Z'},
+            make_flight('MIA', '2026-06-02'),
+        ], cabin='first')
+        assert store.count() == 4
+        assert [f['Date'] for f in store.iter_flights('first')] == ['2026-06-02']
+        
+        # Mesma chave: atualiza o payload
+        store.upsert([make_flight('MIA', '2026-06-01', cost=60000)])
+        assert store.count() == 4
+        
+        # Outra cabine é outra chave
+        store.upsert([make_flight('MIA', '2026-06-01')], cabin='economy')
+        assert store.count() == 5
+        
+        flights = list(store.iter_flights('business', routes=[('gru', 'mia')]))
+        assert [(f['Date'], f['Source']) for f in flights] == [
+            ('2026-06-01', 'aeroplan'), ('2026-06-01', 'united'), ('2026-06-02', 'united')
+        ]
+        assert flights[1]['JMileageCost'] == 60000
+    print("✅ 5 chaves, payload atualizado")
+    print()
+
+
+def test_offline_reprocessing_matches_api_results(tmp_path):
+    """Teste 2: Filtros reavaliados na base dão o mesmo resultado que na resposta da API."""
+    print("=" * 70)
+    print("TESTE 2: process_search_results sobre a base")
+    print("=" * 70)
+    
+    flights = [make_flight(dest, f'2026-06-{day:02d}', cost=60000 + day * 1000)
+               for dest in ('MIA', 'LIS') for day in range(1, 21)]
+    flights += [make_flight('MIA', '2026-06-05', source='qr', airline='Qatar Airways')]
+    
+    path = tmp_path / "availability.sqlite3"
+    with AvailabilityStore(path, batch_size=7) as store:
+        # record() grava em lotes sem alterar o que o pipeline recebe
+        assert list(store.record(iter(flights))) == flights
+    
+    with AvailabilityStore(path) as store:
+        assert store.count() == len(flights)
+        for filters in ({}, {'airline_filter': 'Qatar'}, {'max_cost_filter': 70000}):
+            expected = SeatsAeroClient.process_search_results(flights, **filters)
+            stored = SeatsAeroClient.process_search_results(
+                store.iter_flights('business', routes=[('GRU', 'MIA'), ('GRU', 'LIS')]), **filters
+            )
+            # Mesmos grupos (a base devolve na ordem rota/data/programa)
+            key = lambda b: (b.dest_code, b.airline)
+            assert sorted(stored, key=key) == sorted(expected, key=key), filters
+        
+        # Período e rota
+        june_10 = list(store.iter_flights('business', routes=[('GRU', 'LIS')],
+                                          date_start='2026-06-10', date_end='2026-06-10'))
+        assert len(june_10) == 1
+        assert len(list(store.iter_flights('business', date_start='2026-06-20'))) == 2
+        assert store.prune('2026-06-11') == 21
+    print("✅ Mesmos batches com e sem filtros")
+    print()
+
+
+def test_bulk_upsert_single_transaction(tmp_path):
+    """Teste 3: 20k voos em uma transação."""
+    flights = [make_flight(f'A{i % 50:02d}', f'2026-{1 + i % 12:02d}-{1 + i % 28:02d}', source=f's{i % 7}')
+               for i in range(20_000)]
+    
+    with AvailabilityStore(tmp_path / "availability.sqlite3") as store:
+        statements = Counter()
+        store._conn.set_trace_callback(lambda sql: statements.update([sql.split(None, 1)[0].upper()]))
+        assert store.upsert(flights) == len(flights)
+        store._conn.set_trace_callback(None)
+        
+        assert statements['BEGIN'] == 1 and statements['COMMIT'] == 1
+        assert statements['INSERT'] == len(flights)
+        assert store.count() == len({(f['Route']['DestinationAirport'], f['Date'], f['Source']) for f in flights})
+
+
+def test_record_saves_partially_read_flights(tmp_path):
+    """Teste 4: record() grava os voos já repassados mesmo se a leitura parar no meio."""
+    print("=" * 70)
+    print("TESTE 4: record() com leitura parcial")
+    print("=" * 70)
+    
+    flights = [make_flight('MIA', f'2026-06-{day:02d}') for day in range(1, 11)]
+    
+    def failing_api():
+        yield from flights[:4]
+        raise ConnectionError("❌ Timeout")
+    
+    with AvailabilityStore(tmp_path / "availability.sqlite3", batch_size=3) as store:
+        # Consumidor para depois de 5 voos (um lote de 3 + 2 pendentes)
+        recorded = store.record(flights)
+        assert [next(recorded) for _ in range(5)] == flights[:5]
+        recorded.close()
+        assert store.count() == 5
+        
+        # API cai no meio: os 4 voos recebidos ficam na base (cabine economy)
+        received = []
+        try:
+            for flight in store.record(failing_api(), cabin='economy'):
+                received.append(flight)
+        except ConnectionError:
+            pass
+        assert len(received) == 4
+        assert len(list(store.iter_flights('economy'))) == 4
+    print("✅ Voos repassados gravados após close() e após erro")
+    print()
@@ -0,0 +1,81 @@
+"""
+Teste do tokenizador de blocos (tokenize_block).
+
+Compara com a regex antiga (lookahead negativo + DOTALL) em casos
+normais e de borda, e valida a passada única com NOTE longa.
+"""
+import sys
+import re
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import file_service
+from app.services.file_service import tokenize_block, parse_date_block
+
+
+def legacy_tokenize(content):
+    data = {}
+    for key, value in re.findall(r'([A-Z_]+):\s*((?:(?![A-Z_]+:).)*)', content, re.DOTALL):
+        value = value.strip()
+        if value:
+            data[key.strip().upper()] = value
+    return data
+
+
+def test_tokenizer_matches_legacy_regex():
+    """Teste 1: Mesmo dict da regex antiga, inclusive nos casos de borda."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: tokenize_block x regex antiga")
+    print("=" * 70)
+    
+    cases = [
+        "ROUTE: GRU MIA\nAIRLINE: Latam\nNOTE: Taxas ~R$ 600\n\nDATES_OUT:\nMai 2026: 01 (9)\n",
+        "texto solto antes\nROUTE: GRU MIA AIRLINE: TAP\n",       # chave no meio da linha
+        "NOTE: voo fooBAR: baz\nCOST:\nCOST: 77k\n",               # chave colada em minúsculas, valor vazio
+        "NOTE: A_B_C:x\nROUTE:GRU MIA\n  DATES_IN:  \n  Jun 2026: 10 (2)  ",
+        "NOTE: Mai 2026: 01 (9), EUA: ok\n",                       # "Mai" não é chave, "EUA" é
+        "sem chaves aqui\n",
+        "",
+    ]
+    for content in cases:
+        assert tokenize_block(content) == legacy_tokenize(content), content
+    print(f"✅ {len(cases)} casos idênticos")
+    print()
+
+
+def test_tokenizer_is_linear(monkeypatch):
+    """Teste 2: NOTE com sequência longa de [A-Z_] é varrida uma vez só."""
+    print("=" * 70)
+    print("TESTE 2: Passada única")
+    print("=" * 70)
+    
+    key_pattern = file_service.KEY_PATTERN
+    scanned = []
+    
+    class CountingPattern:
+        """KEY_PATTERN que anota o tamanho do texto entregue a cada finditer()."""
+        
+        def finditer(self, text):
+            scanned.append(len(text))
+            return key_pattern.finditer(text)
+    
+    monkeypatch.setattr(file_service, 'KEY_PATTERN', CountingPattern())
+    block = f"ROUTE: GRU MIA\nNOTE: {'_' * 200_000}\nCOST: 77k\n"
+    data = tokenize_block(block)
+    
+    assert data["COST"] == "77k" and len(data["NOTE"]) == 200_000
+    # Cada linha é entregue à regex uma única vez: custo proporcional ao bloco
+    assert scanned == [len(line) for line in block.splitlines(keepends=True)]
+    # A regex não recomeça dentro de uma sequência de [A-Z_] (lookbehind)
+    assert not key_pattern.search('_' * 1000 + ':', 1)
+    print(f"✅ {sum(scanned)} caracteres varridos em {len(scanned)} chamadas")
+    print()
+
+
+def test_date_block_unchanged():
+    """Teste 3: Parser de datas com padrões pré-compilados."""
+    assert parse_date_block("Mar 2026: 31 (1)\n  Abr 2026: 5 (5), 24 (7)\nlixo\n") == [
+        ("2026-03-31", 1), ("2026-04-05", 5), ("2026-04-24", 7)
+    ]
@@ -0,0 +1,134 @@
+"""
+Teste da detecção de mudanças entre varreduras (ChangeDetector / --only-changes).
+"""
+import sys
+import json
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.models import FlightBatch
+from app.services.change_detector import ChangeDetector
+
+
+def make_batch(dest='MIA', dates=(("2026-06-01", 4),), min_cost=77000, airline='United'):
+    return FlightBatch(
+        origin="", origin_code="GRU", origin_flag="",
+        destination="", dest_code=dest, dest_flag="",
+        airline=airline, program="United MileagePlus", cost="77k", cabin="Executiva",
+        dates_outbound=list(dates), dates_inbound=[], notes="",
+        min_cost=min_cost, max_cost=min_cost
+    )
+
+
+def sweep(path, batches, routes=None):
+    """Uma varredura: diff + update + save."""
+    detector = ChangeDetector(path)
+    changes = detector.diff(batches)
+    detector.update(batches, routes)
+    detector.save()
+    return changes
+
+
+def test_detects_new_dates_seats_and_cost(tmp_path):
+    """Teste 1: Novidades e pioras entre varreduras."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Datas novas, mais assentos, custo menor")
+    print("=" * 70)
+    
+    path = tmp_path / "snapshot.json"
+    base = [("2026-06-01", 4), ("2026-06-02", 2)]
+    
+    # Primeira varredura: tudo é novo
+    changes = sweep(path, [make_batch(dates=base)])
+    assert len(changes) == 1 and changes[0].is_new
+    
+    # Mesmo resultado: nada a enviar
+    assert sweep(path, [make_batch(dates=base)]) == []
+    
+    # Menos assentos / data sumiu / custo maior: não é novidade
+    assert sweep(path, [make_batch(dates=[("2026-06-01", 1)], min_cost=90000)]) == []
+    
+    # Data nova + mais assentos (em relação à última varredura) + custo menor
+    changes = sweep(path, [make_batch(dates=[("2026-06-01", 3), ("2026-06-09", 5)], min_cost=70000)])
+    assert len(changes) == 1
+    change = changes[0]
+    assert change.new_dates == [("2026-06-09", 5)]
+    assert change.more_seats == [("2026-06-01", 1, 3)]
+    assert change.previous_cost == 90000
+    assert "1 data(s) nova(s)" in change.summary() and "📉" in change.summary()
+    print(f"✅ {change.summary()}")
+    print()
+
+
+def test_routes_scope_and_snapshot_file(tmp_path):
+    """Teste 2: Chaves de rotas fora da varredura são mantidas; arquivo compacto."""
+    print("=" * 70)
+    print("TESTE 2: Escopo por rota")
+    print("=" * 70)
+    
+    path = tmp_path / "snapshot.json"
+    sweep(path, [make_batch('MIA'), make_batch('LIS')], routes=[('GRU', 'MIA'), ('GRU', 'LIS')])
+    
+    # Só GRU-MIA varrida e sem resultados: LIS continua, MIA sai do snapshot
+    sweep(path, [], routes=[('GRU', 'MIA')])
+    detector = ChangeDetector(path)
+    assert [key.split('|')[0] for key in detector.fingerprints] == ['GRU-LIS']
+    assert detector.compare(make_batch('LIS')) is None
+    assert detector.compare(make_batch('MIA')).is_new
+    
+    # Companhia diferente na mesma rota é outra chave
+    assert detector.compare(make_batch('LIS', airline='Qatar Airways')).is_new
+    
+    # Snapshot inválido = primeira varredura
+    path.write_text("{quebrado", encoding="utf-8")
+    assert ChangeDetector(path).fingerprints == {}
+    print("✅ Escopo e snapshot OK")
+    print()
+
+
+def test_fingerprint_outside_compact_range(tmp_path):
+    """Teste 2b: Assentos > 255 e datas fora do formato compacto não quebram a varredura."""
+    print("=" * 70)
+    print("TESTE 2b: Assentos e datas fora do intervalo compacto")
+    print("=" * 70)
+    
+    path = tmp_path / "snapshot.json"
+    
+    # 300 assentos: limitado a 255 na impressão
+    assert sweep(path, [make_batch(dates=[("2026-06-01", 300)])])[0].is_new
+    assert sweep(path, [make_batch(dates=[("2026-06-01", 300)])]) == []
+    changes = sweep(path, [make_batch(dates=[("2026-06-01", 300), ("2026-06-02", 280)])])
+    assert changes[0].new_dates == [("2026-06-02", 255)]
+    
+    # Data antes de 2000 ou fora do padrão ISO: impressão sem empacotar
+    odd = [("1999-12-31", 2), ("2026-06-01", 4)]
+    assert sweep(path, [make_batch('LIS', dates=odd)])[0].is_new
+    assert sweep(path, [make_batch('LIS', dates=odd)]) == []
+    changes = sweep(path, [make_batch('LIS', dates=[("1999-12-31", 5), ("2026-06-01", 4)])])
+    assert changes[0].more_seats == [("1999-12-31", 2, 5)]
+    
+    # Volta ao formato compacto: mesmas datas não são novidade
+    assert sweep(path, [make_batch('LIS', dates=[("2026-06-01", 4)])]) == []
+    assert sweep(path, [make_batch('DOH', dates=[("16/06/2026", 3)])])[0].is_new
+    print("✅ Impressões válidas para qualquer batch")
+    print()
+
+
+def test_fingerprint_is_compact(tmp_path):
+    """Teste 3: 2k batches x 180 datas, sem novidade repetida e snapshot pequeno."""
+    from datetime import date, timedelta
+    
+    start_day = date(2026, 1, 1)
+    dates = [((start_day + timedelta(days=i)).isoformat(), 1 + i % 9) for i in range(180)]
+    batches = [make_batch(f"A{i:04d}", dates) for i in range(2000)]
+    
+    path = tmp_path / "snapshot.json"
+    sweep(path, batches)
+    
+    assert sweep(path, batches) == []
+    
+    size = path.stat().st_size
+    payload = len(json.dumps([b.dates_outbound for b in batches]))
+    assert size < payload / 2, (size, payload)
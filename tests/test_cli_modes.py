@@ -0,0 +1,161 @@
+"""
+Teste dos modos da CLI (main.py) com um cliente falso, sem rede.
+
+Cobre o fluxo --only-changes do modo API com rotas que falham ou voltam
+vazias e o modo daemon com erro inesperado em uma rota.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main
+from app.services.change_detector import ChangeDetector
+from app.services.rate_limiter import TokenBucket, RetryPolicy
+from app.services.seats_client import SeatsAeroClient
+
+
+def make_flight(dest, date='2026-06-01', seats=4):
+    return {
+        'Route': {'OriginAirport': 'GRU', 'DestinationAirport': dest},
+        'Airline': 'United',
+        'Source': 'united',
+        'Date': date,
+        'JMileageCost': 77000,
+        'RemainingSeats': seats
+    }
+
+
+class FakeClient(SeatsAeroClient):
+    """Cliente sem rede: cada rota devolve `responses[rota]` ou levanta o erro."""
+    
+    responses = {}
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            api_key="test-key",
+            rate_limiter=TokenBucket(rate=1000),
+            retry_policy=RetryPolicy(max_retries=0)
+        )
+    
+    def search_many(self, routes, **kwargs):
+        flights, errors = [], {}
+        for origin, destination in routes:
+            response = self.responses[(origin, destination)]
+            if isinstance(response, Exception):
+                errors[(origin, destination)] = response
+            else:
+                flights.extend(response)
+        return flights, errors
+
+
+def run_cli(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['main.py', *argv])
+    main.main()
+
+
+def test_failed_route_keeps_its_fingerprints(tmp_path, monkeypatch, capsys):
+    """Teste 1: Falha transitória em uma rota não reenvia tudo na varredura seguinte."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: --only-changes com rota que falhou")
+    print("=" * 70)
+    
+    routes_file = tmp_path / "routes.txt"
+    routes_file.write_text("GRU MIA\nGRU LIS\n", encoding="utf-8")
+    snapshot = tmp_path / "snapshot.json"
+    monkeypatch.setattr(main, 'SeatsAeroClient', FakeClient)
+    argv = ('--mode', 'api', '--routes-file', str(routes_file), '--no-cache',
+            '--only-changes', '--snapshot', str(snapshot))
+    
+    FakeClient.responses = {('GRU', 'MIA'): [make_flight('MIA')], ('GRU', 'LIS'): [make_flight('LIS')]}
+    run_cli(monkeypatch, *argv)
+    assert "2 de 2 batch(es) com novidades" in capsys.readouterr().out
+    
+    # GRU-LIS falha: impressões dela ficam no snapshot
+    FakeClient.responses[('GRU', 'LIS')] = ConnectionError("❌ Timeout")
+    run_cli(monkeypatch, *argv)
+    assert "GRU → LIS" in capsys.readouterr().out
+    routes = {key.split('|')[0] for key in ChangeDetector(snapshot).fingerprints}
+    assert routes == {'GRU-MIA', 'GRU-LIS'}
+    
+    # GRU-LIS volta igual: nada a enviar
+    FakeClient.responses[('GRU', 'LIS')] = [make_flight('LIS')]
+    run_cli(monkeypatch, *argv)
+    out = capsys.readouterr().out
+    assert "Nada novo desde a última varredura" in out
+    assert "com novidades" not in out
+    print("✅ Rota com erro não volta como novidade")
+    print()
+
+
+
+def test_route_without_flights_leaves_snapshot(tmp_path, monkeypatch, capsys):
+    """Teste 2: Rota que volta vazia sai do snapshot mesmo sem nenhum voo recebido."""
+    print("\n" + "=" * 70)
+    print("TESTE 2: --only-changes sem nenhum voo na varredura")
+    print("=" * 70)
+    
+    routes_file = tmp_path / "routes.txt"
+    routes_file.write_text("GRU MIA\nGRU LIS\n", encoding="utf-8")
+    snapshot = tmp_path / "snapshot.json"
+    monkeypatch.setattr(main, 'SeatsAeroClient', FakeClient)
+    argv = ('--mode', 'api', '--routes-file', str(routes_file), '--no-cache',
+            '--only-changes', '--snapshot', str(snapshot))
+    
+    FakeClient.responses = {('GRU', 'MIA'): [make_flight('MIA')], ('GRU', 'LIS'): [make_flight('LIS')]}
+    run_cli(monkeypatch, *argv)
+    capsys.readouterr()
+    
+    # GRU-MIA falha e GRU-LIS volta vazia: nenhum voo recebido
+    FakeClient.responses = {('GRU', 'MIA'): ConnectionError("❌ Timeout"), ('GRU', 'LIS'): []}
+    run_cli(monkeypatch, *argv)
+    assert "Nenhum voo encontrado" in capsys.readouterr().out
+    routes = {key.split('|')[0] for key in ChangeDetector(snapshot).fingerprints}
+    assert routes == {'GRU-MIA'}
+    
+    # Os voos de GRU-LIS voltam: só ela é novidade
+    FakeClient.responses = {('GRU', 'MIA'): [make_flight('MIA')], ('GRU', 'LIS'): [make_flight('LIS')]}
+    run_cli(monkeypatch, *argv)
+    assert "1 de 2 batch(es) com novidades" in capsys.readouterr().out
+    print("✅ Rota vazia volta como novidade")
+    print()
+
+
+class PerRouteClient(FakeClient):
+    """Consulta por rota (modo daemon): erro inesperado vaza do iterador."""
+    
+    def iter_search_results(self, origin, destination, **kwargs):
+        response = self.responses[(origin, destination)]
+        if isinstance(response, Exception):
+            raise response
+        return iter(response)
+
+
+def test_daemon_survives_unexpected_errors(tmp_path, monkeypatch, capsys):
+    """Teste 3: Erro inesperado numa rota só recua a rota; o daemon segue."""
+    print("\n" + "=" * 70)
+    print("TESTE 3: daemon com erro inesperado em uma rota")
+    print("=" * 70)
+    
+    routes_file = tmp_path / "routes.txt"
+    routes_file.write_text("GRU MIA\nGRU LIS\n", encoding="utf-8")
+    monkeypatch.setattr(main, 'SeatsAeroClient', PerRouteClient)
+    PerRouteClient.responses = {
+        ('GRU', 'MIA'): sqlite3.OperationalError("database is locked"),
+        ('GRU', 'LIS'): [make_flight('LIS')]
+    }
+    
+    run_cli(monkeypatch, '--mode', 'daemon', '--routes-file', str(routes_file),
+            '--snapshot', str(tmp_path / "snapshot.json"),
+            '--interval', '30', '--max-polls', '2')
+    out = capsys.readouterr().out
+    
+    # As duas rotas foram consultadas: a que falhou recuou (30 → 45 min),
+    # a que trouxe novidade acelerou (30 → 15 min)
+    assert "OperationalError" in out
+    assert "GRU → MIA: 0 novidade(s)" in out and "próxima em 45.0 min" in out
+    assert "GRU → LIS: 1 novidade(s)" in out and "próxima em 15.0 min" in out
+    print("✅ Daemon continua após erro inesperado")
+    print()
@@ -0,0 +1,86 @@
+"""
+Teste da engine colunar (NumPy).
+
+Compara process_search_results(engine='columnar') com o caminho padrão
+em um conjunto sintético com todas as variações de campos e filtros.
+"""
+import sys
+import random
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from app.services.seats_client import SeatsAeroClient
+from datetime import datetime, timedelta, timezone
+
+np = pytest.importorskip("numpy")
+
+
+def make_dataset(size=3000, seed=7):
+    """Voos sintéticos com rotas, programas, custos e datas variados."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    airports = ['GRU', 'GIG', 'MIA', 'LIS', 'DOH', '']
+    sources = ['united', 'aeroplan', 'qatar', 'smiles', 'xyzmiles', '']
+    airlines = ['United', 'Qatar Airways', 'TAP', None]
+    
+    flights = []
+    for _ in range(size):
+        flight = {
+            'Origin': rng.choice(airports),
+            'Destination': rng.choice(airports),
+            'Source': rng.choice(sources + ['United']),
+            'Date': rng.choice(['', f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"]),
+            'JMileageCost': rng.choice([0, 55000, 77000, 120000, '90000']),
+            'MilesCost': rng.choice([0, 60000]),
+            'RemainingSeats': rng.randint(1, 9),
+            'LastSeen': (now - timedelta(hours=rng.randint(0, 96))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'Direct': rng.random() < 0.5
+        }
+        airline = rng.choice(airlines)
+        if airline:
+            flight[rng.choice(['Airline', 'MarketingCarrier'])] = airline
+        # Metade no formato da API real (Route aninhado)
+        if rng.random() < 0.5:
+            flight['Route'] = {'OriginAirport': flight.pop('Origin'),
+                               'DestinationAirport': flight.pop('Destination')}
+        flights.append(flight)
+    return flights
+
+
+def batch_signature(batch):
+    return (batch.origin_code, batch.dest_code, batch.airline, batch.program,
+            batch.cost, batch.notes, batch.min_cost, batch.max_cost,
+            batch.dates_outbound)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {'direct_only': True},
+    {'airline_filter': 'united'},
+    {'program_filter': 'aeroplan', 'max_cost_filter': 80000},
+    {'requested_cabin': 'economy', 'max_staleness_hours': 24},
+    {'airline_filter': 'qatar', 'direct_only': True, 'program_filter': 'qatar'},
+])
+def test_columnar_matches_python(filters):
+    """Teste 1: Mesma lista de FlightBatch (conteúdo e ordem)."""
+    flights = make_dataset()
+    
+    expected = SeatsAeroClient.process_search_results(flights, **filters)
+    actual = SeatsAeroClient.process_search_results(flights, engine='columnar', **filters)
+    
+    assert expected, "Conjunto de teste deveria gerar batches"
+    assert [batch_signature(b) for b in actual] == [batch_signature(b) for b in expected]
+    # Tipos nativos (não numpy) para não vazar nos templates
+    assert all(type(b.min_cost) is int for b in actual)
+
+
+def test_columnar_empty_and_invalid_engine():
+    """Teste 2: Entrada vazia e engine desconhecida."""
+    assert SeatsAeroClient.process_search_results([], engine='columnar') == []
+    
+    with pytest.raises(ValueError):
+        SeatsAeroClient.process_search_results(make_dataset(10), engine='pandas')
+
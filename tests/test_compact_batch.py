@@ -0,0 +1,91 @@
+"""
+Teste do CompactFlightBatch (datas em array('H') + assentos em array('B')).
+
+Valida que a versão compacta expõe a mesma API do FlightBatch
+(renderização idêntica) usando bem menos memória.
+"""
+import sys
+import pickle
+import tracemalloc
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from datetime import date, timedelta
+from app.core.models import FlightBatch, CompactFlightBatch
+from app.ui.renderer import render_alert
+
+
+def year_of_dates(start="2026-01-01", count=365):
+    first = date.fromisoformat(start)
+    return [((first + timedelta(days=i)).isoformat(), i % 9 + 1) for i in range(count)]
+
+
+def make_flight(dates_outbound, dates_inbound):
+    return FlightBatch(
+        origin="São Paulo", origin_code="GRU", origin_flag="🇧🇷",
+        destination="Miami", dest_code="MIA", dest_flag="🇺🇸",
+        airline="United", program="United MileagePlus", cost="77k",
+        cabin="Executiva", dates_outbound=dates_outbound,
+        dates_inbound=dates_inbound, notes="Teste", min_cost=77000, max_cost=90000
+    )
+
+
+def test_compact_same_views_and_render():
+    """Teste 1: Mesmas datas, mesmas visões, mesmo alerta."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: API igual ao FlightBatch")
+    print("=" * 70)
+    
+    flight = make_flight(year_of_dates(), year_of_dates("2026-03-01", 30))
+    compact = CompactFlightBatch.from_batch(flight)
+    
+    assert compact.dates_outbound == flight.dates_outbound
+    assert compact.dates_inbound == flight.dates_inbound
+    assert compact.get_outbound_dates_dict() == flight.get_outbound_dates_dict()
+    assert compact.get_formatted_inbound_dates() == flight.get_formatted_inbound_dates()
+    assert compact.route == flight.route
+    assert render_alert(compact, "padrao_whatsapp.j2") == render_alert(flight, "padrao_whatsapp.j2")
+    assert compact.to_batch() == flight
+    
+    # Atribuição invalida as visões
+    compact.dates_outbound = [("2026-12-25", 2)]
+    assert compact.get_outbound_dates_dict() == {"Dez 2026": "25 (2)"}
+    
+    # Picklable (pool de processos do render_alerts)
+    assert pickle.loads(pickle.dumps(compact)).dates_outbound == [("2026-12-25", 2)]
+    print("✅ Visões e alerta idênticos")
+    print()
+
+
+def test_compact_uses_less_memory():
+    """Teste 2: 100 batches de 365 dias ocupam uma fração da memória."""
+    print("=" * 70)
+    print("TESTE 2: Memória")
+    print("=" * 70)
+    
+    def measure(factory):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        batches = [factory() for _ in range(100)]
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        assert len(batches) == 100
+        return used
+    
+    regular = measure(lambda: make_flight(year_of_dates(), year_of_dates()))
+    compact = measure(lambda: CompactFlightBatch.from_batch(make_flight(year_of_dates(), year_of_dates())))
+    
+    assert compact * 5 < regular, f"compacto={compact} regular={regular}"
+    print(f"✅ {regular // 1024} KB → {compact // 1024} KB")
+    print()
+
+
+def test_compact_rejects_out_of_range():
+    """Teste 3: Datas antes de 2000 ou assentos > 255 são rejeitados."""
+    with pytest.raises(ValueError):
+        CompactFlightBatch.from_batch(make_flight([("1999-12-31", 1)], []))
+    with pytest.raises(ValueError):
+        CompactFlightBatch.from_batch(make_flight([("2026-01-01", 300)], []))
@@ -0,0 +1,124 @@
+"""
+Teste do agrupamento rápido de datas (group_dates_by_month).
+
+Compara com a formatação via Arrow por data (implementação anterior)
+em um batch de 365 dias, para os dois formatos de saída.
+"""
+import sys
+import dataclasses
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import arrow
+from app.core import models
+from app.core.models import FlightBatch, group_dates_by_month
+from app.ui.renderer import render_alert
+
+
+def make_flight(dates_outbound, dates_inbound=()):
+    return FlightBatch(
+        origin="São Paulo", origin_code="GRU", origin_flag="🇧🇷",
+        destination="Miami", dest_code="MIA", dest_flag="🇺🇸",
+        airline="United", program="United MileagePlus", cost="77k",
+        cabin="Executiva", dates_outbound=list(dates_outbound),
+        dates_inbound=list(dates_inbound), notes=""
+    )
+
+
+def arrow_reference(dates, lang='pt_BR', capitalize=False):
+    """Agrupamento antigo: arrow.get + format por data."""
+    grouped = {}
+    for date_str, seats in dates:
+        date_obj = arrow.get(date_str)
+        key = date_obj.format('MMM YYYY', locale=lang)
+        if capitalize:
+            key = key.capitalize()
+        grouped.setdefault(key, []).append(f"{date_obj.format('DD')} ({seats})")
+    return grouped
+
+
+def test_matches_arrow_for_full_year():
+    """Teste 1: 365 dias (fora de ordem) iguais ao Arrow."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Agrupamento rápido x Arrow")
+    print("=" * 70)
+    
+    start = arrow.get("2026-01-01")
+    dates = [(start.shift(days=i).format("YYYY-MM-DD"), i % 9 + 1) for i in range(365)]
+    dates = dates[::2] + dates[1::2]
+    
+    for lang in ('pt_BR', 'en_US'):
+        assert group_dates_by_month(dates, lang) == arrow_reference(dates, lang)
+        assert group_dates_by_month(dates, lang, capitalize=True) == arrow_reference(dates, lang, True)
+    
+    flight = make_flight(dates)
+    grouped = flight.get_outbound_dates_dict()
+    assert list(grouped)[:3] == ["Jan 2026", "Fev 2026", "Mar 2026"]
+    assert grouped["Fev 2026"].startswith("01 (")
+    print("✅ Saída idêntica")
+    print()
+
+
+def test_pinned_output_strings():
+    """Teste 2: Strings de saída fixadas pelo cliente."""
+    print("=" * 70)
+    print("TESTE 2: Formato fixado")
+    print("=" * 70)
+    
+    flight = make_flight(
+        [("2026-06-10", 2), ("2026-05-05", 4), ("2026-05-01", 9)],
+        [("2026-06-20T10:00:00", 3)]  # Formato com hora cai no Arrow
+    )
+    
+    assert flight.get_outbound_dates_dict() == {"Mai 2026": "01 (9), 05 (4)", "Jun 2026": "10 (2)"}
+    assert flight.get_formatted_outbound_dates() == "Jun 2026: 10 (2) | Mai 2026: 05 (4), 01 (9)"
+    assert flight.get_inbound_dates_dict() == {"Jun 2026": "20 (3)"}
+    assert make_flight([]).get_formatted_outbound_dates() == "Nenhuma data disponível"
+    print("✅ Mai 2026: 01 (9), 05 (4)")
+    print()
+
+
+def test_date_views_are_memoized(monkeypatch):
+    """Teste 3: Visões em cache, invalidadas quando as datas mudam."""
+    print("=" * 70)
+    print("TESTE 3: Memoização das visões de datas")
+    print("=" * 70)
+    
+    calls = []
+    original = models.group_dates_by_month
+    monkeypatch.setattr(models, "group_dates_by_month", lambda *a, **k: calls.append(1) or original(*a, **k))
+    
+    flight = make_flight([("2026-05-01", 9)], [("2026-05-10", 7)])
+    whatsapp = render_alert(flight, "padrao_whatsapp.j2")
+    telegram = render_alert(flight, "alert_telegram.j2")
+    assert "01 (9)" in whatsapp and telegram
+    assert len(calls) == 2  # ida + volta, uma vez cada
+    
+    # Cópia: alterar o retorno não contamina o cache
+    flight.get_outbound_dates_dict()["Mai 2026"] = "x"
+    assert flight.get_outbound_dates_dict() == {"Mai 2026": "01 (9)"}
+    assert len(calls) == 2
+    
+    # Nova lista → recalcula
+    flight.dates_outbound = [("2026-06-02", 3)]
+    assert flight.get_outbound_dates_dict() == {"Jun 2026": "02 (3)"}
+    
+    # Alteração in-place exige invalidate_date_views()
+    flight.dates_outbound.append(("2026-06-03", 1))
+    flight.invalidate_date_views()
+    assert flight.get_outbound_dates_dict() == {"Jun 2026": "02 (3), 03 (1)"}
+    
+    # Locale faz parte da chave
+    assert flight.get_formatted_outbound_dates('en_US') == "Jun 2026: 02 (3), 03 (1)"
+    assert flight.get_formatted_inbound_dates('en_US') == "May 2026: 10 (7)"
+    
+    # Cache não entra na comparação, no repr nem na serialização
+    assert flight == make_flight([("2026-06-02", 3), ("2026-06-03", 1)], [("2026-05-10", 7)])
+    assert '_date_views' not in repr(flight)
+    assert '_date_views' not in dataclasses.asdict(flight)
+    assert len(dataclasses.astuple(flight)) == len(dataclasses.fields(flight))
+    assert '_date_views' not in {f.name for f in dataclasses.fields(flight)}
+    print("✅ Agrupamento calculado uma vez por visão")
+    print()
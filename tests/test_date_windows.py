@@ -0,0 +1,155 @@
+"""
+Teste da divisão de janelas longas em sub-janelas paralelas (chunk_days).
+
+A API é simulada: cada requisição demora proporcionalmente ao tamanho da
+janela, como uma busca real de 365 dias, e o paralelismo é medido pelo
+pico de requisições simultâneas (não pelo relógio).
+"""
+import sys
+import time
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.seats_client import SeatsAeroClient
+from app.services.rate_limiter import TokenBucket, RetryPolicy
+
+
+class FakeResponse:
+    """Resposta HTTP mínima usada pelo _make_request."""
+    
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+        self.headers = {}
+    
+    def json(self):
+        return self.payload
+    
+    def raise_for_status(self):
+        pass
+
+
+def make_client(seconds_per_day=0.0, max_workers=16):
+    """
+    Cliente cujo /search devolve 1 voo por dia da janela (+ o dia seguinte, repetido).
+    
+    state['peak'] guarda o pico de requisições simultâneas.
+    """
+    client = SeatsAeroClient(
+        api_key="test-key",
+        max_workers=max_workers,
+        rate_limiter=TokenBucket(rate=1000),
+        retry_policy=RetryPolicy(max_retries=0),
+        timeout=12
+    )
+    calls = []
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        start = date.fromisoformat(params['start_date'])
+        end = date.fromisoformat(params['end_date'])
+        with lock:
+            calls.append((params['start_date'], params['end_date'], timeout))
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        try:
+            time.sleep(((end - start).days + 1) * seconds_per_day)
+        finally:
+            with lock:
+                state['active'] -= 1
+        
+        # A API pode devolver o dia seguinte ao fim da janela (sobreposição)
+        days = [start + timedelta(days=i) for i in range((end - start).days + 2)]
+        return FakeResponse({'data': [{
+            'ID': f"GRUMIA-{day.isoformat()}",
+            'Route': {'OriginAirport': 'GRU', 'DestinationAirport': 'MIA'},
+            'Airline': 'United',
+            'Source': 'united',
+            'Date': day.isoformat(),
+            'JMileageCost': 77000,
+            'RemainingSeats': 4,
+        } for day in days], 'hasMore': False})
+    
+    client.session.request = fake_request
+    return client, calls, state
+
+
+def test_split_window():
+    """Teste 1: Janelas consecutivas, sem buracos nem sobreposição."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: _split_window")
+    print("=" * 70)
+    
+    windows = SeatsAeroClient._split_window("2026-01-01", "2026-12-31", 30)
+    assert len(windows) == 13
+    assert windows[0] == ("2026-01-01", "2026-01-30")
+    assert windows[1][0] == "2026-01-31"
+    assert windows[-1] == ("2026-12-27", "2026-12-31")
+    for (_, end), (next_start, _) in zip(windows, windows[1:]):
+        assert date.fromisoformat(next_start) - date.fromisoformat(end) == timedelta(days=1)
+    
+    assert SeatsAeroClient._split_window("2026-01-01", "2026-01-10", 30) == [("2026-01-01", "2026-01-10")]
+    print(f"✅ {len(windows)} janelas")
+    print()
+
+
+def test_chunked_search_is_parallel_and_deduplicated():
+    """Teste 2: 365 dias em janelas de 30, em paralelo, na ordem das datas e sem duplicatas."""
+    print("=" * 70)
+    print("TESTE 2: Busca em janelas paralelas")
+    print("=" * 70)
+    
+    client, calls, state = make_client(seconds_per_day=0.002)
+    single = list(client.iter_search_results("GRU", "MIA", date_start="2026-01-01", days=364))
+    assert state['peak'] == 1
+    
+    calls.clear()
+    chunked = list(client.iter_search_results("GRU", "MIA", date_start="2026-01-01", days=364, chunk_days=30))
+    
+    assert len(calls) == 13
+    assert all(timeout == 12 for _, _, timeout in calls)
+    # Janelas em andamento ao mesmo tempo (no máximo max_workers)
+    assert 1 < state['peak'] <= 16
+    # Mesmos voos, em ordem de data, sem a sobreposição entre janelas
+    assert [f['Date'] for f in chunked] == [f['Date'] for f in single]
+    assert len({f['ID'] for f in chunked}) == len(chunked) == 366
+    
+    batches = SeatsAeroClient.process_search_results(chunked, max_staleness_hours=0)
+    assert len(batches) == 1 and len(batches[0].dates_outbound) == 366
+    print(f"✅ 13 janelas, pico de {state['peak']} requisições simultâneas")
+    print()
+
+
+def test_search_many_passes_chunk_days():
+    """Teste 3: search_many também divide as janelas."""
+    client, calls, _ = make_client()
+    flights, errors = client.search_many([("GRU", "MIA")], date_start="2026-01-01", days=89, chunk_days=30)
+    assert not errors
+    assert len(calls) == 3
+    assert len(flights) == 91
+
+
+def test_routes_and_windows_share_worker_budget():
+    """Teste 4: Rotas × janelas nunca passam de max_workers requisições simultâneas."""
+    print("=" * 70)
+    print("TESTE 4: Orçamento de requisições simultâneas")
+    print("=" * 70)
+    
+    client, calls, state = make_client(seconds_per_day=0.001, max_workers=4)
+    assert client.session.get_adapter('https://').poolmanager.connection_pool_kw['maxsize'] == 4
+    
+    routes = [("GRU", "MIA"), ("GRU", "LIS"), ("GIG", "MIA")]
+    flights, errors = client.search_many(routes, date_start="2026-01-01", days=179, chunk_days=30)
+    
+    assert not errors
+    assert len(calls) == 3 * 6
+    assert len(flights) == 3 * 181
+    assert 1 < state['peak'] <= 4
+    print(f"✅ {len(calls)} requisições, no máximo {state['peak']} simultâneas")
+    print()
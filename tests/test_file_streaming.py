@@ -0,0 +1,75 @@
+"""
+Teste do parser streaming de arquivos multi-voo (iter_file_batch).
+"""
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from app.services.file_service import iter_file_batch, parse_file_batch, parse_flight_block
+
+
+BLOCK = """ROUTE: GRU {dest}
+AIRLINE: United
+PROGRAM: MileagePlus
+COST: 77k
+CABIN: Executiva
+NOTE: Voo {dest}
+DATES_OUT:
+Mai 2026: 01 (9), 05 (4)
+DATES_IN:
+Jun 2026: 10 (2)
+"""
+
+
+def test_streaming_matches_split(tmp_path):
+    """Teste 1: Mesmo resultado do split('---') original, em streaming."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: iter_file_batch x split('---')")
+    print("=" * 70)
+    
+    blocks = [BLOCK.format(dest=f"A{i:02d}").strip() for i in range(20)]
+    # Separador em linha própria ou colado no fim/início da linha
+    content = "".join(
+        block + ("---" if i % 3 == 0 else "\n---\n") for i, block in enumerate(blocks)
+    )
+    content += "\n\n---"  # blocos vazios no fim são ignorados
+    
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(content, encoding="utf-8")
+    expected = [parse_flight_block(b.strip()) for b in content.split('---') if b.strip()]
+    
+    assert len(expected) == 20
+    assert list(iter_file_batch(str(input_file))) == expected
+    assert parse_file_batch(str(input_file)) == expected
+    print(f"✅ {len(expected)} blocos iguais")
+    print()
+
+
+def test_streaming_yields_before_error(tmp_path):
+    """Teste 2: Blocos válidos saem antes do erro, que indica bloco e linha."""
+    print("=" * 70)
+    print("TESTE 2: Erros com bloco e linha")
+    print("=" * 70)
+    
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(
+        BLOCK.format(dest="MIA") + "---\n" + BLOCK.format(dest="LIS") + "---\n\nROUTE: GRU DOH\nAIRLINE: Qatar\n",
+        encoding="utf-8"
+    )
+    
+    batches = iter_file_batch(str(input_file))
+    assert next(batches).dest_code == "MIA"
+    assert next(batches).dest_code == "LIS"
+    with pytest.raises(ValueError) as error:
+        next(batches)
+    assert "Erro no bloco 3 (linha 24)" in str(error.value)
+    assert "Campos faltando" in str(error.value)
+    
+    input_file.write_text("\n---\n\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Nenhum voo"):
+        list(iter_file_batch(str(input_file)))
+    print("✅ Erro no bloco 3 (linha 24)")
+    print()
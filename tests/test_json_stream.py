@@ -0,0 +1,166 @@
+"""
+Teste do parser incremental (JSONArrayStream) e do /search em streaming.
+
+A resposta simulada chega comprimida (gzip) e é descomprimida pedaço a
+pedaço, como o urllib3 faz em iter_content.
+"""
+import sys
+import gzip
+import json
+import zlib
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from app.services.json_stream import JSONArrayStream
+from app.services.seats_client import SeatsAeroClient
+from app.services.rate_limiter import TokenBucket, RetryPolicy
+
+
+def make_flight(i):
+    return {
+        'ID': f"f{i}",
+        'Route': {'OriginAirport': 'GRU', 'DestinationAirport': 'MIA'},
+        'Airline': 'United',
+        'Source': 'united',
+        'Date': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        'JMileageCost': 70000 + i % 9 * 1000,
+        'RemainingSeats': 1 + i % 9,
+        'Notes': 'São Paulo ✈️ ' * (i % 3),
+        'LastSeen': datetime.now().isoformat(),
+    }
+
+
+class FakeStreamResponse:
+    """Resposta gzip descomprimida em pedaços (como iter_content do requests)."""
+    
+    def __init__(self, payload, status_code=200):
+        self.compressed = gzip.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        self.status_code = status_code
+        self.headers = {}
+        self.closed = False
+    
+    def iter_content(self, chunk_size=1):
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for i in range(0, len(self.compressed), 4096):
+            data = inflater.decompress(self.compressed[i:i + 4096])
+            for j in range(0, len(data), chunk_size):
+                yield data[j:j + chunk_size]
+        yield inflater.flush()
+    
+    def raise_for_status(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def test_parser_matches_json_loads():
+    """Teste 1: Mesmos itens e metadados que json.loads, com qualquer tamanho de pedaço."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: JSONArrayStream x json.loads")
+    print("=" * 70)
+    
+    document = {'count': 50, 'data': [make_flight(i) for i in range(50)],
+                'hasMore': True, 'cursor': 1234567890, 'ratio': -1.5e-3}
+    raw = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+    
+    for size in (1, 3, 17, 4096, len(raw)):
+        stream = JSONArrayStream(raw[i:i + size] for i in range(0, len(raw), size))
+        assert list(stream) == document['data'], size
+        assert stream.metadata == {'count': 50, 'hasMore': True, 'cursor': 1234567890, 'ratio': -1.5e-3}
+        assert stream.array_key == 'data' and stream.count == 50
+    
+    # Lista no topo e array em outra chave
+    assert list(JSONArrayStream([b'[1, {"a": [2]} ]'])) == [1, {'a': [2]}]
+    stream = JSONArrayStream([b'{"results": [], "data": 5}'])
+    assert list(stream) == [] and stream.metadata == {'data': 5}
+    print("✅ Idêntico em todos os tamanhos de pedaço")
+    print()
+
+
+@pytest.mark.parametrize("raw", [b'{"data": [1, 2', b'{"data": [1 2]}', b'', b'{"data": []} lixo', b'"texto"'])
+def test_parser_rejects_invalid_json(raw):
+    """Teste 2: JSON truncado ou inválido vira ValueError."""
+    with pytest.raises(ValueError):
+        list(JSONArrayStream([raw]))
+
+
+def make_client(pages):
+    """Cliente cujo session.request devolve as páginas em streaming."""
+    client = SeatsAeroClient(
+        api_key="test-key",
+        rate_limiter=TokenBucket(rate=1000),
+        retry_policy=RetryPolicy(max_retries=0)
+    )
+    requests_seen = []
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None, stream=False):
+        assert stream and 'gzip' in headers['Accept-Encoding']
+        requests_seen.append(dict(params))
+        page = pages[len(requests_seen) - 1]
+        return page if isinstance(page, FakeStreamResponse) else FakeStreamResponse(page)
+    
+    client.session.request = fake_request
+    return client, requests_seen
+
+
+def test_streamed_search_follows_pagination():
+    """Teste 3: Paginação com hasMore/cursor DEPOIS do array 'data'."""
+    print("=" * 70)
+    print("TESTE 3: /search em streaming com paginação")
+    print("=" * 70)
+    
+    flights = [make_flight(i) for i in range(30)]
+    pages = [
+        {'data': flights[:20], 'hasMore': True, 'cursor': 77},
+        {'data': flights[20:], 'hasMore': False},
+    ]
+    client, requests_seen = make_client(pages)
+    
+    streamed = list(client.iter_search_results("GRU", "MIA", days=365, stream=True))
+    assert streamed == flights
+    assert len(requests_seen) == 2
+    assert requests_seen[1]['cursor'] == 77 and requests_seen[1]['skip'] == 20
+    
+    batches = SeatsAeroClient.process_search_results(streamed)
+    assert batches == SeatsAeroClient.process_search_results(flights)
+    print(f"✅ {len(streamed)} voos em {len(requests_seen)} páginas")
+    print()
+
+
+def test_streamed_search_peak_memory():
+    """Teste 4: Pico de memória bem menor que o documento inteiro."""
+    print("=" * 70)
+    print("TESTE 4: Memória")
+    print("=" * 70)
+    
+    document = {'data': [make_flight(i) for i in range(20_000)], 'hasMore': False}
+    size = len(json.dumps(document, ensure_ascii=False).encode('utf-8'))
+    # Resposta comprimida montada antes da medição (é o que "vem da rede")
+    response = FakeStreamResponse(document)
+    response_size = len(response.compressed)
+    client, _ = make_client([response])
+    del document
+    
+    tracemalloc.start()
+    count = sum(1 for _ in client.iter_search_results("GRU", "MIA", stream=True))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert count == 20_000
+    # Pico: resposta comprimida simulada + buffer/pedaço (tamanho fixo),
+    # nunca o documento inteiro
+    assert peak - response_size < min(size / 4, 2_000_000), (peak, size)
+    print(f"✅ Documento de {size / 1e6:.1f} MB, pico de {(peak - response_size) / 1e6:.2f} MB além da resposta comprimida")
+    print()
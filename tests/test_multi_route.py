@@ -0,0 +1,144 @@
+"""
+Teste da busca multi-rota (search_many) e do parser de --routes-file.
+
+As respostas da API são simuladas; uma barreira só libera as requisições
+quando todas estão em andamento juntas, provando que as rotas são
+buscadas em paralelo (sem depender do relógio).
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.seats_client import SeatsAeroClient
+from app.services.rate_limiter import TokenBucket, RetryPolicy
+from app.services.file_service import parse_routes_file
+from datetime import datetime
+
+
+class FakeResponse:
+    """Resposta HTTP mínima usada pelo _make_request."""
+    
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+        self.headers = {}
+    
+    def json(self):
+        return self.payload
+    
+    def raise_for_status(self):
+        pass
+
+
+def make_client(barrier=None, failing=()):
+    """Cliente cujo session.request responde 1 voo por rota (esperando a barreira, se houver)."""
+    client = SeatsAeroClient(
+        api_key="test-key",
+        max_workers=16,
+        rate_limiter=TokenBucket(rate=1000),
+        retry_policy=RetryPolicy(max_retries=0)
+    )
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        try:
+            if barrier is not None:
+                barrier.wait()
+            origin = params['origin_airport']
+            destination = params['destination_airport']
+            if (origin, destination) in failing:
+                return FakeResponse({}, status_code=500)
+            return FakeResponse({'data': [{
+                'Origin': origin,
+                'Destination': destination,
+                'Airline': 'United',
+                'Source': 'united',
+                'Date': '2026-06-01',
+                'MilesCost': 77000,
+                'RemainingSeats': 4,
+                'LastSeen': datetime.now().isoformat()
+            }], 'hasMore': False})
+        finally:
+            with lock:
+                state['active'] -= 1
+    
+    client.session.request = fake_request
+    return client, state
+
+
+def test_search_many_runs_in_parallel():
+    """Teste 1: As 16 requisições ficam em andamento ao mesmo tempo."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Busca multi-rota em paralelo")
+    print("=" * 70)
+    
+    routes = [('GRU', f'A{i:02d}') for i in range(16)]
+    # Busca serial quebraria a barreira (timeout) e as rotas viriam com erro
+    client, state = make_client(barrier=threading.Barrier(len(routes), timeout=10))
+    flights, errors = client.search_many(routes)
+    
+    assert not errors
+    assert len(flights) == 16
+    # Resultados juntos na ordem das rotas
+    assert [f['Destination'] for f in flights] == [dest for _, dest in routes]
+    assert state['peak'] == len(routes)
+    print(f"✅ 16 rotas com pico de {state['peak']} requisições simultâneas")
+    print()
+
+
+def test_search_many_isolates_failures():
+    """Teste 2: Uma rota com erro não derruba as demais."""
+    print("=" * 70)
+    print("TESTE 2: Falha isolada por rota")
+    print("=" * 70)
+    
+    client, _ = make_client(failing={('GRU', 'MIA')})
+    flights, errors = client.search_many([('gru', 'mia'), ('GIG', 'LIS')], max_workers=2)
+    
+    assert list(errors) == [('GRU', 'MIA')]
+    assert isinstance(errors[('GRU', 'MIA')], ConnectionError)
+    assert len(flights) == 1
+    
+    batches = SeatsAeroClient.process_search_results(flights)
+    assert len(batches) == 1
+    assert batches[0].dest_code == 'LIS'
+    print("✅ GRU-MIA falhou, GIG-LIS processada normalmente")
+    print()
+
+
+def test_parse_routes_file(tmp_path):
+    """Teste 3: Parser do arquivo de rotas."""
+    print("=" * 70)
+    print("TESTE 3: parse_routes_file")
+    print("=" * 70)
+    
+    routes_file = tmp_path / "routes.txt"
+    routes_file.write_text(
+        "# Rotas monitoradas\n"
+        "GRU MIA\n"
+        "\n"
+        "gig-lis   # comentário\n"
+        "GRU,DOH\n"
+        "GRU MIA\n",
+        encoding="utf-8"
+    )
+    
+    routes = parse_routes_file(str(routes_file))
+    assert routes == [('GRU', 'MIA'), ('GIG', 'LIS'), ('GRU', 'DOH')]
+    
+    routes_file.write_text("GRU MIA LIS\n", encoding="utf-8")
+    try:
+        parse_routes_file(str(routes_file))
+        assert False, "Deveria rejeitar linha inválida"
+    except ValueError as e:
+        assert "Linha 1" in str(e)
+    print(f"✅ {len(routes)} rotas lidas")
+    print()
@@ -0,0 +1,204 @@
+"""
+Teste da normalização dos voos da API em AvailabilityRecord.
+
+Garante que as variações de estrutura da API (Route aninhado, campos
+alternativos de data/custo/assentos) viram o mesmo registro, e que o
+pipeline de process_search_results continua gerando os mesmos batches.
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.models import AvailabilityRecord
+from app.services.seats_client import SeatsAeroClient, FilterPlan
+from datetime import datetime, timedelta, timezone
+
+
+def test_normalize_flat_and_nested():
+    """Teste 1: Estrutura plana e Route aninhado geram o mesmo registro."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Normalização de estruturas diferentes")
+    print("=" * 70)
+    
+    flat = {
+        'Origin': 'gru',
+        'Destination': 'mia',
+        'Airline': 'United',
+        'Source': 'United',
+        'Date': '2026-06-01',
+        'JMileageCost': '77000',
+        'RemainingSeats': '3',
+        'NumStops': 0
+    }
+    nested = {
+        'Route': {'OriginAirport': 'GRU', 'DestinationAirport': 'MIA', 'Airline': 'United'},
+        'Source': 'united',
+        'DepartureDate': '2026-06-01',
+        'JMileageCost': 77000,
+        'Availability': {'Business': 3},
+        'Direct': True
+    }
+    
+    a = SeatsAeroClient.normalize_flight(flat)
+    b = SeatsAeroClient.normalize_flight(nested)
+    
+    for record in (a, b):
+        assert isinstance(record, AvailabilityRecord)
+        assert (record.origin, record.destination) == ('GRU', 'MIA')
+        assert (record.airline, record.airline_origin) == ('United', 'direct')
+        assert record.source == 'united'
+        assert record.date == '2026-06-01'
+        assert record.seats == 3
+        assert record.cost == 77000
+        assert record.direct is True
+    print("✅ Registros equivalentes")
+    print()
+
+
+def test_airline_resolution_and_costs():
+    """Teste 2: Inferência de companhia e custo por cabine."""
+    print("=" * 70)
+    print("TESTE 2: Companhia inferida e custos")
+    print("=" * 70)
+    
+    flight = {
+        'Origin': 'GIG', 'Destination': 'LIS', 'Source': 'aeroplan',
+        'Date': '2026-07-10', 'MilesCost': 60000, 'YMileageCost': 30000
+    }
+    record = SeatsAeroClient.normalize_flight(flight, requested_cabin='economy')
+    assert record.airline_origin == 'source'
+    assert record.cost == 30000
+    assert record.seats == 4  # padrão quando a API não informa
+    assert record.direct is False
+    
+    # Sem custo específico → custo genérico
+    assert SeatsAeroClient.normalize_flight(flight, requested_cabin='first').cost == 60000
+    
+    record = SeatsAeroClient.normalize_flight({'Source': 'xyzmiles'})
+    assert (record.airline, record.airline_origin) == ('Xyzmiles', 'fallback')
+    
+    record = SeatsAeroClient.normalize_flight({})
+    assert (record.airline, record.airline_origin) == ('Companhia Desconhecida', 'unknown')
+    print("✅ Cadeia de resolução respeitada")
+    print()
+
+
+def test_staleness_with_utc_timestamps():
+    """Teste 3: LastSeen com sufixo 'Z' também é filtrado por idade."""
+    print("=" * 70)
+    print("TESTE 3: Staleness com timestamps UTC")
+    print("=" * 70)
+    
+    now = datetime.now(timezone.utc)
+    
+    def flight(date_str, last_seen):
+        return {
+            'Origin': 'GRU', 'Destination': 'MIA', 'Airline': 'United',
+            'Source': 'united', 'Date': date_str, 'MilesCost': 77000,
+            'LastSeen': last_seen.strftime('%Y-%m-%dT%H:%M:%SZ')
+        }
+    
+    batches = SeatsAeroClient.process_search_results([
+        flight('2026-06-01', now - timedelta(hours=1)),
+        flight('2026-06-02', now - timedelta(hours=100)),
+        {**flight('2026-06-03', now), 'LastSeen': 'invalido'}
+    ], max_staleness_hours=48)
+    
+    assert len(batches) == 1
+    assert [d for d, _ in batches[0].dates_outbound] == ['2026-06-01', '2026-06-03']
+    print("✅ Voo antigo descartado, data inválida mantida")
+    print()
+
+
+def test_filters_reject_raw_flights():
+    """Teste 3b: Com FilterPlan, voo descartado não vira registro."""
+    print("=" * 70)
+    print("TESTE 3b: Filtros sobre os campos crus")
+    print("=" * 70)
+    
+    now = datetime.now(timezone.utc)
+    flight = {
+        'Origin': 'GRU', 'Destination': 'MIA', 'Airline': 'United', 'Source': 'united',
+        'Date': '2026-06-01', 'JMileageCost': 77000, 'NumStops': 1,
+        'LastSeen': (now - timedelta(hours=100)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+    normalize = SeatsAeroClient.normalize_flight
+    
+    assert normalize(flight, plan=FilterPlan(airline_filter='qatar')) is None
+    assert normalize(flight, plan=FilterPlan(program_filter='aeroplan')) is None
+    assert normalize(flight, plan=FilterPlan(direct_only=True)) is None
+    assert normalize(flight, plan=FilterPlan(max_staleness_hours=48)) is None
+    
+    record = normalize(flight, plan=FilterPlan(airline_filter='united', max_staleness_hours=0))
+    assert record is not None and record.last_seen is not None
+    # Companhia desconhecida não é filtrada
+    assert normalize({'Origin': 'GRU'}, plan=FilterPlan(airline_filter='qatar')) is not None
+    print("✅ Voos descartados antes de montar o registro")
+    print()
+
+
+def test_filter_plan_precomputed_matches():
+    """Teste 4: FilterPlan pré-compila programa e reaproveita decisões."""
+    print("=" * 70)
+    print("TESTE 4: FilterPlan")
+    print("=" * 70)
+    
+    plan = FilterPlan(program_filter="privilege", airline_filter="qatar")
+    assert plan.program_sources == {'qr', 'privilege'}
+    assert plan.matches_program('qr')
+    assert not plan.matches_program('united')
+    # Código fora do PROGRAM_MAPPING casa pelo próprio nome
+    assert FilterPlan(program_filter="xyz").matches_program('xyzmiles')
+    
+    assert plan.matches_airline('Qatar Airways')
+    assert not plan.matches_airline('United')
+    assert plan._airline_matches == {'Qatar Airways': True, 'United': False}
+    
+    flights = [
+        {'Origin': 'GRU', 'Destination': 'DOH', 'Source': 'qr', 'Date': '2026-06-01', 'MilesCost': 70000},
+        {'Origin': 'GRU', 'Destination': 'DOH', 'Source': 'qr', 'Date': '2026-06-02', 'MilesCost': 95000},
+        {'Origin': 'GRU', 'Destination': 'MIA', 'Source': 'united', 'Date': '2026-06-01', 'MilesCost': 60000},
+    ]
+    plan = FilterPlan(program_filter="privilege", max_cost_filter=90000)
+    
+    # O mesmo plano serve várias chamadas
+    for _ in range(2):
+        batches = SeatsAeroClient.process_search_results(flights, filter_plan=plan)
+        assert len(batches) == 1
+        assert batches[0].dates_outbound == [('2026-06-01', 4)]
+    print("✅ Plano reaproveitado entre chamadas")
+    print()
+
+
+def test_airline_diagnostics_are_aggregated(caplog, capsys):
+    """Teste 5: Diagnóstico de companhia sai agregado no log, não por voo."""
+    print("=" * 70)
+    print("TESTE 5: Contadores de detecção de companhia")
+    print("=" * 70)
+    
+    flights = [
+        {'Origin': 'GRU', 'Destination': 'MIA', 'Airline': 'United', 'Source': 'united',
+         'Date': f'2026-06-{day:02d}', 'MilesCost': 70000}
+        for day in range(1, 21)
+    ] + [
+        {'Origin': 'GRU', 'Destination': 'MIA', 'Source': 'united', 'Date': '2026-06-21', 'MilesCost': 70000},
+        {'Origin': 'GRU', 'Destination': 'MIA', 'Date': '2026-06-22', 'MilesCost': 70000},
+    ]
+    
+    with caplog.at_level(logging.DEBUG, logger='app.services.seats_client'):
+        SeatsAeroClient.process_search_results(flights)
+    
+    assert "Companhia detectada" not in capsys.readouterr().out
+    
+    summaries = [r.getMessage() for r in caplog.records if r.levelno == logging.INFO]
+    assert any("united: 20 detectada(s), 1 inferida(s)" in m for m in summaries)
+    assert any("1 voo(s) sem companhia" in r.getMessage() for r in caplog.records)
+    
+    # Amostra por voo limitada (sample_limit=5 por tipo)
+    detected = [r for r in caplog.records if "Companhia detectada" in r.getMessage()]
+    assert len(detected) == 5
+    print("✅ Resumo único + amostra limitada")
+    print()
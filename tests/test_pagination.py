@@ -0,0 +1,175 @@
+"""
+Teste da busca paginada (streaming) do SeatsAeroClient.
+
+Simula respostas paginadas da API (hasMore + cursor) sem acessar a rede.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.seats_client import SeatsAeroClient
+from app.services.rate_limiter import TokenBucket
+from datetime import datetime
+
+
+class FakeResponse:
+    """Resposta HTTP mínima usada pelo _make_request."""
+    
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+        self.headers = {}
+    
+    def json(self):
+        return self.payload
+    
+    def raise_for_status(self):
+        pass
+
+
+def make_flight(date_str, source='united'):
+    return {
+        'Origin': 'GRU',
+        'Destination': 'MIA',
+        'Airline': 'United',
+        'Source': source,
+        'Date': date_str,
+        'MilesCost': 77000,
+        'RemainingSeats': 4,
+        'LastSeen': datetime.now().isoformat()
+    }
+
+
+def make_client(pages):
+    """Cria cliente cujo session.request devolve as páginas em sequência."""
+    client = SeatsAeroClient(api_key="test-key", rate_limiter=TokenBucket(rate=1000))
+    calls = []
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        calls.append(dict(params or {}))
+        return FakeResponse(pages[len(calls) - 1])
+    
+    client.session.request = fake_request
+    return client, calls
+
+
+def test_follows_cursor_pagination():
+    """Teste 1: Segue hasMore/cursor até a última página."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Paginação com cursor")
+    print("=" * 70)
+    
+    pages = [
+        {'data': [make_flight('2026-06-01'), make_flight('2026-06-02')], 'hasMore': True, 'cursor': 111},
+        {'data': [make_flight('2026-06-03')], 'hasMore': True, 'cursor': 111},
+        {'data': [make_flight('2026-06-04')], 'hasMore': False, 'cursor': 111},
+    ]
+    client, calls = make_client(pages)
+    
+    received = list(client.iter_search_pages('gru', 'mia', date_start='2026-06-01', days=30, page_size=2))
+    
+    assert [len(page) for page in received] == [2, 1, 1]
+    assert len(calls) == 3
+    assert calls[0]['origin_airport'] == 'GRU'
+    assert calls[0]['take'] == 2
+    assert 'skip' not in calls[0]
+    assert calls[1]['cursor'] == 111 and calls[1]['skip'] == 2
+    assert calls[2]['skip'] == 3
+    print(f"✅ {len(calls)} páginas buscadas, skip/cursor corretos")
+    print()
+
+
+def test_stops_on_empty_page_and_max_pages():
+    """Teste 2: Para em página vazia e respeita max_pages."""
+    print("=" * 70)
+    print("TESTE 2: Página vazia / max_pages")
+    print("=" * 70)
+    
+    pages = [
+        {'data': [make_flight('2026-06-01')], 'hasMore': True, 'cursor': 1},
+        {'data': [], 'hasMore': True, 'cursor': 1},
+    ]
+    client, calls = make_client(pages)
+    assert len(list(client.iter_search_results('GRU', 'MIA'))) == 1
+    assert len(calls) == 2
+    
+    pages = [
+        {'data': [make_flight('2026-06-01')], 'hasMore': True, 'cursor': 1},
+        {'data': [make_flight('2026-06-02')], 'hasMore': True, 'cursor': 1},
+    ]
+    client, calls = make_client(pages)
+    assert len(list(client.iter_search_results('GRU', 'MIA', max_pages=1))) == 1
+    assert len(calls) == 1
+    print("✅ Encerra corretamente")
+    print()
+
+
+def test_prefetch_overlaps_next_page():
+    """Teste 3: A página 2 é pedida enquanto a página 1 é consumida."""
+    print("=" * 70)
+    print("TESTE 3: Prefetch da próxima página")
+    print("=" * 70)
+    
+    second_page_requested = threading.Event()
+    client = SeatsAeroClient(api_key="test-key", rate_limiter=TokenBucket(rate=1000))
+    pages = [
+        {'data': [make_flight('2026-06-01')], 'hasMore': True, 'cursor': 7},
+        {'data': [make_flight('2026-06-02')], 'hasMore': False},
+    ]
+    calls = []
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        calls.append(params)
+        if len(calls) == 2:
+            second_page_requested.set()
+        return FakeResponse(pages[len(calls) - 1])
+    
+    client.session.request = fake_request
+    
+    pages_iter = client.iter_search_pages('GRU', 'MIA')
+    first = next(pages_iter)
+    # Ainda consumindo a página 1: a página 2 já deve ter sido disparada
+    assert second_page_requested.wait(timeout=2)
+    assert first[0]['Date'] == '2026-06-01'
+    assert next(pages_iter)[0]['Date'] == '2026-06-02'
+    print("✅ Página 2 disparada antes do consumo da página 1 terminar")
+    print()
+
+
+def test_process_accepts_streamed_results():
+    """Teste 4: process_search_results aceita o gerador paginado."""
+    print("=" * 70)
+    print("TESTE 4: process_search_results com streaming")
+    print("=" * 70)
+    
+    pages = [
+        {'data': [make_flight('2026-06-01'), make_flight('2026-06-02')], 'hasMore': True, 'cursor': 5},
+        {'data': [make_flight('2026-06-03', source='aeroplan')], 'hasMore': False},
+    ]
+    client, _ = make_client(pages)
+    
+    batches = SeatsAeroClient.process_search_results(client.iter_search_results('GRU', 'MIA'))
+    
+    assert len(batches) == 2
+    assert len(batches[0].dates_outbound) == 2
+    assert batches[1].program == 'Air Canada Aeroplan'
+    assert SeatsAeroClient.extract_flights({'data': None}) == []
+    print(f"✅ {len(batches)} batches criados a partir de 2 páginas")
+    print()
+
+
+if __name__ == "__main__":
+    print("\n🧪 TESTES DE PAGINAÇÃO\n")
+    
+    test_follows_cursor_pagination()
+    test_stops_on_empty_page_and_max_pages()
+    test_prefetch_overlaps_next_page()
+    test_process_accepts_streamed_results()
+    
+    print("=" * 70)
+    print("✅ TODOS OS TESTES DE PAGINAÇÃO PASSARAM!")
+    print("=" * 70)
@@ -0,0 +1,87 @@
+"""
+Teste do parse paralelo de arquivos (parse_file_parallel / --workers).
+"""
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from app.services.file_service import iter_file_batch, parse_file_parallel
+
+
+BLOCK = """ROUTE: GRU {dest}
+AIRLINE: United
+PROGRAM: MileagePlus
+COST: 77k
+CABIN: Executiva
+NOTE: Voo {index}
+DATES_OUT:
+Mai 2026: 01 (9), 05 (4)
+DATES_IN:
+Jun 2026: 10 (2)
+"""
+
+
+def write_blocks(path, count, broken_at=None):
+    dests = ['MIA', 'LIS', 'DOH', 'JFK']
+    blocks = [BLOCK.format(dest=dests[i % 4], index=i) for i in range(count)]
+    if broken_at is not None:
+        blocks[broken_at] = "ROUTE: GRU MIA\nAIRLINE: Qatar\n"
+    path.write_text("---\n".join(blocks), encoding="utf-8")
+
+
+def test_parallel_keeps_file_order(tmp_path):
+    """Teste 1: Pool de processos entrega os voos na ordem do arquivo, enriquecidos."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Ordem preservada com --workers")
+    print("=" * 70)
+    
+    input_file = tmp_path / "input.txt"
+    write_blocks(input_file, 300)
+    
+    start = time.perf_counter()
+    batches = list(parse_file_parallel(str(input_file), workers=2, chunk_size=16))
+    elapsed = time.perf_counter() - start
+    
+    assert [b.notes for b in batches] == [f"Voo {i}" for i in range(300)]
+    assert all(b.origin for b in batches)
+    
+    expected = list(iter_file_batch(str(input_file)))
+    for batch in expected:
+        batch.enrich_airport_data()
+    assert batches == expected
+    print(f"✅ 300 voos em ordem ({elapsed:.2f}s)")
+    print()
+
+
+def test_parallel_reports_first_invalid_block(tmp_path):
+    """Teste 2: Erro do primeiro bloco inválido, com bloco e linha."""
+    print("=" * 70)
+    print("TESTE 2: Erro no pool")
+    print("=" * 70)
+    
+    input_file = tmp_path / "input.txt"
+    write_blocks(input_file, 100, broken_at=40)
+    
+    with pytest.raises(ValueError) as error:
+        list(parse_file_parallel(str(input_file), workers=2, chunk_size=8))
+    assert "Erro no bloco 41 (linha 441)" in str(error.value)
+    
+    # Mesma mensagem do caminho sem pool
+    with pytest.raises(ValueError) as serial_error:
+        list(parse_file_parallel(str(input_file)))
+    assert str(serial_error.value) == str(error.value)
+    print(f"✅ {error.value}")
+    print()
+
+
+def test_parallel_empty_file(tmp_path):
+    """Teste 3: Arquivo sem voos."""
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("\n---\n\n", encoding="utf-8")
+    
+    with pytest.raises(ValueError, match="Nenhum voo"):
+        list(parse_file_parallel(str(input_file), workers=2))
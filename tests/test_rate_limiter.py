@@ -0,0 +1,197 @@
+"""
+Teste do limitador de requisições (TokenBucket) e da política de retry.
+
+Usa relógio falso para validar o ritmo sem esperar de verdade.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.rate_limiter import TokenBucket, RetryPolicy, parse_retry_after
+from app.services.seats_client import SeatsAeroClient
+
+
+class FakeClock:
+    """Relógio controlado manualmente."""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    """Resposta HTTP mínima usada pelo _make_request."""
+    
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload or {}
+        self.headers = headers or {}
+        self.text = str(self.payload)
+    
+    def json(self):
+        return self.payload
+    
+    def raise_for_status(self):
+        pass
+
+
+def test_token_bucket_paces_requests():
+    """Teste 1: Rajada até a capacidade, depois 1 token a cada 1/rate."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Ritmo do token bucket")
+    print("=" * 70)
+    
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    
+    # Depois de 2s o bucket volta a ter 2 tokens (deficit de 2 já pago)
+    clock.now += 3.0
+    assert bucket.reserve() == 0.0
+    print(f"✅ Esperas: {waits}")
+    print()
+
+
+def test_token_bucket_shared_across_threads():
+    """Teste 2: Threads concorrentes recebem esperas distintas e crescentes."""
+    print("=" * 70)
+    print("TESTE 2: Bucket compartilhado entre threads")
+    print("=" * 70)
+    
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=1, clock=clock)
+    waits = []
+    lock = threading.Lock()
+    
+    def worker():
+        wait = bucket.reserve()
+        with lock:
+            waits.append(round(wait, 6))
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert sorted(waits) == [round(i * 0.1, 6) for i in range(8)]
+    print(f"✅ 8 threads espaçadas em {max(waits):.1f}s")
+    print()
+
+
+def test_penalize_and_reward():
+    """Teste 3: 429 reduz o ritmo e pausa; sucessos recuperam o ritmo."""
+    print("=" * 70)
+    print("TESTE 3: Ajuste adaptativo (429)")
+    print("=" * 70)
+    
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, clock=clock)
+    
+    bucket.penalize(retry_after=10)
+    assert bucket.rate == 2
+    assert bucket.reserve() >= 10
+    
+    for _ in range(100):
+        bucket.reward()
+    assert bucket.rate == 4
+    print("✅ Ritmo caiu para 2 req/s e voltou a 4 req/s")
+    print()
+
+
+def test_retry_policy_and_retry_after():
+    """Teste 4: Backoff com jitter e parsing do Retry-After."""
+    print("=" * 70)
+    print("TESTE 4: RetryPolicy / Retry-After")
+    print("=" * 70)
+    
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=5.0)
+    assert policy.should_retry(429, 0)
+    assert policy.should_retry(503, 2)
+    assert not policy.should_retry(503, 3)
+    assert not policy.should_retry(404, 0)
+    
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+    assert 30 <= policy.backoff(0, retry_after=30) <= 31
+    
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("lixo") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    print("✅ Política de retry correta")
+    print()
+
+
+def test_retry_after_is_capped():
+    """Teste 4b: Retry-After enorme ou não finito não trava os workers."""
+    print("=" * 70)
+    print("TESTE 4b: Teto do Retry-After")
+    print("=" * 70)
+    
+    assert parse_retry_after("inf") is None
+    assert parse_retry_after("nan") is None
+    
+    policy = RetryPolicy(base_delay=1.0, max_retry_after=60.0)
+    assert 60 <= policy.backoff(0, retry_after=86400) <= 61
+    assert 0 <= policy.backoff(0, retry_after=float('inf')) <= 1.0
+    
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, max_pause=60.0, clock=clock)
+    bucket.penalize(retry_after=86400)
+    assert 60 <= bucket.reserve() <= 61
+    
+    bucket = TokenBucket(rate=4, clock=clock)
+    bucket.penalize(retry_after=float('inf'))  # sem OverflowError no sleep
+    assert bucket.reserve() < 5
+    print("✅ Retry-After limitado e valores não finitos ignorados")
+    print()
+
+
+def test_client_retries_429_and_5xx():
+    """Teste 5: Cliente refaz 429/5xx e só falha quando acabam os retries."""
+    print("=" * 70)
+    print("TESTE 5: Retry no SeatsAeroClient")
+    print("=" * 70)
+    
+    limiter = TokenBucket(rate=1000)
+    client = SeatsAeroClient(
+        api_key="test-key",
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_retries=2, base_delay=0.01)
+    )
+    responses = [
+        FakeResponse(429, headers={'Retry-After': '0'}),
+        FakeResponse(503),
+        FakeResponse(200, {'data': []}),
+    ]
+    calls = []
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        calls.append(url)
+        return responses[len(calls) - 1]
+    
+    client.session.request = fake_request
+    
+    assert client.get_programs() == {'data': []}
+    assert len(calls) == 3
+    assert limiter.rate < 1000  # 429 desacelerou o bucket compartilhado
+    
+    # Sem retries restantes: mantém o ValueError original
+    responses = [FakeResponse(429, headers={'Retry-After': '0'})] * 3
+    calls.clear()
+    try:
+        client.get_programs()
+        assert False, "429 persistente deveria gerar ValueError"
+    except ValueError as e:
+        assert "Rate limit" in str(e)
+    assert len(calls) == 3
+    print("✅ 429 → 503 → 200 resolvido com 2 retries")
+    print()
@@ -0,0 +1,87 @@
+"""
+Teste da renderização em lote (render_alerts).
+
+Valida ordem, streaming (gerador), pool de processos e tratamento
+de erros por batch.
+"""
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from app.core.models import FlightBatch
+from app.ui.renderer import render_alert, render_alerts
+
+
+def make_batches(count):
+    return [
+        FlightBatch(
+            origin="", origin_code="GRU", origin_flag="",
+            destination="", dest_code=f"A{i:02d}", dest_flag="",
+            airline="United", program="United MileagePlus", cost="77k",
+            cabin="Executiva", dates_outbound=[("2026-05-01", 9), ("2026-05-05", i % 9 + 1)],
+            dates_inbound=[], notes=f"Alerta {i}"
+        )
+        for i in range(count)
+    ]
+
+
+def test_render_alerts_streams_in_order():
+    """Teste 1: Gerador preguiçoso, na ordem, com enriquecimento."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: render_alerts sequencial")
+    print("=" * 70)
+    
+    consumed = []
+    
+    def source():
+        for batch in make_batches(5):
+            consumed.append(batch)
+            yield batch
+    
+    alerts = render_alerts(source(), "padrao_whatsapp.j2")
+    batch, text = next(alerts)
+    assert len(consumed) == 1, "Não deveria ler todos os batches antes do primeiro texto"
+    assert batch.origin, "Batch deveria ser enriquecido"
+    assert text == render_alert(batch, "padrao_whatsapp.j2")
+    
+    rest = list(alerts)
+    assert [b.notes for b, _ in rest] == [f"Alerta {i}" for i in range(1, 5)]
+    print("✅ 5 alertas em streaming")
+    print()
+
+
+def test_render_alerts_process_pool():
+    """Teste 2: Pool de processos gera os mesmos textos, na mesma ordem."""
+    print("=" * 70)
+    print("TESTE 2: render_alerts com workers")
+    print("=" * 70)
+    
+    expected = [text for _, text in render_alerts(make_batches(40), "padrao_whatsapp.j2")]
+    parallel = [text for _, text in render_alerts(make_batches(40), "padrao_whatsapp.j2", workers=2, chunk_size=7)]
+    
+    assert parallel == expected
+    print("✅ 40 alertas iguais ao caminho sequencial")
+    print()
+
+
+def test_render_alerts_errors():
+    """Teste 3: on_error pula o batch; sem ele, o erro sobe."""
+    print("=" * 70)
+    print("TESTE 3: Erros de renderização")
+    print("=" * 70)
+    
+    errors = []
+    rendered = list(render_alerts(
+        make_batches(2), "nao_existe.j2",
+        on_error=lambda batch, error: errors.append(batch.dest_code)
+    ))
+    assert rendered == []
+    assert errors == ["A00", "A01"]
+    
+    with pytest.raises(Exception):
+        list(render_alerts(make_batches(1), "nao_existe.j2"))
+    print("✅ Erros reportados por batch")
+    print()
@@ -0,0 +1,70 @@
+"""
+Teste do Environment Jinja2 compartilhado do renderer.
+
+Valida que o template é compilado uma vez, que a pasta templates/ é
+encontrada independente do diretório atual e que alterações no .j2
+são recarregadas.
+"""
+import sys
+import os
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.models import FlightBatch
+from app.ui import renderer
+from app.ui.renderer import render_alert, get_environment, get_template
+
+
+def make_flight():
+    return FlightBatch(
+        origin="São Paulo", origin_code="GRU", origin_flag="🇧🇷",
+        destination="Miami", dest_code="MIA", dest_flag="🇺🇸",
+        airline="United", program="United MileagePlus", cost="77k",
+        cabin="Executiva", dates_outbound=[("2026-05-01", 9)],
+        dates_inbound=[], notes="Teste"
+    )
+
+
+def test_environment_is_reused(tmp_path, monkeypatch):
+    """Teste 1: Mesmo Environment/template, mesmo de outro diretório."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Environment compartilhado")
+    print("=" * 70)
+    
+    monkeypatch.chdir(tmp_path)
+    first = render_alert(make_flight(), "padrao_whatsapp.j2")
+    
+    assert get_environment() is get_environment()
+    assert get_template("padrao_whatsapp.j2") is get_template("padrao_whatsapp.j2")
+    assert render_alert(make_flight(), "padrao_whatsapp.j2") == first
+    assert "São Paulo" in first
+    print("✅ Template compilado uma vez")
+    print()
+
+
+def test_template_reloaded_on_change(tmp_path, monkeypatch):
+    """Teste 2: Template alterado em disco é recompilado."""
+    print("=" * 70)
+    print("TESTE 2: auto_reload por mtime")
+    print("=" * 70)
+    
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    template_file = templates / "mini.j2"
+    template_file.write_text("{{ origin_code }} v1", encoding="utf-8")
+    os.utime(template_file, (1_000_000, 1_000_000))
+    
+    monkeypatch.setattr(renderer, "TEMPLATES_DIR", templates)
+    monkeypatch.setattr(renderer, "_environment", None)
+    monkeypatch.setattr(renderer.Config, "TEMPLATE_CACHE_DIR", tmp_path / "cache")
+    
+    assert render_alert(make_flight(), "mini.j2") == "GRU v1"
+    assert list((tmp_path / "cache").iterdir()), "Bytecode deveria ir para o cache"
+    
+    template_file.write_text("{{ origin_code }} v2", encoding="utf-8")
+    os.utime(template_file, (1_000_100, 1_000_100))
+    assert render_alert(make_flight(), "mini.j2") == "GRU v2"
+    print("✅ Template recarregado após mudança")
+    print()
@@ -0,0 +1,157 @@
+"""
+Teste do cache em disco das respostas da API (ResponseCache).
+
+Valida chave normalizada, TTL, despejo LRU e a integração com o
+SeatsAeroClient (segunda busca igual não chama a API).
+"""
+import sys
+import os
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.response_cache import ResponseCache
+from app.services.rate_limiter import TokenBucket
+from app.services.seats_client import SeatsAeroClient
+
+
+class FakeResponse:
+    """Resposta HTTP mínima usada pelo _make_request."""
+    
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = {}
+        self.text = str(payload)
+    
+    def json(self):
+        return self.payload
+    
+    def raise_for_status(self):
+        pass
+
+
+def test_cache_key_normalization(tmp_path):
+    """Teste 1: Mesma busca com caixa/ordem diferentes usa a mesma entrada."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Chave normalizada")
+    print("=" * 70)
+    
+    cache = ResponseCache(tmp_path)
+    cache.set('/search', {'origin_airport': 'gru', 'destination_airport': 'mia', 'cabin': 'Business'}, {'data': [1]})
+    
+    hit = cache.get('/search', {'cabin': 'business', 'destination_airport': 'MIA', 'origin_airport': 'GRU'})
+    assert hit == {'data': [1]}
+    assert cache.get('/search', {'origin_airport': 'GRU', 'destination_airport': 'LIS'}) is None
+    assert cache.get('/routes', {'origin_airport': 'GRU', 'destination_airport': 'MIA', 'cabin': 'business'}) is None
+    print("✅ Chave independe de caixa e ordem dos parâmetros")
+    print()
+
+
+def test_cache_ttl(tmp_path):
+    """Teste 2: Entradas mais velhas que o TTL são ignoradas."""
+    print("=" * 70)
+    print("TESTE 2: TTL")
+    print("=" * 70)
+    
+    cache = ResponseCache(tmp_path, ttl_seconds=60)
+    cache.set('/search', {'origin_airport': 'GRU'}, {'data': []})
+    assert cache.get('/search', {'origin_airport': 'GRU'}) == {'data': []}
+    
+    cache.ttl_seconds = -1
+    assert cache.get('/search', {'origin_airport': 'GRU'}) is None
+    print("✅ Entrada expirada não é reutilizada")
+    print()
+
+
+def test_cache_lru_eviction(tmp_path):
+    """Teste 3: Ao passar do limite, remove a entrada menos usada."""
+    print("=" * 70)
+    print("TESTE 3: Despejo LRU")
+    print("=" * 70)
+    
+    cache = ResponseCache(tmp_path, max_entries=2)
+    cache.set('/search', {'origin_airport': 'AAA'}, 1)
+    cache.set('/search', {'origin_airport': 'BBB'}, 2)
+    
+    # Envelhece as duas entradas e usa AAA (vira a mais recente)
+    for path in tmp_path.glob('*.json'):
+        os.utime(path, (time.time() - 100, time.time() - 100))
+    assert cache.get('/search', {'origin_airport': 'AAA'}) == 1
+    
+    cache.set('/search', {'origin_airport': 'CCC'}, 3)
+    
+    assert len(list(tmp_path.glob('*.json'))) == 2
+    assert cache.get('/search', {'origin_airport': 'AAA'}) == 1
+    assert cache.get('/search', {'origin_airport': 'BBB'}) is None
+    assert cache.get('/search', {'origin_airport': 'CCC'}) == 3
+    print("✅ BBB (menos usada) foi removida")
+    print()
+
+
+def test_client_uses_cache(tmp_path):
+    """Teste 4: Segunda busca igual sai do cache, sem chamar a API."""
+    print("=" * 70)
+    print("TESTE 4: SeatsAeroClient com cache")
+    print("=" * 70)
+    
+    calls = []
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        calls.append(url)
+        return FakeResponse({'data': [{'Origin': 'GRU'}], 'hasMore': False})
+    
+    for _ in range(2):
+        client = SeatsAeroClient(
+            api_key="test-key",
+            rate_limiter=TokenBucket(rate=1000),
+            cache=ResponseCache(tmp_path)
+        )
+        client.session.request = fake_request
+        flights = list(client.iter_search_results('GRU', 'MIA', date_start='2026-06-01', days=30))
+        assert flights == [{'Origin': 'GRU'}]
+        
+        # Endpoints fora de CACHED_ENDPOINTS sempre vão à API
+        client.get_programs()
+    
+    assert calls.count('https://seats.aero/partnerapi/search') == 1
+    assert calls.count('https://seats.aero/partnerapi/programs') == 2
+    print("✅ 2ª execução: 0 chamadas ao /search")
+    print()
+
+
+def test_conditional_requests_for_catalogs(tmp_path):
+    """Teste 5: /routes revalida com ETag e usa o disco no 304."""
+    print("=" * 70)
+    print("TESTE 5: GET condicional em /routes e /programs")
+    print("=" * 70)
+    
+    sent_headers = []
+    catalog = {'data': [{'OriginAirport': 'GRU', 'DestinationAirport': 'MIA'}]}
+    
+    def fake_request(method, url, params=None, json=None, timeout=None, headers=None):
+        sent_headers.append(headers or {})
+        if headers and headers.get('If-None-Match') == '"v1"':
+            return FakeResponse(None, status_code=304)
+        response = FakeResponse(catalog)
+        response.headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2026 07:28:00 GMT'}
+        return response
+    
+    client = SeatsAeroClient(
+        api_key="test-key",
+        rate_limiter=TokenBucket(rate=1000),
+        cache=ResponseCache(tmp_path, ttl_seconds=0)
+    )
+    client.session.request = fake_request
+    
+    first = client.get_routes('gru')
+    second = client.get_routes('GRU')
+    
+    assert first == second == catalog
+    assert sent_headers[0] == {}
+    assert sent_headers[1]['If-None-Match'] == '"v1"'
+    assert sent_headers[1]['If-Modified-Since'] == 'Wed, 21 Oct 2026 07:28:00 GMT'
+    print("✅ 2ª chamada: 304 servido do disco")
+    print()
@@ -0,0 +1,85 @@
+"""
+Teste do agendador do modo daemon (PollingScheduler).
+
+Usa relógio falso: nenhuma espera real acontece.
+"""
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from app.services.scheduler import PollingScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def run(scheduler, clock, polls, hot):
+    """Roda N consultas; rotas em `hot` sempre têm novidade."""
+    counts = {}
+    for _ in range(polls):
+        state = scheduler.next_route()
+        counts[state.route] = counts.get(state.route, 0) + 1
+        scheduler.report(state, changed=state.route in hot)
+    return counts
+
+
+def test_hot_routes_polled_more_often():
+    """Teste 1: Rota com novidades ganha prioridade, paradas recuam."""
+    print("\n" + "=" * 70)
+    print("TESTE 1: Intervalos adaptativos")
+    print("=" * 70)
+    
+    clock = FakeClock()
+    routes = [('GRU', 'MIA'), ('GRU', 'LIS'), ('gig', 'doh')]
+    scheduler = PollingScheduler(routes, interval=600, clock=clock, sleep=clock.sleep)
+    
+    counts = run(scheduler, clock, 200, hot={('GRU', 'MIA')})
+    
+    assert counts[('GRU', 'MIA')] > 5 * counts[('GRU', 'LIS')]
+    states = {state.route: state for state in scheduler.states()}
+    assert states[('GRU', 'MIA')].interval == scheduler.min_interval == 150
+    assert states[('GIG', 'DOH')].interval == scheduler.max_interval == 4800
+    print(f"✅ Consultas: {counts}")
+    print()
+
+
+def test_order_and_waits():
+    """Teste 2: Ordem de vencimento, empates na ordem de cadastro, espera até vencer."""
+    print("=" * 70)
+    print("TESTE 2: Ordem do heap")
+    print("=" * 70)
+    
+    clock = FakeClock()
+    scheduler = PollingScheduler([('A', 'B'), ('C', 'D'), ('A', 'B')], interval=100, clock=clock, sleep=clock.sleep)
+    assert len(scheduler) == 2  # rota repetida entra uma vez
+    
+    first = scheduler.next_route()
+    second = scheduler.next_route()
+    assert (first.route, second.route) == (('A', 'B'), ('C', 'D'))
+    assert clock.now == 0  # ambas vencidas
+    
+    scheduler.report(second, changed=True)   # volta em 50s
+    scheduler.report(first, changed=False)   # volta em 150s
+    assert scheduler.next_route() is second
+    assert clock.now == 50
+    print("✅ Ordem e esperas corretas")
+    print()
+
+
+def test_invalid_configuration():
+    """Teste 3: Configurações inválidas."""
+    with pytest.raises(ValueError):
+        PollingScheduler([], interval=60)
+    with pytest.raises(ValueError):
+        PollingScheduler([('GRU', 'MIA')], interval=60, max_interval=30)